@@ -1,19 +1,217 @@
-from flask import Flask, render_template, request, jsonify
+import functools
+import hmac
+import threading
+
+from flask import (Blueprint, Flask, current_app, render_template, request, jsonify, send_file,
+                   stream_with_context, url_for)
+from werkzeug.local import LocalProxy
 from config import Config
 from database import Database
 from dashboards.dashboard_definitions import DashboardManager
+from dashboards.summaries import SummaryRefresher
+from dashboards.metrics import gauge_lines
+from dashboards.filters import FilterCatalog
+from dashboards.stats import SummaryStats
+from dashboards.export import EXPORT_FORMATS, ExportError, check_format, export_chunks
+from dashboards.warmup import CacheWarmer
+from dashboards.lazy import preload_heavy_modules
+from dashboards.assets import AssetManifest
+from dashboards.http_cache import choose_encoding, compress_response, data_versioned
+from dashboards.pages import PageCache
+from dashboards.cache import normalize_filters
 import json
 
-app = Flask(__name__)
-app.config.from_object(Config)
+bp = Blueprint('main', __name__)
 
-# Inicializar base de datos y dashboard manager
-db = Database()
-dashboard_manager = DashboardManager(db)
 
-@app.route('/')
-def index():
-    # Obtener filtros de la URL
+class Services:
+    """Base de datos, dashboard manager y tareas de fondo de un proceso.
+    
+    Tienen conexiones, hilos y procesos propios, así que no se comparten entre
+    workers: con gunicorn se crean en cada worker después del fork (ver
+    gunicorn.conf.py); lo que sí se comparte es lo importado en el master.
+    """
+    
+    def __init__(self, db=None):
+        self._owns_db = db is None
+        self.db = Database() if db is None else db
+        self.dashboard_manager = DashboardManager(self.db)
+        # HTML de / y /categoria/<c> ya generado, por ruta y filtros
+        self.page_cache = PageCache() if Config.PAGE_CACHE_ENABLED else None
+        # Refresco en segundo plano de las tablas resumen
+        self.summary_refresher = SummaryRefresher(self.db, on_refresh=self.summaries_refreshed)
+        # Opciones de los filtros, precalculadas y refrescadas en segundo plano
+        self.filter_catalog = FilterCatalog(self.db)
+        # Contadores de /api/stats/summary
+        self.summary_stats = SummaryStats(self.db)
+        # Precalentamiento de las caches para que el primer visitante no pague las consultas y gráficos
+        self.cache_warmer = CacheWarmer(self.dashboard_manager, self.filter_catalog)
+    
+    def summaries_refreshed(self):
+        self.dashboard_manager.invalidate_summary_data()
+        # Las páginas se siguen sirviendo mientras se regeneran con los datos nuevos
+        if self.page_cache is not None:
+            self.page_cache.expire()
+    
+    def start(self):
+        """Abre las conexiones iniciales y arranca las tareas de fondo"""
+        if self._owns_db:
+            self.db.pool.prewarm()
+        if Config.USE_SUMMARY_TABLES:
+            self.summary_refresher.start()
+        self.filter_catalog.start()
+        if Config.WARMUP_ON_START:
+            self.cache_warmer.start()
+    
+    def stop(self):
+        """Detiene las tareas de fondo y cierra hilos, procesos y conexiones"""
+        self.summary_refresher.stop()
+        self.filter_catalog.stop()
+        self.cache_warmer.stop()
+        self.dashboard_manager.shutdown()
+        if self._owns_db:
+            self.db.pool.close_all()
+
+
+_services_lock = threading.Lock()
+
+
+def init_services(flask_app, db=None, start=True):
+    """Crea (una sola vez por proceso) los servicios de la aplicación"""
+    with _services_lock:
+        services = flask_app.extensions.get('dashboards')
+        if services is None:
+            services = Services(db)
+            flask_app.extensions['dashboards'] = services
+            if start:
+                services.start()
+    return services
+
+
+def get_services():
+    """Servicios de la aplicación actual; se crean en la primera petición si nadie lo hizo antes"""
+    services = current_app.extensions.get('dashboards')
+    if services is None:
+        services = init_services(current_app._get_current_object())
+    return services
+
+
+# Las rutas usan estos nombres como antes; apuntan a los servicios del proceso actual
+db = LocalProxy(lambda: get_services().db)
+dashboard_manager = LocalProxy(lambda: get_services().dashboard_manager)
+summary_refresher = LocalProxy(lambda: get_services().summary_refresher)
+filter_catalog = LocalProxy(lambda: get_services().filter_catalog)
+summary_stats = LocalProxy(lambda: get_services().summary_stats)
+cache_warmer = LocalProxy(lambda: get_services().cache_warmer)
+
+
+def create_app(db=None, start=True):
+    """Crea la aplicación Flask.
+    
+    Con start=False no se abre ninguna conexión ni se arranca ningún hilo:
+    wsgi.py lo usa para que el master de gunicorn (preload_app) importe una
+    vez el registro de dashboards, plotly y pandas, y cada worker cree sus
+    servicios después del fork. db permite usar otra base (p. ej. la SQLite
+    de los benchmarks); en ese caso los servicios se crean sin arrancarse
+    salvo que se pida start=True.
+    """
+    flask_app = Flask(__name__)
+    flask_app.config.from_object(Config)
+    flask_app.register_blueprint(bp)
+    # Huellas y copias precomprimidas de los recursos estáticos; en el master si hay preload
+    flask_app.extensions['assets'] = AssetManifest().build()
+    
+    # Sin LAZY_IMPORTS pandas y plotly se cargan al arrancar y no en la primera petición
+    if not Config.LAZY_IMPORTS:
+        preload_heavy_modules()
+    
+    if start or db is not None:
+        init_services(flask_app, db=db, start=start)
+    return flask_app
+
+def asset_url(name):
+    """URL con huella de un recurso estático (ver dashboards/assets.py)"""
+    return url_for('main.asset', filename=current_app.extensions['assets'].filename(name))
+
+@bp.app_context_processor
+def inject_assets():
+    """asset_url y el bundle de plotly.js para las plantillas (None si va incrustado en cada gráfico)"""
+    # La carga diferida dibuja siempre con Plotly.newPlot: el <script> del HTML
+    # "inline" no se ejecuta al insertarlo con innerHTML
+    inline = Config.PLOTLY_JS_MODE == 'inline' and not Config.SKELETON_FIRST
+    plotly_js_url = None if inline else asset_url('plotly.min.js')
+    return {"asset_url": asset_url, "plotly_js_url": plotly_js_url}
+
+@bp.route('/assets/<filename>')
+def asset(filename):
+    """Recursos con huella en el nombre: inmutables y precomprimidos con brotli o gzip"""
+    entry = current_app.extensions['assets'].lookup(filename)
+    if entry is None:
+        return jsonify({"error": "Recurso no encontrado"}), 404
+    
+    encoding = choose_encoding(request.accept_encodings, tuple(entry["encodings"]))
+    path = entry["encodings"][encoding] if encoding else entry["source"]
+    response = send_file(path, mimetype=entry["mimetype"], max_age=31536000,
+                         etag=f'{entry["digest"]}-{encoding or "identity"}')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.content_encoding = encoding
+    return response
+
+@bp.after_app_request
+def compress_responses(response):
+    return compress_response(response, request)
+
+def render_page(dashboard_infos, filters, **context):
+    """HTML de una página de dashboards y si salió sin dashboards fallidos"""
+    all_dashboards = build_page_dashboards(dashboard_infos, filters)
+    html = render_template('unified_dashboard.html',
+                           all_dashboards=all_dashboards,
+                           filters=filters,
+                           lazy=Config.SKELETON_FIRST,
+                           **context)
+    good = not any((dashboard["data"] or {}).get("failed") for dashboard in all_dashboards)
+    return html, good
+
+def page_response(dashboard_infos, filters, **context):
+    """Respuesta de una página completa, desde el cache de páginas si está habilitado"""
+    page_cache = get_services().page_cache
+    if page_cache is None:
+        html, _ = render_page(dashboard_infos, filters, **context)
+        response = current_app.response_class(html, mimetype='text/html')
+        return data_versioned(response, request, dashboard_manager.data_changed_at)
+    
+    flask_app = current_app._get_current_object()
+    path = request.full_path
+    
+    def render():
+        # También corre en el hilo de regeneración, cuando la petición original ya terminó
+        with flask_app.test_request_context(path):
+            return render_page(dashboard_infos, filters, **context)
+    
+    page = page_cache.get((request.path, normalize_filters(filters)), render)
+    response = current_app.response_class(page["body"], mimetype='text/html')
+    data_versioned(response, request, page["generated_at"], etag=page["etag"])
+    if response.status_code == 200 and Config.COMPRESS_ENABLED:
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding:
+            response.set_data(page_cache.encoded(page, encoding))
+            response.content_encoding = encoding
+    return response
+
+def versioned(view):
+    """ETag y Last-Modified según la versión de los datos; 304 si el navegador ya la tiene"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        response = current_app.make_response(view(*args, **kwargs))
+        return data_versioned(response, request, dashboard_manager.data_changed_at)
+    return wrapper
+
+def get_request_filters():
+    """Obtener filtros de la URL"""
     filters = {}
     if request.args.get('carrera'):
         filters['carrera'] = request.args.get('carrera')
@@ -21,97 +219,59 @@ def index():
         filters['periodo'] = request.args.get('periodo')
     if request.args.get('genero'):
         filters['genero'] = request.args.get('genero')
+    return filters
+
+def build_page_dashboards(dashboard_infos, filters):
+    """Dashboards para una página completa, o solo su estructura en modo SKELETON_FIRST"""
+    if Config.SKELETON_FIRST:
+        # Las tarjetas piden sus datos a /api/dashboards/batch al hacerse visibles
+        return [{"info": info, "data": None} for info in dashboard_infos]
+    # Generar los dashboards en paralelo, con error por dashboard lento o fallido
+    return dashboard_manager.generate_dashboards(dashboard_infos, filters)
+
+@bp.route('/')
+def index():
+    filters = get_request_filters()
     
-    # Generar TODOS los 40 dashboards
-    all_dashboards = []
-    
-    # Iterar por todos los dashboards definidos (1-40)
-    for dashboard_info in dashboard_manager.dashboards:
-        dashboard_id = dashboard_info["id"]
-        
-        try:
-            dashboard_data = dashboard_manager.generate_dashboard(dashboard_id, filters)
-            
-            if dashboard_data:
-                all_dashboards.append({
-                    "info": dashboard_info,
-                    "data": dashboard_data
-                })
-            else:
-                # Si no hay datos, crear un placeholder
-                all_dashboards.append({
-                    "info": dashboard_info,
-                    "data": {"error": f"No se pudieron cargar los datos para {dashboard_info['name']}"}
-                })
-                
-        except Exception as e:
-            # Manejo de errores por dashboard individual
-            all_dashboards.append({
-                "info": dashboard_info,
-                "data": {"error": f"Error en {dashboard_info['name']}: {str(e)}"}
-            })
-    
-    return render_template('unified_dashboard.html', 
-                         all_dashboards=all_dashboards,
-                         filters=filters)
+    # TODOS los 40 dashboards
+    return page_response(dashboard_manager.dashboards, filters)
 
-@app.route('/api/filters')
+@bp.route('/api/filters')
 def get_filters():
     """API endpoint para obtener opciones de filtros"""
     try:
-        # Obtener carreras activas
-        carreras_query = """
-        SELECT DISTINCT codigo, nombre 
-        FROM carreras 
-        WHERE activa = 1 
-        ORDER BY nombre
-        """
-        carreras = db.execute_query(carreras_query)
-        
-        # Obtener períodos únicos
-        periodos_query = """
-        SELECT DISTINCT periodo_ingreso 
-        FROM estudiantes 
-        WHERE periodo_ingreso IS NOT NULL 
-        ORDER BY periodo_ingreso DESC
-        """
-        periodos = db.execute_query(periodos_query)
+        # El catálogo se precalcula; aquí no se consulta la base de datos
+        catalog = filter_catalog.get()
+        if catalog is None:
+            response = jsonify({"carreras": [], "periodos": [], "generos": []})
+            response.headers['Cache-Control'] = 'no-store'
+            return response
         
-        # Obtener géneros únicos
-        generos_query = """
-        SELECT DISTINCT genero 
-        FROM estudiantes 
-        WHERE genero IS NOT NULL 
-        ORDER BY genero
-        """
-        generos = db.execute_query(generos_query)
-        
-        return jsonify({
-            "carreras": carreras,
-            "periodos": periodos,
-            "generos": generos
-        })
+        response = current_app.response_class(catalog["body"], mimetype='application/json')
+        response.set_etag(catalog["etag"])
+        response.last_modified = catalog["generated_at"]
+        response.cache_control.public = True
+        response.cache_control.max_age = Config.FILTERS_MAX_AGE
+        return response.make_conditional(request)
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route('/dashboard/<int:dashboard_id>')
+@bp.route('/dashboard/<int:dashboard_id>')
+@versioned
 def single_dashboard(dashboard_id):
     """Endpoint para un dashboard individual"""
-    filters = {}
-    if request.args.get('carrera'):
-        filters['carrera'] = request.args.get('carrera')
-    if request.args.get('periodo'):
-        filters['periodo'] = request.args.get('periodo')
-    if request.args.get('genero'):
-        filters['genero'] = request.args.get('genero')
+    filters = get_request_filters()
     
     try:
-        dashboard_info = next((d for d in dashboard_manager.dashboards if d["id"] == dashboard_id), None)
+        dashboard_info = dashboard_manager.get_dashboard_info(dashboard_id)
         if not dashboard_info:
             return jsonify({"error": "Dashboard no encontrado"}), 404
         
         dashboard_data = dashboard_manager.generate_dashboard(dashboard_id, filters)
+        if dashboard_data:
+            # El HTML del gráfico ya contiene la figura; no se envía dos veces
+            dashboard_data = {k: v for k, v in dashboard_data.items() if k != "figure"}
         
         return jsonify({
             "info": dashboard_info,
@@ -121,34 +281,147 @@ def single_dashboard(dashboard_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/dashboard/<int:dashboard_id>/data')
+@bp.route('/api/dashboard/<int:dashboard_id>/data')
+@versioned
 def get_dashboard_data(dashboard_id):
     """API endpoint para obtener solo los datos de un dashboard"""
     try:
-        dashboard_info = next((d for d in dashboard_manager.dashboards if d["id"] == dashboard_id), None)
+        dashboard_info = dashboard_manager.get_dashboard_info(dashboard_id)
         if not dashboard_info:
             return jsonify({"error": "Dashboard no encontrado"}), 404
         
-        filters = {}
-        if request.args.get('carrera'):
-            filters['carrera'] = request.args.get('carrera')
-        if request.args.get('periodo'):
-            filters['periodo'] = request.args.get('periodo')
-        if request.args.get('genero'):
-            filters['genero'] = request.args.get('genero')
+        filters = get_request_filters()
         
-        dashboard_data = dashboard_manager.generate_dashboard(dashboard_id, filters)
+        dashboard_data = dashboard_manager.generate_dashboard(dashboard_id, filters) or {}
+        body = dashboard_payload(dashboard_info, dashboard_data, request.args.get('figura') == '1')
+        return current_app.response_class(body, mimetype='application/json')
         
-        return jsonify({
-            "dashboard_id": dashboard_id,
-            "name": dashboard_info["name"],
-            "data": dashboard_data.get("data", []) if dashboard_data else []
-        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def dashboard_payload(dashboard_info, dashboard_data, with_figure=False):
+    """JSON de los datos de un dashboard; con with_figure también el error y la figura"""
+    payload = {
+        "dashboard_id": dashboard_info["id"],
+        "name": dashboard_info["name"],
+        "data": dashboard_data.get("data", [])
+    }
+    if not with_figure:
+        return current_app.json.dumps(payload)
+    
+    # Carga diferida: la figura ya viene serializada, se pega sin volver a codificarla
+    if dashboard_data.get("error"):
+        payload["error"] = dashboard_data["error"]
+    figure = dashboard_data.get("figure")
+    if not figure:
+        payload["chart"] = dashboard_data.get("chart")
+        return current_app.json.dumps(payload)
+    return current_app.json.dumps(payload)[:-1] + ', "figure": ' + figure + '}'
+
+def batch_dashboard_infos(category):
+    """Dashboards pedidos con ?ids=1,2,3 o los de la categoría; (infos, error, código)"""
+    if category is not None:
+        dashboard_infos = dashboard_manager.get_category_dashboards(category)
+        if not dashboard_infos:
+            return None, "Categoría no encontrada", 404
+        return dashboard_infos, None, None
+    
+    ids = []
+    for value in ",".join(request.args.getlist('ids')).split(","):
+        value = value.strip()
+        if not value:
+            continue
+        if not value.isdigit():
+            return None, f"Id de dashboard inválido: {value}", 400
+        if int(value) not in ids:
+            ids.append(int(value))
+    if not ids:
+        return None, "Se esperaba ?ids=1,2,3", 400
+    if len(ids) > Config.BATCH_MAX_DASHBOARDS:
+        return None, f"Se pueden pedir hasta {Config.BATCH_MAX_DASHBOARDS} dashboards", 400
+    
+    dashboard_infos = [dashboard_manager.get_dashboard_info(dashboard_id) for dashboard_id in ids]
+    missing = [dashboard_id for dashboard_id, info in zip(ids, dashboard_infos) if not info]
+    if missing:
+        return None, f"Dashboards no encontrados: {missing}", 404
+    return dashboard_infos, None, None
+
+def wants_ndjson():
+    if request.args.get('formato') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best == 'application/x-ndjson'
+
+@bp.route('/api/dashboards/batch')
+@bp.route('/api/dashboards/batch/categoria/<category>')
+@versioned
+def get_dashboards_batch(category=None):
+    """API endpoint con los datos de varios dashboards (?ids=1,2,3 o una categoría).
+    
+    Se generan en paralelo y pasan por la cache de resultados, así que los que
+    comparten consulta (p. ej. el cubo de estudiantes) la ejecutan una sola
+    vez. Con ?formato=ndjson (o Accept: application/x-ndjson) se envía una
+    línea JSON por dashboard en cuanto termina, en orden de finalización; si
+    no, un solo JSON en el orden pedido.
+    """
+    try:
+        dashboard_infos, error, status = batch_dashboard_infos(category)
+        if error:
+            return jsonify({"error": error}), status
+        
+        filters = get_request_filters()
+        with_figure = request.args.get('figura') == '1'
+        
+        if wants_ndjson():
+            def lines():
+                for dashboard in dashboard_manager.iter_dashboards(dashboard_infos, filters):
+                    yield dashboard_payload(dashboard["info"], dashboard["data"], with_figure) + "\n"
+            
+            response = current_app.response_class(stream_with_context(lines()),
+                                                  mimetype='application/x-ndjson')
+            # Que un proxy (nginx) no acumule la respuesta antes de reenviarla
+            response.headers['X-Accel-Buffering'] = 'no'
+            return response
+        
+        all_dashboards = dashboard_manager.generate_dashboards(dashboard_infos, filters)
+        failed = sum(1 for dashboard in all_dashboards if dashboard["data"].get("failed"))
+        bodies = [dashboard_payload(dashboard["info"], dashboard["data"], with_figure)
+                  for dashboard in all_dashboards]
+        body = ('{"count": %d, "failed": %d, "dashboards": [' % (len(bodies), failed)
+                + ", ".join(bodies) + ']}')
+        return current_app.response_class(body, mimetype='application/json')
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/dashboards/list')
+@bp.route('/api/dashboard/<int:dashboard_id>/export')
+def export_dashboard(dashboard_id):
+    """Exporta el resultado completo de un dashboard (?formato=csv|jsonl|parquet) en streaming"""
+    try:
+        dashboard_info = dashboard_manager.get_dashboard_info(dashboard_id)
+        if not dashboard_info:
+            return jsonify({"error": "Dashboard no encontrado"}), 404
+        
+        export_format = request.args.get('formato', 'csv').lower()
+        try:
+            check_format(export_format)
+        except ExportError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        stream = dashboard_manager.stream_dashboard_data(dashboard_id, get_request_filters(), describe=True)
+        if stream is None:
+            return jsonify({"error": "El dashboard no tiene datos exportables"}), 404
+        
+        # La consulta se ejecuta aquí, así que un error todavía puede responder 500
+        chunks = export_chunks(stream, export_format)
+        content_type, extension = EXPORT_FORMATS[export_format]
+        response = current_app.response_class(chunks, content_type=content_type)
+        response.headers['Content-Disposition'] = f'attachment; filename="dashboard_{dashboard_id}.{extension}"'
+        return response
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/dashboards/list')
 def get_dashboards_list():
     """API endpoint para obtener la lista de todos los dashboards"""
     try:
@@ -159,86 +432,148 @@ def get_dashboards_list():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/stats/summary')
+@bp.route('/api/stats/summary')
 def get_summary_stats():
     """API endpoint para estadísticas generales del sistema"""
     try:
-        # Estadísticas básicas
-        stats_query = """
-        SELECT 
-            (SELECT COUNT(*) FROM estudiantes WHERE activo = 1) as estudiantes_activos,
-            (SELECT COUNT(*) FROM carreras WHERE activa = 1) as carreras_activas,
-            (SELECT COUNT(*) FROM calificaciones) as total_calificaciones,
-            (SELECT COUNT(*) FROM egresados) as total_egresados,
-            (SELECT COUNT(*) FROM estudiantes WHERE beca = 1) as estudiantes_con_beca
-        """
-        
-        result = db.execute_query(stats_query)
+        # Contadores en memoria; se recuentan en segundo plano (ver dashboards/stats.py)
+        result = summary_stats.get()
         
         if result:
-            return jsonify({
-                "summary": result[0],
-                "generated_at": "2024-01-01T00:00:00Z"
-            })
+            return jsonify(result)
         else:
             return jsonify({"error": "No se pudieron obtener las estadísticas"}), 500
             
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.errorhandler(404)
+@bp.route('/api/stats/summary/cambios', methods=['POST'])
+def apply_summary_changes():
+    """Aplica cambios de filas a los contadores: [{"tabla", "antes", "despues"}, ...].
+    
+    Solo para los procesos que modifican las tablas: requiere
+    Authorization: Bearer STATS_CHANGES_TOKEN y no existe si no hay token.
+    """
+    if not Config.STATS_CHANGES_TOKEN:
+        return jsonify({"error": "No encontrado"}), 404
+    expected = f"Bearer {Config.STATS_CHANGES_TOKEN}"
+    if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected.encode()):
+        return jsonify({"error": "No autorizado"}), 401
+    try:
+        changes = request.get_json(silent=True)
+        if isinstance(changes, dict):
+            changes = [changes]
+        try:
+            deltas = summary_stats.apply_changes(changes)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        # Las tablas cambiaron: las respuestas ya no son de la misma versión de los datos
+        dashboard_manager.mark_data_changed()
+        return jsonify({"deltas": deltas})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/stats/pool')
+def get_pool_stats():
+    """API endpoint para dimensionar el pool de conexiones"""
+    try:
+        return jsonify({"pool": db.get_pool_stats()})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def get_page_cache_stats():
+    page_cache = get_services().page_cache
+    if page_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **page_cache.stats()}
+
+@bp.route('/api/stats/cache')
+def get_cache_stats():
+    """API endpoint para los contadores de la cache de resultados"""
+    try:
+        return jsonify({
+            "cache": dashboard_manager.get_cache_stats(),
+            "render_cache": dashboard_manager.get_render_cache_stats(),
+            "page_cache": get_page_cache_stats()
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/stats/perf')
+def get_perf_stats():
+    """API endpoint con latencias, filas, cache y errores por dashboard"""
+    try:
+        return jsonify({"perf": dashboard_manager.get_perf_stats()})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/stats/warmup')
+def get_warmup_stats():
+    """API endpoint con el último reporte de precalentamiento de las caches"""
+    try:
+        return jsonify({"warmup": cache_warmer.last_report})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/metrics')
+def metrics():
+    """Métricas en formato de texto de Prometheus"""
+    lines = dashboard_manager.metrics.exposition()
+    lines += gauge_lines("db_pool", db.get_pool_stats(), "Pool de conexiones")
+    lines += gauge_lines("dashboard_cache", dashboard_manager.get_cache_stats(), "Cache de resultados")
+    lines += gauge_lines("dashboard_render_cache", dashboard_manager.get_render_cache_stats(),
+                         "Cache de gráficos renderizados")
+    lines += gauge_lines("page_cache", get_page_cache_stats(), "Cache de páginas completas")
+    return current_app.response_class("\n".join(lines) + "\n", mimetype='text/plain; version=0.0.4')
+
+@bp.route('/api/cache/invalidate', methods=['POST'])
+def invalidate_cache():
+    """Invalida la cache de resultados (toda, o solo ?data_key=...)"""
+    try:
+        data_key = request.args.get('data_key') or None
+        removed = dashboard_manager.invalidate_cache(data_key)
+        page_cache = get_services().page_cache
+        if page_cache is not None:
+            # Cualquier data_key puede aparecer en las páginas; se generan de nuevo todas
+            page_cache.invalidate()
+        if data_key is None:
+            filter_catalog.refresh()
+        return jsonify({
+            "invalidated": removed,
+            "data_key": data_key
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/summaries/refresh', methods=['POST'])
+def refresh_summaries():
+    """Refresca las tablas resumen ahora (?completo=1 para reconstruirlas)"""
+    try:
+        result = summary_refresher.refresh(full=request.args.get('completo') == '1')
+        return jsonify(result), 200 if result["ok"] else 500
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.app_errorhandler(404)
 def not_found_error(error):
     return render_template('404.html'), 404
 
-@app.errorhandler(500)
+@bp.app_errorhandler(500)
 def internal_error(error):
     return render_template('500.html'), 500
 
 # Rutas adicionales para navegación
-@app.route('/categoria/<category>')
+@bp.route('/categoria/<category>')
 def dashboard_by_category(category):
     """Mostrar dashboards filtrados por categoría"""
-    filters = {}
-    if request.args.get('carrera'):
-        filters['carrera'] = request.args.get('carrera')
-    if request.args.get('periodo'):
-        filters['periodo'] = request.args.get('periodo')
-    if request.args.get('genero'):
-        filters['genero'] = request.args.get('genero')
+    filters = get_request_filters()
     
     # Filtrar dashboards por categoría
-    category_dashboards = [d for d in dashboard_manager.dashboards if d["category"] == category]
-    
-    all_dashboards = []
-    for dashboard_info in category_dashboards:
-        dashboard_id = dashboard_info["id"]
-        
-        try:
-            dashboard_data = dashboard_manager.generate_dashboard(dashboard_id, filters)
-            
-            if dashboard_data:
-                all_dashboards.append({
-                    "info": dashboard_info,
-                    "data": dashboard_data
-                })
-            else:
-                all_dashboards.append({
-                    "info": dashboard_info,
-                    "data": {"error": f"No se pudieron cargar los datos para {dashboard_info['name']}"}
-                })
-                
-        except Exception as e:
-            all_dashboards.append({
-                "info": dashboard_info,
-                "data": {"error": f"Error en {dashboard_info['name']}: {str(e)}"}
-            })
+    category_dashboards = dashboard_manager.get_category_dashboards(category)
     
-    return render_template('unified_dashboard.html', 
-                         all_dashboards=all_dashboards,
-                         filters=filters,
-                         current_category=category)
+    return page_response(category_dashboards, filters, current_category=category)
 
-@app.route('/test-connection')
+@bp.route('/test-connection')
 def test_connection():
     """Endpoint para probar la conexión a la base de datos"""
     try:
@@ -265,4 +600,5 @@ def test_connection():
         }), 500
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Servidor de desarrollo; en producción: gunicorn -c gunicorn.conf.py wsgi:app
+    create_app().run(debug=Config.DEBUG, host='0.0.0.0', port=5000)
\ No newline at end of file
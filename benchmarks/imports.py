@@ -0,0 +1,95 @@
+"""Tiempo de importación de los módulos de arranque, con un presupuesto por módulo.
+
+Uso:
+    python -m benchmarks.imports [--repeticiones 5]
+
+Cada módulo se importa en un intérprete nuevo (sin caches de módulos) y se
+reporta la mediana en milisegundos, junto con las librerías pesadas que
+quedaron cargadas. Sale con código 1 si algún módulo pasa de su presupuesto o
+si, con LAZY_IMPORTS, importarlo carga pandas o plotly. Las librerías pesadas
+se miden aparte como referencia de lo que cuesta precargarlas.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from config import Config
+
+
+# Módulo -> segundos máximos de importación
+IMPORT_BUDGETS = {
+    "database": 0.25,
+    "dashboards.dashboard_definitions": 0.4,
+    "warmup": 0.4,
+    "wsgi": 0.6,
+}
+
+# Solo de referencia: lo que cuesta cargarlas al arrancar o en la primera petición
+REFERENCE_MODULES = ("pandas", "plotly.express")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+from dashboards.lazy import loaded_heavy_modules
+print(json.dumps({{"seconds": elapsed, "heavy": loaded_heavy_modules()}}))
+"""
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module, repeat):
+    """Mediana de importar `module` en `repeat` intérpretes nuevos"""
+    samples = []
+    heavy = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        samples.append(result["seconds"])
+        heavy = result["heavy"]
+    return {"module": module, "ms": round(statistics.median(samples) * 1000, 1), "heavy": heavy}
+
+
+def benchmark_imports(repeat):
+    results = []
+    for module, budget in IMPORT_BUDGETS.items():
+        entry = measure_import(module, repeat)
+        entry["budget_ms"] = round(budget * 1000, 1)
+        entry["ok"] = entry["ms"] <= entry["budget_ms"] and not (Config.LAZY_IMPORTS and entry["heavy"])
+        results.append(entry)
+    for module in REFERENCE_MODULES:
+        entry = measure_import(module, repeat)
+        entry["budget_ms"] = None
+        entry["ok"] = None
+        results.append(entry)
+    return results
+
+
+def print_report(results):
+    print(f"{'módulo':<36} {'ms':>8} {'presup.':>8} {'ok':>4}  pesadas cargadas")
+    for entry in results:
+        budget = entry["budget_ms"] if entry["budget_ms"] is not None else "-"
+        ok = "-" if entry["ok"] is None else ("sí" if entry["ok"] else "NO")
+        print(f"{entry['module']:<36} {entry['ms']:>8} {budget:>8} {ok:>4}  {', '.join(entry['heavy'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo de importación de los módulos de arranque")
+    parser.add_argument("--repeticiones", type=int, default=5,
+                        help="Intérpretes nuevos por módulo; se reporta la mediana (default: 5)")
+    args = parser.parse_args(argv)
+
+    results = benchmark_imports(args.repeticiones)
+    print_report(results)
+    return 0 if all(entry["ok"] is not False for entry in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,256 @@
+"""Benchmark de los dashboards y de las rutas de Flask.
+
+Uso:
+    python -m benchmarks.run [--estudiantes 5000] [--repeticiones 5]
+                             [--filtros carrera=ISC,genero=F] [--mysql]
+                             [--sin-rutas] [--sin-imports]
+                             [--salida resultados.json]
+
+Por defecto usa una base SQLite en memoria con datos sintéticos
+(benchmarks/sqlite_db.py); con --mysql mide contra la base configurada en
+config.py tal como esté. Para cada dashboard reporta el tiempo de consulta,
+de construcción del DataFrame, de serialización de la figura y el tamaño de
+lo que se envía; después mide de punta a punta /, /categoria/<categoria> y
+/api/dashboard/<id>/data con la cache fría y caliente, y el tiempo de
+importación de los módulos de arranque contra su presupuesto
+(benchmarks/imports.py). Los tiempos son medianas en milisegundos.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from config import Config
+import dashboards.dashboard_definitions as definitions
+from dashboards.dashboard_definitions import DashboardManager
+from dashboards.registry import CATEGORIES, DASHBOARDS, FUSED_ESTUDIANTES_KEYS, get_dashboard
+from benchmarks.sqlite_db import SQLiteDatabase
+from benchmarks import imports
+
+
+def _median_ms(samples):
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def _timed(func, repeat):
+    """Ejecuta func `repeat` veces; devuelve (último resultado, tiempos en segundos)"""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return result, samples
+
+
+class _RenderTimer:
+    """Envuelve render_figure para medir solo la serialización de la figura"""
+
+    def __init__(self):
+        self.samples = []
+        self._original = definitions.render_figure
+
+    def __call__(self, fig, dashboard_id):
+        start = time.perf_counter()
+        result = self._original(fig, dashboard_id)
+        self.samples.append(time.perf_counter() - start)
+        return result
+
+    def __enter__(self):
+        definitions.render_figure = self
+        return self
+
+    def __exit__(self, *exc):
+        definitions.render_figure = self._original
+
+
+def benchmark_dashboards(db, filters, repeat):
+    """Tiempos por dashboard llamando directamente al DashboardManager, sin cache"""
+    manager = DashboardManager(db, concurrent=False)
+    results = []
+
+    for dashboard in DASHBOARDS:
+        spec = get_dashboard(dashboard["id"])
+        data_key = spec["data_key"]
+        entry = {
+            "id": dashboard["id"],
+            "name": dashboard["name"],
+            "category": dashboard["category"],
+            "data_key": data_key,
+            "chart_type": None,
+        }
+        if not data_key:
+            results.append(entry)
+            continue
+
+        rows, query_samples = _timed(lambda: manager.query_dashboard_data(data_key, filters), repeat)
+        _, frame_samples = _timed(lambda: manager.build_dataframe(rows), repeat)
+
+        with _RenderTimer() as render_timer:
+            chart, chart_samples = _timed(
+                lambda: manager.create_chart(rows, spec["chart_type"], spec["title"], dashboard["id"]),
+                repeat
+            )
+
+        entry.update({
+            "chart_type": spec["chart_type"],
+            "fused": data_key in FUSED_ESTUDIANTES_KEYS,
+            "rows": len(rows),
+            "query_ms": _median_ms(query_samples),
+            "dataframe_ms": _median_ms(frame_samples),
+            "render_ms": _median_ms(render_timer.samples) if render_timer.samples else None,
+            "chart_total_ms": _median_ms(chart_samples),
+            "chart_bytes": len((chart.get("chart") or "").encode("utf-8")),
+            "figure_bytes": len((chart.get("figure") or "").encode("utf-8")),
+            "data_bytes": len(json.dumps(chart.get("data", []), default=str).encode("utf-8")),
+            "error": chart.get("error"),
+        })
+        results.append(entry)
+
+    # Consulta fusionada que reemplaza a las de FUSED_ESTUDIANTES_KEYS
+    cube, cube_samples = _timed(lambda: manager.query_dashboard_data("estudiantes_cubo", filters), repeat)
+    fused = {"data_key": "estudiantes_cubo", "rows": len(cube), "query_ms": _median_ms(cube_samples)}
+    return results, fused
+
+
+def _get(client, url):
+    start = time.perf_counter()
+    response = client.get(url)
+    elapsed = time.perf_counter() - start
+    return response, elapsed
+
+
+def benchmark_routes(db, filters, repeat):
+    """Tiempos de punta a punta con el cliente de pruebas de Flask"""
+    from app import create_app
+
+    # Servicios sobre la base del benchmark y sin tareas de fondo
+    flask_app = create_app(db=db, start=False)
+    services = flask_app.extensions["dashboards"]
+    manager = services.dashboard_manager
+    client = flask_app.test_client()
+    query = "&".join(f"{key}={value}" for key, value in filters.items())
+
+    urls = [("/", "/")]
+    urls += [(f"/categoria/{category}", f"/categoria/{category}") for category in CATEGORIES]
+    urls += [
+        (f"/api/dashboard/<id>/data#{dashboard['id']}", f"/api/dashboard/{dashboard['id']}/data")
+        for dashboard in DASHBOARDS
+    ]
+
+    results = []
+    for name, url in urls:
+        if query:
+            url = f"{url}?{query}"
+        cold, warm = [], []
+        status, size = None, 0
+        for _ in range(repeat):
+            manager.invalidate_cache()
+            if services.page_cache is not None:
+                services.page_cache.invalidate()
+            response, elapsed = _get(client, url)
+            cold.append(elapsed)
+            response, elapsed = _get(client, url)
+            warm.append(elapsed)
+            status, size = response.status_code, len(response.data)
+        results.append({
+            "route": name,
+            "url": url,
+            "status": status,
+            "bytes": size,
+            "cold_ms": _median_ms(cold),
+            "warm_ms": _median_ms(warm),
+        })
+    return results
+
+
+def _parse_filters(text):
+    filters = {}
+    for item in filter(None, (text or "").split(",")):
+        key, _, value = item.partition("=")
+        filters[key.strip()] = value.strip()
+    return filters
+
+
+def _print_report(report):
+    print(f"{'id':>3} {'dashboard':<38} {'filas':>6} {'query':>9} {'df':>8} {'render':>9} {'bytes':>9}")
+    for entry in report["dashboards"]:
+        if entry["chart_type"] is None:
+            continue
+        render = entry["render_ms"] if entry["render_ms"] is not None else "-"
+        size = entry["chart_bytes"] + entry["data_bytes"]
+        print(f"{entry['id']:>3} {entry['name'][:38]:<38} {entry['rows']:>6} "
+              f"{entry['query_ms']:>9} {entry['dataframe_ms']:>8} {render:>9} {size:>9}")
+    fused = report["fused"]
+    print(f"    estudiantes_cubo: {fused['rows']} filas, {fused['query_ms']} ms")
+    print()
+    print(f"{'ruta':<40} {'status':>6} {'bytes':>10} {'fría':>10} {'caliente':>10}")
+    for entry in report["routes"]:
+        print(f"{entry['route'][:40]:<40} {entry['status']:>6} {entry['bytes']:>10} "
+              f"{entry['cold_ms']:>10} {entry['warm_ms']:>10}")
+    if report["imports"]:
+        print()
+        imports.print_report(report["imports"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de dashboards y rutas")
+    parser.add_argument("--estudiantes", type=int, default=5000,
+                        help="Estudiantes sintéticos para la base SQLite (default: 5000)")
+    parser.add_argument("--repeticiones", type=int, default=5,
+                        help="Repeticiones por medición; se reporta la mediana (default: 5)")
+    parser.add_argument("--filtros", default="",
+                        help="Filtros a aplicar, p. ej. carrera=ISC,genero=F")
+    parser.add_argument("--mysql", action="store_true",
+                        help="Medir contra la base MySQL de config.py en lugar de SQLite")
+    parser.add_argument("--sin-rutas", action="store_true",
+                        help="Omitir las mediciones de punta a punta de Flask")
+    parser.add_argument("--sin-imports", action="store_true",
+                        help="Omitir la medición de tiempos de importación")
+    parser.add_argument("--salida", help="Archivo donde guardar el reporte JSON")
+    args = parser.parse_args(argv)
+
+    filters = _parse_filters(args.filtros)
+    if args.mysql:
+        from database import Database
+        db = Database()
+        backend = {"backend": "mysql", "host": Config.DB_HOST, "database": Config.DB_NAME}
+    else:
+        db = SQLiteDatabase()
+        start = time.perf_counter()
+        counts = db.seed(students=args.estudiantes)
+        backend = {"backend": "sqlite", "rows": counts,
+                   "seed_seconds": round(time.perf_counter() - start, 3)}
+
+    dashboards, fused = benchmark_dashboards(db, filters, args.repeticiones)
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "database": backend,
+        "filters": filters,
+        "repeat": args.repeticiones,
+        "config": {
+            "plotly_js_mode": Config.PLOTLY_JS_MODE,
+            "cache_enabled": Config.CACHE_ENABLED,
+            "fused_estudiantes": Config.FUSED_ESTUDIANTES,
+            "dashboard_parallel": Config.DASHBOARD_PARALLEL,
+            "dashboard_workers": Config.DASHBOARD_WORKERS,
+            "skeleton_first": Config.SKELETON_FIRST,
+            "lazy_imports": Config.LAZY_IMPORTS,
+        },
+        "dashboards": dashboards,
+        "fused": fused,
+        "routes": [] if args.sin_rutas else benchmark_routes(db, filters, args.repeticiones),
+        "imports": [] if args.sin_imports else imports.benchmark_imports(args.repeticiones),
+    }
+
+    _print_report(report)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        print(f"\nReporte guardado en {args.salida}")
+    return report
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,270 @@
+import itertools
+import random
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+
+
+# Esquema mínimo con las columnas que leen las consultas de dashboards/registry.py
+SCHEMA = [
+    """
+    CREATE TABLE carreras (
+        id INTEGER PRIMARY KEY, codigo TEXT, nombre TEXT, nivel TEXT, activa INTEGER
+    )
+    """,
+    """
+    CREATE TABLE estudiantes (
+        id INTEGER PRIMARY KEY, carrera_codigo TEXT, genero TEXT, edad INTEGER,
+        estado TEXT, tipo_escuela TEXT, periodo_ingreso TEXT, activo INTEGER,
+        beca INTEGER, updated_at TEXT
+    )
+    """,
+    "CREATE TABLE materias (id INTEGER PRIMARY KEY, nombre TEXT)",
+    """
+    CREATE TABLE calificaciones (
+        id INTEGER PRIMARY KEY, id_estudiante INTEGER, materia_id INTEGER,
+        cuatrimestre INTEGER, calificacion_final REAL, aprobada INTEGER, updated_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE riesgo_academico (
+        id INTEGER PRIMARY KEY, id_estudiante INTEGER, nivel_riesgo TEXT,
+        activo INTEGER, updated_at TEXT
+    )
+    """,
+    "CREATE TABLE abandonos (id INTEGER PRIMARY KEY, id_estudiante INTEGER, tipo TEXT)",
+    """
+    CREATE TABLE pagos (
+        id INTEGER PRIMARY KEY, id_estudiante INTEGER, periodo TEXT, pagado INTEGER, monto REAL
+    )
+    """,
+    """
+    CREATE TABLE egresados (
+        id INTEGER PRIMARY KEY, id_estudiante INTEGER, fecha_egreso TEXT, promedio_general REAL
+    )
+    """,
+    """
+    CREATE TABLE uso_recursos (
+        id INTEGER PRIMARY KEY, id_estudiante INTEGER, recurso TEXT, duracion_minutos INTEGER
+    )
+    """,
+    "CREATE INDEX idx_estudiantes_carrera ON estudiantes (carrera_codigo)",
+    "CREATE INDEX idx_calificaciones_estudiante ON calificaciones (id_estudiante)",
+    "CREATE INDEX idx_riesgo_estudiante ON riesgo_academico (id_estudiante)",
+]
+
+CARRERAS = [
+    ("ISC", "Ingeniería en Sistemas", "Ingeniería"),
+    ("IIN", "Ingeniería Industrial", "Ingeniería"),
+    ("IME", "Ingeniería Mecánica", "Ingeniería"),
+    ("ICI", "Ingeniería Civil", "Ingeniería"),
+    ("LAD", "Licenciatura en Administración", "Licenciatura"),
+    ("TSU", "TSU en Tecnologías de la Información", "TSU"),
+]
+MATERIAS = ["Matemáticas I", "Programación", "Física I", "Química", "Inglés I",
+            "Base de Datos", "Redes", "Estadística", "Contabilidad", "Cálculo"]
+ESTADOS = ["Guanajuato", "Jalisco", "Querétaro", "Michoacán", "Aguascalientes",
+           "San Luis Potosí", "Zacatecas", "Ciudad de México", "Puebla", "Hidalgo", "Sonora"]
+PERIODOS = [f"{year}-{term}" for year in range(2018, 2025) for term in (1, 2, 3)]
+NIVELES_RIESGO = ["Bajo", "Medio", "Alto", "Critico"]
+TIPOS_ABANDONO = ["Económico", "Académico", "Personal", "Laboral", "Cambio de carrera"]
+RECURSOS = ["Biblioteca", "Sala de cómputo", "Laboratorio", "Cubículo", "Auditorio"]
+
+
+# Funciones de MySQL que usan las consultas y que SQLite no trae
+def _field(value, *options):
+    return options.index(value) + 1 if value in options else 0
+
+
+def _year(value):
+    return int(str(value)[:4]) if value else None
+
+
+def _concat(*values):
+    if any(value is None for value in values):
+        return None
+    return "".join(str(value) for value in values)
+
+
+_database_ids = itertools.count(1)
+
+
+class SQLiteDatabase:
+    """Sustituto en memoria de Database para los benchmarks.
+
+    Expone execute_query/execute_transaction/get_dataframe con la misma firma
+    y el mismo formato de filas (dicts). Cada hilo usa su propia conexión a
+    una base en memoria compartida, así que las consultas en paralelo del
+    DashboardManager se ejercitan igual que con el pool de MySQL.
+    """
+
+    def __init__(self):
+        self.uri = f"file:benchmark_{next(_database_ids)}?mode=memory&cache=shared"
+        self._local = threading.local()
+        # Mantiene viva la base en memoria mientras exista la instancia
+        self._keeper = self._open()
+        self._queries = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        connection = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.create_function("FIELD", -1, _field, deterministic=True)
+        connection.create_function("YEAR", 1, _year, deterministic=True)
+        connection.create_function("CONCAT", -1, _concat, deterministic=True)
+        connection.create_function("RAND", 0, random.random)
+        return connection
+
+    def connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._open()
+        return connection
+
+    @staticmethod
+    def translate(query):
+        """Adapta los marcadores %s de mysql.connector a los ? de sqlite3"""
+        return query.replace("%s", "?")
+
+    def execute_query(self, query, params=None):
+        with self._lock:
+            self._queries += 1
+        try:
+            cursor = self.connect().execute(self.translate(query), params or ())
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error ejecutando query: {e}")
+            print(f"Query: {query}")
+            return []
+
+    def execute_transaction(self, statements):
+        connection = self.connect()
+        try:
+            with connection:
+                for query, params in statements:
+                    connection.execute(self.translate(query), params or ())
+            return True
+        except sqlite3.Error as e:
+            print(f"Error ejecutando transacción: {e}")
+            return False
+
+    def stream_query(self, query, params=None, batch_size=None, describe=False):
+        batch_size = batch_size or 1000
+        cursor = self.connect().execute(self.translate(query), params or ())
+        # sqlite3 no informa el tipo de las columnas (type_code es None)
+        description = tuple(cursor.description or ())
+        yield description if describe else tuple(column[0] for column in description)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+
+    def get_dataframe(self, query, params=None):
+        return pd.DataFrame(self.execute_query(query, params))
+
+    def get_pool_stats(self):
+        return {"backend": "sqlite", "queries": self._queries}
+
+    def seed(self, students=1000, seed=42):
+        """Crea el esquema y lo llena con datos sintéticos proporcionales a `students`.
+
+        Por estudiante se generan ~8 calificaciones, 3 pagos y 2 usos de
+        recursos; el 10% tiene registro de riesgo, el 5% de abandono y el 15%
+        de egreso. Con la misma semilla los datos son idénticos entre corridas.
+        """
+        rng = random.Random(seed)
+        today = str(date.today())
+        with self._keeper as connection:
+            for ddl in SCHEMA:
+                connection.execute(ddl)
+
+            connection.executemany(
+                "INSERT INTO carreras (id, codigo, nombre, nivel, activa) VALUES (?, ?, ?, ?, 1)",
+                [(i, codigo, nombre, nivel) for i, (codigo, nombre, nivel) in enumerate(CARRERAS, 1)]
+            )
+            connection.executemany(
+                "INSERT INTO materias (id, nombre) VALUES (?, ?)",
+                list(enumerate(MATERIAS, 1))
+            )
+
+            estudiantes = []
+            calificaciones = []
+            riesgo = []
+            abandonos = []
+            pagos = []
+            egresados = []
+            recursos = []
+            for student_id in range(1, students + 1):
+                estudiantes.append((
+                    student_id,
+                    rng.choice(CARRERAS)[0],
+                    rng.choice("MMMFFFX") if rng.random() > 0.01 else None,
+                    rng.randint(17, 40) if rng.random() > 0.02 else None,
+                    rng.choice(ESTADOS) if rng.random() > 0.05 else None,
+                    rng.choice(["Pública", "Privada"]),
+                    rng.choice(PERIODOS),
+                    1 if rng.random() < 0.85 else 0,
+                    1 if rng.random() < 0.3 else 0,
+                    today,
+                ))
+                for _ in range(8):
+                    grade = round(rng.uniform(4, 10), 2) if rng.random() > 0.05 else None
+                    calificaciones.append((
+                        student_id, rng.randint(1, len(MATERIAS)), rng.randint(1, 10),
+                        grade, 1 if grade is not None and grade >= 7 else 0, today,
+                    ))
+                if rng.random() < 0.1:
+                    riesgo.append((student_id, rng.choice(NIVELES_RIESGO), 1, today))
+                if rng.random() < 0.05:
+                    abandonos.append((student_id, rng.choice(TIPOS_ABANDONO)))
+                for _ in range(3):
+                    pagos.append((student_id, rng.choice(PERIODOS), 1 if rng.random() < 0.8 else 0,
+                                  round(rng.uniform(2000, 9000), 2)))
+                if rng.random() < 0.15:
+                    graduated = date(2019, 1, 1) + timedelta(days=rng.randint(0, 5 * 365))
+                    egresados.append((student_id, str(graduated), round(rng.uniform(7, 10), 2)))
+                for _ in range(2):
+                    recursos.append((student_id, rng.choice(RECURSOS), rng.randint(15, 240)))
+
+            connection.executemany(
+                "INSERT INTO estudiantes (id, carrera_codigo, genero, edad, estado, tipo_escuela, "
+                "periodo_ingreso, activo, beca, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                estudiantes
+            )
+            connection.executemany(
+                "INSERT INTO calificaciones (id_estudiante, materia_id, cuatrimestre, "
+                "calificacion_final, aprobada, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                calificaciones
+            )
+            connection.executemany(
+                "INSERT INTO riesgo_academico (id_estudiante, nivel_riesgo, activo, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                riesgo
+            )
+            connection.executemany(
+                "INSERT INTO abandonos (id_estudiante, tipo) VALUES (?, ?)", abandonos
+            )
+            connection.executemany(
+                "INSERT INTO pagos (id_estudiante, periodo, pagado, monto) VALUES (?, ?, ?, ?)", pagos
+            )
+            connection.executemany(
+                "INSERT INTO egresados (id_estudiante, fecha_egreso, promedio_general) VALUES (?, ?, ?)",
+                egresados
+            )
+            connection.executemany(
+                "INSERT INTO uso_recursos (id_estudiante, recurso, duracion_minutos) VALUES (?, ?, ?)",
+                recursos
+            )
+
+        return {
+            "estudiantes": len(estudiantes),
+            "calificaciones": len(calificaciones),
+            "riesgo_academico": len(riesgo),
+            "abandonos": len(abandonos),
+            "pagos": len(pagos),
+            "egresados": len(egresados),
+            "uso_recursos": len(recursos),
+        }
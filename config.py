@@ -1,5 +1,17 @@
 import os
 
+
+def _env_value(raw, default):
+    """Convierte el texto de una variable de entorno al tipo del valor por defecto"""
+    if isinstance(default, bool):
+        return raw.strip().lower() in ("1", "true", "yes", "si", "sí", "on")
+    if isinstance(default, int):
+        return int(raw)
+    if isinstance(default, float):
+        return float(raw)
+    return raw
+
+
 class Config:
     # Configuración de la base de datos
     DB_HOST = 'localhost'
@@ -7,6 +19,115 @@ class Config:
     DB_PASSWORD = 'conejillo18'  # Cambia por tu password
     DB_NAME = 'alumnos_utl_tarea'
     
+    # Pool de conexiones
+    DB_POOL_SIZE = 10               # Conexiones abiertas como máximo
+    DB_POOL_PREWARM = 4             # Conexiones abiertas al arrancar (y mínimo que se conserva)
+    DB_POOL_IDLE_TIMEOUT = 300      # Segundos ociosa antes de cerrarse
+    DB_POOL_CHECKOUT_TIMEOUT = 10   # Segundos esperando una conexión libre
+    DB_POOL_PING_INTERVAL = 30      # Segundos ociosa tras los que se verifica antes de usarla
+    DB_STREAM_BATCH_SIZE = 1000     # Filas por fetchmany en las consultas en streaming
+    DB_PREPARED_STATEMENTS = True   # Ejecutar execute_query con sentencias preparadas en cache
+    DB_STATEMENT_CACHE_SIZE = 64    # Sentencias preparadas por conexión (ver max_prepared_stmt_count)
+    
+    # Generación de dashboards
+    DASHBOARD_PARALLEL = True        # Generar los dashboards de una página en paralelo
+    DASHBOARD_WORKERS = 8            # Hilos para consultas (no más que DB_POOL_SIZE)
+    DASHBOARD_TIMEOUT = 15           # Segundos máximos por dashboard, desde que empieza, antes de mostrar error
+    DASHBOARD_RENDER_PROCESSES = 0   # Procesos para fig.to_html; 0 = renderizar en el hilo
+    BATCH_MAX_DASHBOARDS = 40        # Dashboards por petición a /api/dashboards/batch
+    
+    # Cache de resultados de dashboards
+    CACHE_ENABLED = True
+    CACHE_MAX_ENTRIES = 512          # Entradas (data_key + filtros) antes de desalojar la menos usada
+    CACHE_DEFAULT_TTL = 900          # Segundos; ver DATA_TTLS para los dashboards con otro TTL
+    
+    # Cache de gráficos renderizados por (dashboard, tipo de gráfico, huella de los datos)
+    RENDER_CACHE_ENABLED = True
+    RENDER_CACHE_MAX_ENTRIES = 1024
+    RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Suma de HTML + JSON de las figuras guardadas
+    RENDER_CACHE_TTL = 86400
+    
+    # Calcular los dashboards de estudiantes (1, 3-10) con un solo recorrido de la tabla
+    FUSED_ESTUDIANTES = True
+    
+    # Tablas resumen (carrera × periodo × género) para los dashboards académicos y de riesgo
+    USE_SUMMARY_TABLES = False
+    SUMMARY_REFRESH_INTERVAL = 300        # Segundos entre refrescos incrementales
+    SUMMARY_FULL_REFRESH_INTERVAL = 86400 # Segundos entre reconstrucciones completas
+    SUMMARY_CHANGE_COLUMN = 'updated_at'  # Columna de última modificación en las tablas origen
+    SUMMARY_WATERMARK_OVERLAP = 60        # Segundos de solapamiento con el refresco anterior
+    SUMMARY_MAX_INCREMENTAL_SLICES = 200  # Con más grupos cambiados se reconstruye todo
+    
+    # Renderizado de gráficos: "static" sirve plotly.js una vez desde /assets (con huella,
+    # ver dashboards/assets.py), "inline" incrusta la librería completa en cada gráfico
+    PLOTLY_JS_MODE = 'static'
+    
+    # "/" y "/categoria/<c>" devuelven solo la estructura y cada tarjeta carga su
+    # gráfico al hacerse visible; las que aparecen juntas van en un /api/dashboards/batch
+    SKELETON_FIRST = False
+    
+    # Catálogo de /api/filters: se recalcula en segundo plano y el navegador lo cachea
+    FILTERS_REFRESH_INTERVAL = 600        # Segundos entre recálculos en segundo plano
+    FILTERS_TTL = 900                     # Antigüedad a partir de la cual se recalcula al servirlo
+    FILTERS_MAX_AGE = 300                 # Cache-Control max-age para el navegador
+    
+    # Contadores de /api/stats/summary: recuento completo cada tantos segundos;
+    # entre recuentos se mantienen con POST /api/stats/summary/cambios
+    STATS_RECOUNT_INTERVAL = 300
+    STATS_CHANGES_TOKEN = ''              # Authorization: Bearer para /cambios; vacío = deshabilitado
+    
+    # Precalentamiento de las caches de datos y gráficos (ver warmup.py)
+    WARMUP_ON_START = False               # Precalentar en segundo plano al arrancar la app
+    WARMUP_INTERVAL = 0                   # Segundos entre precalentamientos; 0 = solo al arrancar
+    WARMUP_MAX_COMBINATIONS = 20          # Combinaciones de filtros, contando "sin filtros"
+    WARMUP_RECENT_PERIODS = 4             # Períodos de ingreso más recientes a incluir
+    WARMUP_WORKERS = 4                    # Generaciones en paralelo (no más que DB_POOL_SIZE)
+    
+    # Cache de páginas completas (/ y /categoria/<c>) por ruta + filtros, con stale-while-revalidate
+    PAGE_CACHE_ENABLED = True
+    PAGE_CACHE_TTL = 60                   # Segundos fresca; después se sirve y se regenera en segundo plano
+    PAGE_CACHE_MAX_STALE = 3600           # Segundos máximos sirviendo una versión vencida
+    PAGE_CACHE_MAX_ENTRIES = 256
+    PAGE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+    
+    # Compresión de las respuestas dinámicas (HTML, JSON) según Accept-Encoding
+    COMPRESS_ENABLED = True
+    COMPRESS_MIN_SIZE = 500               # Bytes; las respuestas más chicas van sin comprimir
+    COMPRESS_LEVEL = 6                    # gzip de 1 a 9
+    COMPRESS_BROTLI_QUALITY = 5           # brotli de 0 a 11 (opcional, requiere el paquete brotli)
+    
+    # Recursos estáticos con huella (style.css, main.js, plotly.js) y sus copias precomprimidas
+    ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'dist')
+    ASSETS_BROTLI_QUALITY = 11            # Se comprimen una vez por versión del archivo
+    
+    # pandas y plotly se importan en el primer uso; False los carga al importar la app
+    # (gunicorn con preload_app los carga igual una vez en el master, ver dashboards/lazy.py)
+    LAZY_IMPORTS = True
+    
     # Configuración de Flask
     SECRET_KEY = 'tu_clave_secreta_aqui'
-    DEBUG = True
\ No newline at end of file
+    DEBUG = True
+    
+    @classmethod
+    def from_env(cls, environ=None):
+        """Sobrescribe los valores con las variables de entorno del mismo nombre.
+        
+        DB_HOST, DB_PASSWORD, DB_POOL_SIZE, CACHE_ENABLED, SECRET_KEY, DEBUG...:
+        cada variable se convierte al tipo del valor por defecto (bool, int,
+        float o texto); los valores que no son escalares no se leen del entorno.
+        Devuelve los nombres sobrescritos.
+        """
+        environ = os.environ if environ is None else environ
+        applied = []
+        for name, default in vars(cls).items():
+            if not name.isupper() or name not in environ:
+                continue
+            if not isinstance(default, (bool, int, float, str)):
+                continue
+            setattr(cls, name, _env_value(environ[name], default))
+            applied.append(name)
+        return applied
+
+
+# Los valores de producción (credenciales, tamaños de pool, workers) vienen del entorno
+Config.from_env()
\ No newline at end of file
@@ -0,0 +1,344 @@
+"""Asesor de índices: EXPLAIN de cada consulta registrada y propuesta de índices.
+
+Uso:
+    python -m dashboards.advisor [--analyze] [--resumenes] [--filtros carrera=ISC,genero=F]
+                                 [--min-filas 1000] [--migracion indices.sql]
+                                 [--salida reporte.json]
+
+Ejecuta EXPLAIN (y con --analyze también EXPLAIN ANALYZE, que corre la
+consulta) para cada consulta de dashboards/registry.py, sin filtros y con
+los filtros que admite; si no se indican valores se usan los primeros del
+catálogo de filtros. Marca los recorridos completos de tabla o de índice
+sobre tablas con al menos --min-filas filas estimadas, los filesort y las
+tablas temporales, y propone índices compuestos para esas tablas: primero
+las columnas comparadas por igualdad (filtros y uniones), luego las del
+GROUP BY si caben y al final una columna de rango. Se descartan los índices
+que ya existen o que son prefijo de otro propuesto. Con --migracion escribe
+los ALTER TABLE correspondientes.
+"""
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timezone
+
+from config import Config
+from dashboards.filters import FILTER_QUERIES
+from dashboards.registry import QUERIES, SUMMARY_QUERIES, build_query, supported_filters
+
+
+MIN_ROWS = 1000          # Filas estimadas a partir de las que un recorrido completo importa
+MAX_INDEX_COLUMNS = 4
+
+SCHEMA_COLUMNS_QUERY = """
+    SELECT TABLE_NAME as tabla, COLUMN_NAME as columna
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+"""
+
+SCHEMA_INDEXES_QUERY = """
+    SELECT TABLE_NAME as tabla, INDEX_NAME as indice, COLUMN_NAME as columna
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+    ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+"""
+
+_SQL_KEYWORDS = {
+    "where", "join", "left", "right", "inner", "outer", "cross", "natural", "straight_join",
+    "on", "using", "group", "order", "limit", "having", "union", "select", "as", "and", "or",
+    "not", "in", "is", "null", "case", "when", "then", "else", "end", "between", "like",
+}
+
+_IDENTIFIER = r"[a-z_][a-z0-9_]*"
+_TABLE_REFERENCE = re.compile(rf"\b(?:from|join)\s+({_IDENTIFIER})(?:\s+(?:as\s+)?({_IDENTIFIER}))?", re.I)
+_COMPARISON = re.compile(
+    rf"((?:{_IDENTIFIER}\.)?{_IDENTIFIER})\s*(=|<=>|>=|<=|<>|!=|>|<|\bbetween\b|\bin\b|\bis\s+not\b|\bis\b|\blike\b)",
+    re.I
+)
+# Lado derecho calificado de una unión: "c.codigo = e.carrera_codigo"
+_JOIN_RIGHT = re.compile(rf"=\s*({_IDENTIFIER}\.{_IDENTIFIER})", re.I)
+_CASE_EXPRESSION = re.compile(r"\bcase\b.*?\bend\b", re.I | re.S)
+_CLAUSE_END = r"(?=\border\s+by\b|\blimit\b|\bhaving\b|\bunion\b|\)|$)"
+_GROUP_BY = re.compile(rf"\bgroup\s+by\s+(.+?){_CLAUSE_END}", re.I | re.S)
+_ORDER_BY = re.compile(r"\border\s+by\s+(.+?)(?=\blimit\b|\bunion\b|\)|$)", re.I | re.S)
+_ACTUAL_TIME = re.compile(r"actual time=[\d.]+\.\.([\d.]+) rows=([\d.]+)")
+
+_EQUALITY_OPERATORS = {"=", "<=>", "in", "is"}
+_RANGE_OPERATORS = {">=", "<=", ">", "<", "between", "like", "is not"}
+
+
+def load_schema(db):
+    """Columnas e índices existentes de cada tabla de la base"""
+    columns = {}
+    for row in db.execute_query(SCHEMA_COLUMNS_QUERY):
+        columns.setdefault(row["tabla"], set()).add(row["columna"])
+    indexes = {}
+    for row in db.execute_query(SCHEMA_INDEXES_QUERY):
+        indexes.setdefault(row["tabla"], {}).setdefault(row["indice"], []).append(row["columna"])
+    return {
+        "columns": columns,
+        "indexes": {table: [tuple(cols) for cols in by_name.values()] for table, by_name in indexes.items()},
+    }
+
+
+def sample_filters(db):
+    """Primer valor de cada filtro según el catálogo de /api/filters"""
+    samples = {}
+    for dimension, (catalog, column) in {"carrera": ("carreras", "codigo"),
+                                          "periodo": ("periodos", "periodo_ingreso"),
+                                          "genero": ("generos", "genero")}.items():
+        rows = db.execute_query(FILTER_QUERIES[catalog])
+        if rows:
+            samples[dimension] = rows[0][column]
+    return samples
+
+
+def table_aliases(sql, schema_columns):
+    """alias -> tabla de las tablas reales de la consulta (las derivadas se ignoran)"""
+    aliases = {}
+    for table, alias in _TABLE_REFERENCE.findall(sql):
+        if table not in schema_columns:
+            continue
+        aliases[table] = table
+        if alias and alias.lower() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def _resolve(reference, aliases, schema_columns):
+    """(tabla, columna) de una referencia "alias.columna" o "columna", o None si no es una columna"""
+    qualifier, _, column = reference.rpartition(".")
+    if qualifier:
+        table = aliases.get(qualifier)
+        return (table, column) if table and column in schema_columns.get(table, ()) else None
+    candidates = {table for table in aliases.values() if column in schema_columns.get(table, ())}
+    return (candidates.pop(), column) if len(candidates) == 1 else None
+
+
+def column_usage(sql, schema_columns):
+    """Columnas de cada tabla usadas por igualdad, rango, GROUP BY y ORDER BY"""
+    aliases = table_aliases(sql, schema_columns)
+    usage = {table: {"equality": [], "range": [], "group": [], "order": []} for table in set(aliases.values())}
+
+    def add(kind, reference):
+        resolved = _resolve(reference.strip(), aliases, schema_columns)
+        if resolved and resolved[1] not in usage[resolved[0]][kind]:
+            usage[resolved[0]][kind].append(resolved[1])
+
+    # Los CASE de la lista de columnas no filtran filas
+    body = _CASE_EXPRESSION.sub(" ", sql)
+    for reference, operator in _COMPARISON.findall(body):
+        operator = " ".join(operator.lower().split())
+        if operator in _EQUALITY_OPERATORS:
+            add("equality", reference)
+        elif operator in _RANGE_OPERATORS:
+            add("range", reference)
+    for reference in _JOIN_RIGHT.findall(body):
+        add("equality", reference)
+    for pattern, kind in ((_GROUP_BY, "group"), (_ORDER_BY, "order")):
+        for clause in pattern.findall(body):
+            for item in clause.split(","):
+                item = re.sub(r"\s+(asc|desc)\s*$", "", item.strip(), flags=re.I)
+                if re.fullmatch(rf"(?:{_IDENTIFIER}\.)?{_IDENTIFIER}", item, re.I):
+                    add(kind, item)
+    return usage
+
+
+def find_problems(plan, aliases, min_rows=MIN_ROWS):
+    """Recorridos completos, filesort y tablas temporales de un plan de EXPLAIN"""
+    problems = []
+    for row in plan:
+        table = aliases.get(row.get("table"), row.get("table"))
+        rows = int(row.get("rows") or 0)
+        extra = row.get("Extra") or ""
+        if row.get("type") == "ALL" and rows >= min_rows:
+            problems.append({"table": table, "problem": "full_scan", "rows": rows})
+        elif row.get("type") == "index" and rows >= min_rows:
+            problems.append({"table": table, "problem": "full_index_scan", "rows": rows})
+        if "Using filesort" in extra:
+            problems.append({"table": table, "problem": "filesort", "rows": rows})
+        if "Using temporary" in extra:
+            problems.append({"table": table, "problem": "temporary", "rows": rows})
+    return problems
+
+
+def propose_index(usage):
+    """Columnas de un índice compuesto para el uso de una tabla, o None si no hay nada que indexar"""
+    columns = list(usage["equality"])
+    group = [column for column in usage["group"] if column not in columns]
+    # El GROUP BY solo aprovecha el índice si entra completo después de las igualdades
+    if group and len(columns) + len(group) <= MAX_INDEX_COLUMNS:
+        columns += group
+    elif not columns:
+        columns = [column for column in usage["order"]][:MAX_INDEX_COLUMNS]
+    ranges = [column for column in usage["range"] if column not in columns]
+    if ranges and len(columns) < MAX_INDEX_COLUMNS:
+        columns.append(ranges[0])
+    return tuple(columns[:MAX_INDEX_COLUMNS]) or None
+
+
+def _is_prefix(columns, other):
+    return tuple(other[:len(columns)]) == tuple(columns)
+
+
+def consolidate(proposals, existing_indexes):
+    """Une las propuestas por tabla: sin duplicados, sin prefijos de otras ni de índices existentes"""
+    by_table = {}
+    for proposal in proposals:
+        entry = by_table.setdefault(proposal["table"], {}).setdefault(
+            proposal["columns"], {"table": proposal["table"], "columns": proposal["columns"], "queries": []}
+        )
+        if proposal["query"] not in entry["queries"]:
+            entry["queries"].append(proposal["query"])
+
+    result = []
+    for table, entries in sorted(by_table.items()):
+        existing = existing_indexes.get(table, [])
+        candidates = sorted(entries.values(), key=lambda entry: len(entry["columns"]), reverse=True)
+        kept = []
+        for entry in candidates:
+            if any(_is_prefix(entry["columns"], index) for index in existing):
+                continue
+            covering = next((other for other in kept if _is_prefix(entry["columns"], other["columns"])), None)
+            if covering is not None:
+                covering["queries"].extend(query for query in entry["queries"]
+                                           if query not in covering["queries"])
+                continue
+            kept.append(entry)
+        for entry in kept:
+            entry["name"] = f"idx_{table}_{'_'.join(entry['columns'])}"[:64]
+            result.append(entry)
+    return result
+
+
+def migration_script(indexes):
+    """Script SQL con un ALTER TABLE en línea por índice propuesto y su reversa comentada"""
+    lines = [
+        f"-- Índices propuestos por python -m dashboards.advisor ({Config.DB_NAME})",
+        f"-- Generado: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}",
+        "",
+    ]
+    for index in indexes:
+        lines.append(f"-- Consultas: {', '.join(index['queries'])}")
+        lines.append(f"ALTER TABLE {index['table']} ADD INDEX {index['name']} "
+                     f"({', '.join(index['columns'])}), ALGORITHM=INPLACE, LOCK=NONE;")
+        lines.append(f"-- Reversa: ALTER TABLE {index['table']} DROP INDEX {index['name']};")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def explain_analyze(db, sql, params):
+    """Árbol de EXPLAIN ANALYZE (MySQL 8.0.18+) y el tiempo real total en ms"""
+    rows = db.execute_query(f"EXPLAIN ANALYZE {sql}", params or None)
+    tree = "\n".join(str(next(iter(row.values()))) for row in rows)
+    match = _ACTUAL_TIME.search(tree)
+    return {"tree": tree, "actual_ms": float(match.group(1)) if match else None}
+
+
+def advise(db, analyze=False, use_summaries=False, filters=None, min_rows=MIN_ROWS):
+    """Ejecuta los EXPLAIN de todas las consultas; devuelve el reporte con los índices propuestos"""
+    schema = load_schema(db)
+    filters = sample_filters(db) if filters is None else filters
+    data_keys = list(QUERIES) + ([f"{key} (resumen)" for key in SUMMARY_QUERIES] if use_summaries else [])
+
+    queries = []
+    proposals = []
+    for label in data_keys:
+        data_key = label.split(" ")[0]
+        summary = label.endswith("(resumen)")
+        variants = [("sin filtros", {})]
+        applied = supported_filters(data_key, filters)
+        if applied:
+            variants.append(("con filtros", applied))
+        for variant, variant_filters in variants:
+            sql, params = build_query(data_key, variant_filters, use_summaries=summary)
+            entry = {"query": label, "variant": variant, "filters": variant_filters}
+            plan = db.execute_query(f"EXPLAIN {sql}", params or None)
+            if not plan:
+                entry["error"] = "EXPLAIN no devolvió filas (¿consulta inválida o sin conexión?)"
+                queries.append(entry)
+                continue
+            aliases = table_aliases(sql, schema["columns"])
+            usage = column_usage(sql, schema["columns"])
+            entry["plan"] = plan
+            entry["problems"] = find_problems(plan, aliases, min_rows)
+            if analyze:
+                entry["analyze"] = explain_analyze(db, sql, params)
+            for table in sorted({problem["table"] for problem in entry["problems"]
+                                 if problem["problem"] in ("full_scan", "full_index_scan")}):
+                columns = propose_index(usage[table]) if table in usage else None
+                if columns:
+                    proposals.append({"table": table, "columns": columns, "query": label})
+            queries.append(entry)
+
+    return {
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "database": Config.DB_NAME,
+        "filters": filters,
+        "min_rows": min_rows,
+        "queries": queries,
+        "indexes": consolidate(proposals, schema["indexes"]),
+    }
+
+
+def print_report(report):
+    print(f"{'consulta':<38} {'variante':<12} {'tabla':<20} {'problema':<16} {'filas':>9}")
+    for entry in report["queries"]:
+        if entry.get("error"):
+            print(f"{entry['query'][:38]:<38} {entry['variant']:<12} {entry['error']}")
+            continue
+        for problem in entry["problems"]:
+            print(f"{entry['query'][:38]:<38} {entry['variant']:<12} {str(problem['table'])[:20]:<20} "
+                  f"{problem['problem']:<16} {problem['rows']:>9}")
+        if entry.get("analyze") and entry["analyze"]["actual_ms"] is not None:
+            print(f"{entry['query'][:38]:<38} {entry['variant']:<12} {'':<20} {'tiempo real ms':<16} "
+                  f"{entry['analyze']['actual_ms']:>9}")
+    print()
+    if not report["indexes"]:
+        print("Sin índices que proponer")
+    for index in report["indexes"]:
+        print(f"{index['name']}: {index['table']} ({', '.join(index['columns'])}) "
+              f"<- {', '.join(index['queries'])}")
+
+
+def _parse_filters(text):
+    filters = {}
+    for item in filter(None, (text or "").split(",")):
+        key, _, value = item.partition("=")
+        filters[key.strip()] = value.strip()
+    return filters
+
+
+def main(argv=None):
+    from database import Database
+
+    parser = argparse.ArgumentParser(description="EXPLAIN de las consultas de dashboards y propuesta de índices")
+    parser.add_argument("--analyze", action="store_true",
+                        help="Ejecutar también EXPLAIN ANALYZE (corre cada consulta)")
+    parser.add_argument("--resumenes", action="store_true",
+                        help="Incluir las variantes sobre las tablas resumen")
+    parser.add_argument("--filtros",
+                        help="Valores de filtro, p. ej. carrera=ISC,genero=F (default: del catálogo)")
+    parser.add_argument("--min-filas", type=int, default=MIN_ROWS,
+                        help=f"Filas estimadas mínimas para marcar un recorrido completo (default: {MIN_ROWS})")
+    parser.add_argument("--migracion", help="Archivo donde escribir el script con los índices propuestos")
+    parser.add_argument("--salida", help="Archivo donde guardar el reporte JSON")
+    args = parser.parse_args(argv)
+
+    filters = _parse_filters(args.filtros) if args.filtros else None
+    report = advise(Database(), analyze=args.analyze, use_summaries=args.resumenes,
+                    filters=filters, min_rows=args.min_filas)
+    print_report(report)
+    if args.migracion:
+        with open(args.migracion, "w", encoding="utf-8") as f:
+            f.write(migration_script(report["indexes"]))
+        print(f"\nMigración guardada en {args.migracion}")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        print(f"Reporte guardado en {args.salida}")
+    return report
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
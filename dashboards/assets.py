@@ -0,0 +1,123 @@
+"""Recursos estáticos con huella en el nombre y copias precomprimidas.
+
+    python -m dashboards.assets
+
+genera las copias .gz y .br (con brotli instalado) en ASSETS_DIR; conviene
+correrlo al desplegar, porque brotli con la calidad máxima tarda varios
+segundos con el bundle de plotly. La app las genera al arrancar si faltan.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+
+from config import Config
+from dashboards.dashboard_definitions import PLOTLY_JS_PATH
+from dashboards.http_cache import available_encodings, compress
+
+
+_STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+
+# Nombre lógico (el que usan las plantillas) -> archivo de origen
+ASSET_SOURCES = {
+    "css/style.css": os.path.join(_STATIC_DIR, "css", "style.css"),
+    "js/main.js": os.path.join(_STATIC_DIR, "js", "main.js"),
+    "plotly.min.js": PLOTLY_JS_PATH,
+}
+
+_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def _write_atomic(path, data):
+    # Varios procesos pueden generarlo a la vez; os.replace deja siempre un archivo completo
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+class AssetManifest:
+    """Índice nombre lógico -> nombre con huella, tipo y copias precomprimidas.
+
+    La huella es un hash del contenido, así que el nombre cambia con cada
+    versión del archivo y el navegador puede guardarlo como inmutable.
+    """
+
+    def __init__(self, sources=None, output_dir=None):
+        self.sources = sources or ASSET_SOURCES
+        self.output_dir = output_dir or Config.ASSETS_DIR
+        self._by_name = {}
+        self._by_filename = {}
+
+    def build(self):
+        """Calcula las huellas y genera las copias comprimidas que falten"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        for name, source in self.sources.items():
+            with open(source, "rb") as f:
+                data = f.read()
+            digest = hashlib.blake2b(data, digest_size=6).hexdigest()
+            stem, extension = os.path.splitext(os.path.basename(source))
+            filename = f"{stem}.{digest}{extension}"
+            entry = {
+                "name": name,
+                "filename": filename,
+                "source": source,
+                "mimetype": mimetypes.guess_type(source)[0] or "application/octet-stream",
+                "digest": digest,
+                "encodings": {},
+            }
+            for encoding in available_encodings():
+                path = os.path.join(self.output_dir, filename + _SUFFIXES[encoding])
+                try:
+                    # El nombre incluye la huella: si existe, corresponde a este contenido
+                    if not os.path.exists(path):
+                        _write_atomic(path, compress(data, encoding, static=True))
+                    entry["encodings"][encoding] = path
+                except OSError as e:
+                    print(f"Error precomprimiendo {name} ({encoding}): {e}")
+            self._by_name[name] = entry
+            self._by_filename[filename] = entry
+        self.prune()
+        return self
+
+    def prune(self):
+        """Borra las copias comprimidas de versiones anteriores; devuelve cuántas borró"""
+        current = {os.path.basename(path) for entry in self._by_name.values()
+                   for path in entry["encodings"].values()}
+        # Solo archivos con el nombre de alguno de los recursos: "<nombre>.<huella><ext>.<br|gz>"
+        patterns = []
+        for source in self.sources.values():
+            stem, extension = os.path.splitext(os.path.basename(source))
+            patterns.append(re.compile(
+                rf"{re.escape(stem)}\.[0-9a-f]{{12}}{re.escape(extension)}\.(?:br|gz)"
+            ))
+        removed = 0
+        for filename in os.listdir(self.output_dir):
+            if filename in current or not any(pattern.fullmatch(filename) for pattern in patterns):
+                continue
+            try:
+                os.remove(os.path.join(self.output_dir, filename))
+                removed += 1
+            except OSError as e:
+                # Otro proceso pudo borrarlo primero
+                if os.path.exists(os.path.join(self.output_dir, filename)):
+                    print(f"Error borrando el recurso anterior {filename}: {e}")
+        return removed
+
+    def entries(self):
+        return list(self._by_name.values())
+
+    def filename(self, name):
+        """Nombre con huella de un recurso"""
+        return self._by_name[name]["filename"]
+
+    def lookup(self, filename):
+        return self._by_filename.get(filename)
+
+
+if __name__ == '__main__':
+    manifest = AssetManifest().build()
+    for entry in manifest.entries():
+        sizes = ", ".join(f"{encoding} {os.path.getsize(path)}"
+                          for encoding, path in entry["encodings"].items())
+        print(f"{entry['name']} -> {entry['filename']} ({os.path.getsize(entry['source'])}; {sizes})")
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_filters(filters):
+    """Convierte los filtros en una tupla ordenada y hashable, ignorando los vacíos"""
+    if not filters:
+        return ()
+    return tuple(sorted((key, str(value)) for key, value in filters.items() if value))
+
+
+class TTLCache:
+    """Cache LRU acotado en entradas, con expiración por entrada y contadores de uso.
+
+    Con max_weight y weigher también se acota por tamaño: weigher(valor)
+    devuelve el peso de cada entrada (p. ej. bytes) y se desalojan las menos
+    usadas hasta que la suma no pase de max_weight.
+    """
+
+    def __init__(self, max_entries=512, default_ttl=900, max_weight=None, weigher=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self._weight = 0
+        # clave -> (valor, expira_en, peso); el orden refleja el uso más reciente al final
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _lookup(self, key):
+        """Busca una entrada vigente (con el lock tomado)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at, weight = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._weight -= weight
+            self._expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def get(self, key):
+        """Devuelve (encontrado, valor)"""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self._hits += 1
+            else:
+                self._misses += 1
+            return found, value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        weight = self.weigher(value) if self.weigher is not None else 0
+        if self.max_weight is not None and weight > self.max_weight:
+            # No cabría ni con la cache vacía; no se desaloja nada por ella
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._weight -= previous[2]
+            self._entries[key] = (value, time.monotonic() + ttl, weight)
+            self._weight += weight
+            while len(self._entries) > self.max_entries or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._weight -= evicted[2]
+                self._evictions += 1
+
+    def get_or_load(self, key, loader, ttl=None, cache_empty=False, cacheable=None):
+        """Devuelve el valor cacheado o lo carga una sola vez aunque lo pidan varios hilos.
+
+        Los resultados vacíos no se guardan por defecto: Database.execute_query
+        devuelve [] cuando falla la consulta y no queremos cachear una caída.
+        cacheable(valor) permite descartar además otros resultados (p. ej. errores).
+        """
+        while True:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    self._hits += 1
+                    return value
+                event = self._loading.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._loading[key] = event
+                    self._misses += 1
+                    break
+            # Otro hilo ya está cargando esta clave; esperar su resultado
+            event.wait()
+
+        try:
+            value = loader()
+            if (value or cache_empty) and (cacheable is None or cacheable(value)):
+                self.set(key, value, ttl)
+            return value
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            event.set()
+
+    def invalidate(self, predicate=None):
+        """Elimina las entradas cuya clave cumple el predicado (todas si no se indica)"""
+        with self._lock:
+            if predicate is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._weight = 0
+                return removed
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._weight -= self._entries.pop(key)[2]
+            return len(keys)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "weight": self._weight,
+                "max_weight": self.max_weight,
+                "default_ttl": self.default_ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
@@ -0,0 +1,125 @@
+import hashlib
+import json
+from decimal import Decimal
+
+import numpy as np
+
+from dashboards.lazy import LazyModule
+
+pd = LazyModule("pandas")
+
+
+def _to_array(values):
+    """Convierte los valores de una columna en un arreglo de NumPy.
+
+    Enteros sin NULL -> int64; números con decimales (float/Decimal, con o sin
+    NULL) -> float64 con NaN en los NULL; cualquier otra cosa (textos, fechas,
+    enteros con NULL) se queda como arreglo de objetos para no alterar valores.
+    """
+    kinds = {type(value) for value in values}
+    if not kinds:
+        return np.array(values, dtype=object)
+    try:
+        if kinds == {int}:
+            return np.array(values, dtype=np.int64)
+        if kinds & {float, Decimal} and kinds <= {int, float, Decimal, type(None)}:
+            return np.array([np.nan if value is None else float(value) for value in values],
+                            dtype=np.float64)
+    except OverflowError:
+        pass
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _python_values(array):
+    """Valores nativos de Python de una columna, con None donde había NaN"""
+    values = array.tolist()
+    if array.dtype.kind == "f":
+        return [None if value != value else value for value in values]
+    return values
+
+
+class ColumnarResult:
+    """Resultado de una consulta guardado por columnas.
+
+    Se arma directamente desde los lotes de tuplas de Database.stream_query,
+    sin crear un dict por fila: un arreglo de NumPy por columna y una sola
+    tupla de nombres compartida. Los gráficos lo leen como DataFrame sin
+    copiar las columnas (to_frame) y la lista de registros que se envía al
+    navegador se genera una sola vez por resultado (records), aunque el
+    resultado se sirva muchas veces desde la cache. Es falso cuando no tiene
+    filas, igual que la lista vacía que devuelve execute_query, para que la
+    cache no lo guarde.
+    """
+
+    __slots__ = ("columns", "arrays", "_length", "_records", "_fingerprint")
+
+    def __init__(self, columns, arrays):
+        self.columns = tuple(columns)
+        self.arrays = [array if isinstance(array, np.ndarray) else _to_array(array)
+                       for array in arrays]
+        self._length = len(self.arrays[0]) if self.arrays else 0
+        self._records = None
+        self._fingerprint = None
+
+    @classmethod
+    def from_stream(cls, stream):
+        """Consume el generador de stream_query: (columnas, lote, lote, ...)"""
+        columns = next(stream, ())
+        values = [[] for _ in columns]
+        for rows in stream:
+            # Transponer el lote: una tupla por columna
+            for column_values, batch_values in zip(values, zip(*rows)):
+                column_values.extend(batch_values)
+        return cls(columns, values)
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __repr__(self):
+        return f"ColumnarResult(columns={self.columns!r}, rows={self._length})"
+
+    def column(self, name):
+        return self.arrays[self.columns.index(name)]
+
+    def to_frame(self):
+        """DataFrame que reutiliza los arreglos de cada columna"""
+        return pd.DataFrame(dict(zip(self.columns, self.arrays)), copy=False)
+
+    def records(self):
+        """Filas como dicts con valores nativos; se calcula una vez y se reutiliza"""
+        if self._records is None:
+            columns = self.columns
+            self._records = [
+                dict(zip(columns, values))
+                for values in zip(*(_python_values(array) for array in self.arrays))
+            ]
+        return self._records
+
+    def to_records(self):
+        return list(self.records())
+
+    def fingerprint(self):
+        """Huella del contenido (columnas, tipos y valores); se calcula una vez"""
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(repr(self.columns).encode("utf-8"), digest_size=16)
+            for array in self.arrays:
+                digest.update(array.dtype.str.encode("ascii"))
+                if array.dtype.kind == "O":
+                    digest.update(repr(array.tolist()).encode("utf-8"))
+                else:
+                    digest.update(np.ascontiguousarray(array).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+
+def data_fingerprint(data):
+    """Huella de un resultado: ColumnarResult o lista de dicts (dashboards fusionados)"""
+    if isinstance(data, ColumnarResult):
+        return data.fingerprint()
+    body = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
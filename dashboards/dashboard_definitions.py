@@ -1,642 +1,469 @@
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import pandas as pd
+import importlib.util
+import multiprocessing
+import os
+import time
+from datetime import datetime, timezone
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError, wait
+)
+
+from config import Config
+from dashboards.cache import TTLCache, normalize_filters
+from dashboards.columnar import ColumnarResult, data_fingerprint
+from dashboards.fused import fan_out_estudiantes
+from dashboards.lazy import LazyModule, preload_heavy_modules
+from dashboards.metrics import DashboardMetrics
+from dashboards.registry import (
+    DASHBOARDS, DATA_TTLS, FUSED_ESTUDIANTES_KEYS, SUMMARY_QUERIES, build_query,
+    get_category_dashboards, get_dashboard, get_dashboard_info, supported_filters
+)
+
+
+# plotly y pandas se importan en el primer gráfico o DataFrame (ver dashboards/lazy.py)
+px = LazyModule("plotly.express")
+go = LazyModule("plotly.graph_objects")
+pd = LazyModule("pandas")
+_subplots = LazyModule("plotly.subplots")
+
+
+def make_subplots(*args, **kwargs):
+    return _subplots.make_subplots(*args, **kwargs)
+
+
+# Bundle de plotly.js incluido en el paquete de Python; se sirve una sola vez como estático.
+# Se ubica sin importar plotly para no cargarlo al arrancar
+PLOTLY_JS_PATH = os.path.join(os.path.dirname(importlib.util.find_spec("plotly").origin),
+                              "package_data", "plotly.min.js")
+
+
+def render_figure(fig, dashboard_id):
+    """Serializa una figura una sola vez y devuelve {"chart": html, "figure": json}.
+    
+    "chart" es el HTML que se incrusta en la tarjeta del dashboard. En modo
+    "static" solo lleva el JSON de la figura y la llamada a Plotly.newPlot; la
+    librería la carga la plantilla desde /assets/plotly.min.<huella>.js. En
+    modo "inline" se conserva el comportamiento anterior (plotly.js en cada
+    gráfico). "figure" es el JSON
+    que /api/dashboard/<id>/data?figura=1 entrega a la carga diferida.
+    """
+    div_id = f"chart-{dashboard_id}"
+    # "</" cerraría el <script> si aparece dentro de algún texto de la figura
+    fig_json = fig.to_json().replace("</", "<\\/")
+    if Config.PLOTLY_JS_MODE == "inline":
+        return {"chart": fig.to_html(div_id=div_id), "figure": fig_json}
+    
+    html = (
+        f'<div id="{div_id}" class="plotly-graph-div" style="width:100%;"></div>'
+        f'<script type="text/javascript">(function(f){{'
+        f'Plotly.newPlot("{div_id}", f.data, f.layout, {{"responsive": true}});'
+        f'}})({fig_json});</script>'
+    )
+    return {"chart": html, "figure": fig_json}
+
+
+# Instancia sin base de datos usada por los procesos de renderizado
+_renderer = None
+
+
+def render_chart(data, chart_type, title, dashboard_id):
+    """Renderiza un gráfico dentro de un proceso del pool de renderizado"""
+    global _renderer
+    if _renderer is None:
+        _renderer = DashboardManager(None, concurrent=False)
+    return _renderer.create_chart(data, chart_type, title, dashboard_id)
+
+
+def _rendered_size(result):
+    """Peso de un gráfico en la cache de renderizado: bytes aproximados de HTML + figura"""
+    return len(result.get("chart") or "") + len(result.get("figure") or "")
+
+
+def _warm_render_worker(_):
+    return multiprocessing.current_process().pid
 
 
 class DashboardManager:
-    def __init__(self, db):
+    def __init__(self, db, concurrent=True):
         self.db = db
         self.dashboards = self.get_dashboard_list()
-        # Cache para datos que se usan en múltiples dashboards
-        self._cache = {}
+        # Leer de las tablas resumen en lugar de las uniones completas (ver dashboards/summaries.py)
+        self.use_summaries = Config.USE_SUMMARY_TABLES
+        # Cache de resultados por (data_key, filtros normalizados)
+        self.cache = None
+        if Config.CACHE_ENABLED:
+            self.cache = TTLCache(
+                max_entries=Config.CACHE_MAX_ENTRIES,
+                default_ttl=Config.CACHE_DEFAULT_TTL
+            )
+        # Gráficos ya renderizados; la clave incluye la huella de los datos, así que no caducan por cambios
+        self.render_cache = None
+        if Config.RENDER_CACHE_ENABLED:
+            self.render_cache = TTLCache(
+                max_entries=Config.RENDER_CACHE_MAX_ENTRIES,
+                default_ttl=Config.RENDER_CACHE_TTL,
+                max_weight=Config.RENDER_CACHE_MAX_BYTES,
+                weigher=_rendered_size
+            )
+        # Latencias, filas, aciertos de cache y errores por dashboard (/metrics, /api/stats/perf)
+        self.metrics = DashboardMetrics()
+        # Versión de los datos: cuándo se cargaron o invalidaron por última vez (Last-Modified)
+        self.data_changed_at = datetime.now(timezone.utc).replace(microsecond=0)
+        
+        # Hilos para la fase de consultas (I/O) y procesos opcionales para el renderizado (CPU)
+        self._query_executor = None
+        self._render_executor = None
+        if concurrent and Config.DASHBOARD_PARALLEL:
+            self._query_executor = ThreadPoolExecutor(
+                max_workers=Config.DASHBOARD_WORKERS,
+                thread_name_prefix="dashboard"
+            )
+            if Config.DASHBOARD_RENDER_PROCESSES > 0:
+                # Los procesos heredan plotly y pandas ya cargados en lugar de importarlos cada uno
+                preload_heavy_modules()
+                self._render_executor = ProcessPoolExecutor(
+                    max_workers=Config.DASHBOARD_RENDER_PROCESSES,
+                    mp_context=multiprocessing.get_context("fork")
+                )
+                # Forzar el fork ahora, antes de que existan hilos de consultas activos
+                list(self._render_executor.map(_warm_render_worker,
+                                               range(Config.DASHBOARD_RENDER_PROCESSES)))
+    
+    def shutdown(self):
+        """Cierra los hilos y procesos de generación (al terminar un worker)"""
+        for executor in (self._query_executor, self._render_executor):
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        self._query_executor = None
+        self._render_executor = None
     
     def get_dashboard_list(self):
-        categories = {
-            "Estudiantes": [
-                ("Total de Estudiantes", "Resumen general de estudiantes"),
-                ("Estudiantes por Carrera", "Distribución de estudiantes por carrera"),
-                ("Estudiantes por Género", "Distribución por género"),
-                ("Estudiantes por Edad", "Distribución por grupos de edad"),
-                ("Estudiantes por Estado", "Origen geográfico de estudiantes"),
-                ("Estudiantes Activos vs Inactivos", "Estado de actividad"),
-                ("Estudiantes con Beca", "Análisis de becarios"),
-                ("Tipos de Escuela de Origen", "Pública vs Privada"),
-                ("Evolución de Inscripciones", "Tendencia temporal"),
-                ("Estudiantes por Período", "Distribución por período")
-            ],
-            "Académico": [
-                ("Promedios por Carrera", "Rendimiento académico por carrera"),
-                ("Materias más Reprobadas", "Análisis de reprobación"),
-                ("Calificaciones por Cuatrimestre", "Evolución de calificaciones"),
-                ("Rendimiento por Modalidad", "Presencial vs En línea"),
-                ("Correlación Asistencia-Calificación", "Relación asistencia y notas"),
-                ("Distribución de Profesores", "Plantilla docente por área"),
-                ("Capacidad de Grupos", "Ocupación vs capacidad máxima"),
-                ("Ocupación de Aulas por Turno", "Uso de instalaciones"),
-                ("Preferencias de Horarios", "Horarios más solicitados"),
-                ("Distribución de Créditos", "Carga académica estudiantes")
-            ],
-            "Riesgo": [
-                ("Estudiantes en Riesgo", "Análisis de riesgo académico"),
-                ("Factores de Riesgo por Carrera", "Indicadores específicos por programa"),
-                ("Abandono Escolar", "Tipos y causas de abandono"),
-                ("Indicadores de Alerta", "Métricas tempranas de riesgo"),
-                ("Efectividad de Intervenciones", "Resultados de acciones correctivas")
-            ],
-            "Financiero": [
-                ("Pagos por Período", "Ingresos por colegiaturas"),
-                ("Análisis de Morosidad", "Pagos pendientes por carrera"),
-                ("Inversión en Becas", "Distribución de apoyos económicos"),
-                ("Diversificación de Ingresos", "Fuentes de financiamiento"),
-                ("Becas por Rendimiento", "Criterios y beneficiarios")
-            ],
-            "Egresados": [
-                ("Egresados por Año", "Graduados por período"),
-                ("Inserción Laboral", "Empleabilidad por carrera"),
-                ("Análisis Salarial", "Ingresos por área profesional"),
-                ("Evaluación Institucional", "Satisfacción de egresados"),
-                ("Eficiencia Terminal", "Tiempo real de graduación")
-            ],
-            "Recursos": [
-                ("Uso de Biblioteca", "Utilización de recursos bibliográficos"),
-                ("Ocupación de Laboratorios", "Uso por área de conocimiento"),
-                ("Recursos Tecnológicos", "Distribución de equipamiento"),
-                ("Patrones de Uso Semanal", "Ocupación por días"),
-                ("Dashboard Integral", "Vista general de todos los indicadores")
-            ]
-        }
-        
-        dashboards = []
-        dashboard_id = 1
-        for category, items in categories.items():
-            for name, description in items:
-                dashboards.append({
-                    "id": dashboard_id,
-                    "name": name,
-                    "category": category,
-                    "description": description
-                })
-                dashboard_id += 1
+        return DASHBOARDS
+    
+    def get_dashboard_info(self, dashboard_id):
+        return get_dashboard_info(dashboard_id)
+    
+    def get_category_dashboards(self, category):
+        return get_category_dashboards(category)
+    
+    def mark_data_changed(self):
+        """Nueva versión de los datos (Last-Modified): solo ante cambios reales.
         
-        return dashboards
+        Se llama al invalidar la cache, al refrescar las tablas resumen y al
+        recibir cambios de contadores; no en cada consulta, porque un TTL
+        vencido o una combinación nueva de filtros no cambian los datos.
+        """
+        self.data_changed_at = datetime.now(timezone.utc).replace(microsecond=0)
     
-    def get_cached_data(self, key, query_func):
+    def get_cached_data(self, key, query_func, ttl=None):
         """Cache para evitar consultas repetitivas"""
-        if key not in self._cache:
-            self._cache[key] = query_func()
-        return self._cache[key]
+        if self.cache is None:
+            return query_func()
+        
+        loaded = []
+        
+        def load():
+            loaded.append(True)
+            return query_func()
+        
+        value = self.cache.get_or_load(key, load, ttl=ttl)
+        self.metrics.record_cache(key[0], hit=not loaded)
+        return value
+    
+    def invalidate_cache(self, data_key=None):
+        """Invalida los datos cacheados de un data_key (o todos); devuelve cuántas entradas se eliminaron"""
+        self.mark_data_changed()
+        if self.cache is None:
+            return 0
+        if data_key is None:
+            return self.cache.invalidate()
+        # Los dashboards fusionados viven dentro de la entrada del cubo de estudiantes
+        keys = {data_key, "estudiantes_cubo"} if data_key in FUSED_ESTUDIANTES_KEYS else {data_key}
+        return self.cache.invalidate(lambda key: key[0] in keys)
+    
+    def invalidate_summary_data(self):
+        """Invalida los datos que salen de las tablas resumen tras un refresco"""
+        if not self.use_summaries:
+            return 0
+        self.mark_data_changed()
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate(lambda key: key[0] in SUMMARY_QUERIES)
+    
+    def get_cache_stats(self):
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
+    
+    def get_render_cache_stats(self):
+        if self.render_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.render_cache.stats()}
+    
+    def get_perf_stats(self):
+        """Resumen de latencias por dashboard, del que más tiempo consume al que menos"""
+        dashboards = [get_dashboard(info["id"]) for info in self.dashboards]
+        return self.metrics.summary(
+            dashboards,
+            query_key=lambda data_key: "estudiantes_cubo" if self._use_fused(data_key) else data_key
+        )
     
     def generate_dashboard(self, dashboard_id, filters=None):
-        dashboard_info = next((d for d in self.dashboards if d["id"] == dashboard_id), None)
-        if not dashboard_info:
+        dashboard = get_dashboard(dashboard_id)
+        if not dashboard:
             return None
         
-        # Configuración de dashboards con queries optimizadas
-        dashboard_configs = {
-            # Estudiantes (1-10)
-            1: ("estudiantes_stats", "indicators", "Resumen General de Estudiantes"),
-            2: ("carreras_stats", "bar", "Estudiantes por Carrera"),
-            3: ("genero_stats", "pie", "Distribución por Género"),
-            4: ("edad_stats", "bar", "Distribución por Edad"),
-            5: ("estado_stats", "bar_h", "Estudiantes por Estado"),
-            6: ("activos_stats", "pie", "Activos vs Inactivos"),
-            7: ("becas_stats", "pie", "Estudiantes con Beca"),
-            8: ("escuela_stats", "bar", "Tipo de Escuela"),
-            9: ("inscripciones_stats", "line", "Evolución de Inscripciones"),
-            10: ("periodo_stats", "bar", "Estudiantes por Período"),
-            
-            # Académico (11-20) - ACTUALIZADOS
-            11: ("promedios_carrera", "bar_h", "Promedios por Carrera"),
-            12: ("materias_reprobadas", "bar_h", "Materias más Reprobadas"),
-            13: ("calificaciones_cuatrimestre", "line", "Calificaciones por Cuatrimestre"),
-            14: ("modalidad_rendimiento", "bar_grouped", "Rendimiento por Modalidad"),
-            15: ("asistencia_calificaciones", "scatter", "Correlación Asistencia-Calificación"),
-            16: ("profesores_area", "pie", "Distribución de Profesores por Área"),
-            17: ("capacidad_grupos", "capacity", "Capacidad vs Ocupación de Grupos"),
-
-
-            18: ("aulas_turno", "bar_grouped", "Ocupación de Aulas por Turno"),
-            19: ("horarios_preferencias", "bar", "Preferencias de Horarios"),
-            20: ("rendimiento_cuatrimestre", "bar_grouped", "Rendimiento Académico por Cuatrimestre"),
-            
-            # Riesgo (21-25) - ACTUALIZADOS
-            21: ("riesgo_stats", "bar", "Estudiantes en Riesgo"),
-            22: ("factores_riesgo_carrera", "bar_h", "Factores de Riesgo por Carrera"),
-            23: ("abandono_stats", "pie", "Abandono Escolar"),
-            24: ("indicadores_alerta", "bar", "Indicadores de Alerta Temprana"),
-            25: ("efectividad_intervenciones", "bar_grouped", "Efectividad de Intervenciones"),
-            
-            # Financiero (26-30) - ACTUALIZADOS
-            26: ("pagos_stats", "bar_grouped", "Pagos por Período"),
-            27: ("morosidad_carrera", "morosity", "Morosidad por Carrera"),
-
-            28: ("inversion_becas", "pie", "Inversión en Becas por Tipo"),
-            29: ("diversificacion_ingresos", "pie", "Diversificación de Ingresos"),
-            30: ("becas_rendimiento", "scatter", "Becas por Rendimiento Académico"),
-            
-            # Egresados (31-35) - ACTUALIZADOS
-            31: ("egresados_stats", "bar_line", "Egresados por Año"),
-            32: ("insercion_laboral", "employment", "Inserción Laboral por Carrera"),
-            33: ("analisis_salarial", "salary_analysis", "Análisis Salarial por Área"),
-
-
-            34: ("evaluacion_institucional", "bar", "Evaluación Institucional"),
-            35: ("eficiencia_terminal", "terminal_efficiency", "Eficiencia Terminal por Carrera"),
-            
-            # Recursos (36-40) - ACTUALIZADOS
-            36: ("recursos_stats", "bar_h", "Uso de Recursos"),
-            37: ("laboratorios_area", "bar", "Ocupación de Laboratorios por Área"),
-            38: ("recursos_tecnologicos", "pie", "Distribución de Recursos Tecnológicos"),
-            39: ("patrones_uso_semanal", "line", "Patrones de Uso Semanal"),
-            40: ("dashboard_integral", "subplots", "Dashboard Integral")
-        }
+        start = time.perf_counter()
+        try:
+            if not dashboard["data_key"]:
+                return self.create_placeholder(dashboard["info"], dashboard_id)
+            
+            data = self.get_dashboard_data(dashboard["data_key"], filters)
+            result = self.render_dashboard(data, dashboard["chart_type"], dashboard["title"], dashboard_id)
+            
+            if result.get("error"):
+                self.metrics.record_error(dashboard_id, "render" if data else "no_data")
+            return result
+        except Exception:
+            self.metrics.record_error(dashboard_id, "exception")
+            raise
+        finally:
+            self.metrics.observe_generate(dashboard_id, time.perf_counter() - start)
+    
+    def render_dashboard(self, data, chart_type, title, dashboard_id):
+        """Gráfico de un dashboard; se reutiliza mientras sus datos no cambien"""
+        if self.render_cache is None or not data:
+            return self._render(data, chart_type, title, dashboard_id)
+        
+        loaded = []
         
-        if dashboard_id in dashboard_configs:
-            data_key, chart_type, title = dashboard_configs[dashboard_id]
-            data = self.get_dashboard_data(data_key, filters)
-            return self.create_chart(data, chart_type, title, dashboard_id)
+        def load():
+            loaded.append(True)
+            return self._render(data, chart_type, title, dashboard_id)
         
-        return self.create_placeholder(dashboard_info, dashboard_id)
+        key = (dashboard_id, chart_type, data_fingerprint(data))
+        # Los errores no se guardan: pueden deberse a algo pasajero
+        result = self.render_cache.get_or_load(key, load, cacheable=lambda value: "error" not in value)
+        self.metrics.record_render_cache(dashboard_id, hit=not loaded)
+        return result
     
-    def get_dashboard_data(self, data_key, filters=None):
-        """Obtiene datos usando queries unificadas - ACTUALIZADAS"""
-        queries = {
-            # Estudiantes (mantener originales)
-            "estudiantes_stats": """
-                SELECT COUNT(*) as total, 
-                       COUNT(CASE WHEN activo = 1 THEN 1 END) as activos,
-                       COUNT(CASE WHEN beca = 1 THEN 1 END) as con_beca,
-                       AVG(edad) as edad_promedio
-                FROM estudiantes
-            """,
-            
-            "carreras_stats": """
-                SELECT c.nombre as carrera, c.nivel, COUNT(e.id) as total
-                FROM carreras c LEFT JOIN estudiantes e ON c.codigo = e.carrera_codigo
-                WHERE c.activa = 1 GROUP BY c.id ORDER BY total DESC
-            """,
-            
-            "genero_stats": """
-                SELECT CASE WHEN genero = 'M' THEN 'Masculino' 
-                           WHEN genero = 'F' THEN 'Femenino' ELSE 'Otro' END as genero,
-                       COUNT(*) as cantidad
-                FROM estudiantes WHERE activo = 1 GROUP BY genero
-            """,
-            
-            "edad_stats": """
-                SELECT CASE WHEN edad BETWEEN 17 AND 20 THEN '17-20 años'
-                           WHEN edad BETWEEN 21 AND 25 THEN '21-25 años'
-                           WHEN edad BETWEEN 26 AND 30 THEN '26-30 años'
-                           ELSE 'Más de 30 años' END as rango_edad,
-                       COUNT(*) as cantidad
-                FROM estudiantes WHERE activo = 1 GROUP BY rango_edad
-            """,
-            
-            "estado_stats": """
-                SELECT estado, COUNT(*) as cantidad
-                FROM estudiantes WHERE activo = 1 AND estado IS NOT NULL
-                GROUP BY estado ORDER BY cantidad DESC LIMIT 10
-            """,
-            
-            "activos_stats": """
-                SELECT CASE WHEN activo = 1 THEN 'Activos' ELSE 'Inactivos' END as estado,
-                       COUNT(*) as cantidad
-                FROM estudiantes GROUP BY activo
-            """,
-            
-            "becas_stats": """
-                SELECT CASE WHEN beca = 1 THEN 'Con Beca' ELSE 'Sin Beca' END as estado,
-                       COUNT(*) as cantidad
-                FROM estudiantes GROUP BY beca
-            """,
-            
-            "escuela_stats": """
-                SELECT tipo_escuela, COUNT(*) as cantidad
-                FROM estudiantes WHERE activo = 1 GROUP BY tipo_escuela
-            """,
-            
-            "inscripciones_stats": """
-                SELECT periodo_ingreso as periodo, COUNT(*) as cantidad
-                FROM estudiantes GROUP BY periodo_ingreso ORDER BY periodo DESC LIMIT 10
-            """,
-            
-            "periodo_stats": """
-                SELECT periodo_ingreso as periodo, COUNT(*) as cantidad
-                FROM estudiantes GROUP BY periodo_ingreso ORDER BY cantidad DESC
-            """,
-            
-            # Académico ACTUALIZADAS
-            "promedios_carrera": """
-                SELECT c.nombre as carrera, AVG(CAST(cal.calificacion_final AS DECIMAL(4,2))) as promedio
-                FROM carreras c JOIN estudiantes e ON c.codigo = e.carrera_codigo
-                JOIN calificaciones cal ON e.id = cal.id_estudiante
-                WHERE c.activa = 1 GROUP BY c.id ORDER BY promedio DESC
-            """,
-            
-            "materias_reprobadas": """
-                SELECT m.nombre as materia, COUNT(*) as reprobados
-                FROM calificaciones cal JOIN materias m ON cal.materia_id = m.id
-                WHERE cal.aprobada = 0 GROUP BY m.id ORDER BY reprobados DESC LIMIT 10
-            """,
-            
-            "calificaciones_cuatrimestre": """
-                SELECT cuatrimestre, AVG(CAST(calificacion_final AS DECIMAL(4,2))) as promedio
-                FROM calificaciones GROUP BY cuatrimestre ORDER BY cuatrimestre
-            """,
-            
-            # NUEVAS QUERIES ACTUALIZADAS
-            "modalidad_rendimiento": """
-                SELECT 
-                    'Presencial' as modalidad, 85.5 as promedio, 320 as estudiantes
-                UNION ALL
-                SELECT 'En Línea' as modalidad, 82.3 as promedio, 180 as estudiantes
-                UNION ALL
-                SELECT 'Mixta' as modalidad, 83.8 as promedio, 95 as estudiantes
-                UNION ALL
-                SELECT 'Sabatina' as modalidad, 81.2 as promedio, 65 as estudiantes
-            """,
-            
-            "asistencia_calificaciones": """
-                SELECT 
-                    ROUND(RAND() * 40 + 60, 1) as asistencia_porcentaje,
-                    ROUND(RAND() * 30 + 70, 1) as calificacion_promedio,
-                    CONCAT('Estudiante ', ROW_NUMBER() OVER()) as estudiante
-                FROM (
-                    SELECT 1 UNION SELECT 2 UNION SELECT 3 UNION SELECT 4 UNION SELECT 5
-                    UNION SELECT 6 UNION SELECT 7 UNION SELECT 8 UNION SELECT 9 UNION SELECT 10
-                    UNION SELECT 11 UNION SELECT 12 UNION SELECT 13 UNION SELECT 14 UNION SELECT 15
-                    UNION SELECT 16 UNION SELECT 17 UNION SELECT 18 UNION SELECT 19 UNION SELECT 20
-                ) as nums
-            """,
-            
-            "profesores_area": """
-                SELECT 
-                    'Ingeniería' as area, 28 as cantidad
-                UNION ALL
-                SELECT 'Administración' as area, 15 as cantidad
-                UNION ALL
-                SELECT 'Ciencias Básicas' as area, 12 as cantidad
-                UNION ALL
-                SELECT 'Humanidades' as area, 8 as cantidad
-                UNION ALL
-                SELECT 'Idiomas' as area, 6 as cantidad
-                UNION ALL
-                SELECT 'Deportes' as area, 4 as cantidad
-            """,
-            
-            "capacidad_grupos": """
-    SELECT 
-        'Matemáticas I - Grupo A' as grupo, 28 as ocupacion, 35 as capacidad_maxima, 80.0 as porcentaje_ocupacion
-    UNION ALL
-    SELECT 'Programación - Grupo B' as grupo, 32 as ocupacion, 35 as capacidad_maxima, 91.4 as porcentaje_ocupacion
-    UNION ALL
-    SELECT 'Física I - Grupo A' as grupo, 25 as ocupacion, 30 as capacidad_maxima, 83.3 as porcentaje_ocupacion
-    UNION ALL
-    SELECT 'Química - Grupo C' as grupo, 22 as ocupacion, 25 as capacidad_maxima, 88.0 as porcentaje_ocupacion
-    UNION ALL
-    SELECT 'Inglés I - Grupo D' as grupo, 18 as ocupacion, 20 as capacidad_maxima, 90.0 as porcentaje_ocupacion
-    UNION ALL
-    SELECT 'Base de Datos - Grupo A' as grupo, 30 as ocupacion, 35 as capacidad_maxima, 85.7 as porcentaje_ocupacion
-    UNION ALL
-    SELECT 'Redes - Grupo B' as grupo, 15 as ocupacion, 20 as capacidad_maxima, 75.0 as porcentaje_ocupacion
-""",
-            
-            "aulas_turno": """
-                SELECT 
-                    'Matutino' as turno, 18 as ocupadas, 25 as disponibles
-                UNION ALL
-                SELECT 'Vespertino' as turno, 22 as ocupadas, 25 as disponibles
-                UNION ALL
-                SELECT 'Nocturno' as turno, 12 as ocupadas, 25 as disponibles
-                UNION ALL
-                SELECT 'Sabatino' as turno, 8 as ocupadas, 15 as disponibles
-            """,
-            
-            "horarios_preferencias": """
-                SELECT 
-                    '07:00-09:00' as horario, 45 as solicitudes
-                UNION ALL
-                SELECT '09:00-11:00' as horario, 78 as solicitudes
-                UNION ALL
-                SELECT '11:00-13:00' as horario, 92 as solicitudes
-                UNION ALL
-                SELECT '13:00-15:00' as horario, 65 as solicitudes
-                UNION ALL
-                SELECT '15:00-17:00' as horario, 58 as solicitudes
-                UNION ALL
-                SELECT '17:00-19:00' as horario, 73 as solicitudes
-                UNION ALL
-                SELECT '19:00-21:00' as horario, 41 as solicitudes
-            """,
-            
-            "rendimiento_cuatrimestre": """
-    SELECT 
-        CONCAT('Cuatrimestre ', c.cuatrimestre) as periodo,
-        AVG(CAST(c.calificacion_final AS DECIMAL(4,2))) as promedio,
-        COUNT(*) as total_calificaciones,
-        COUNT(CASE WHEN c.aprobada = 1 THEN 1 END) as aprobadas,
-        ROUND((COUNT(CASE WHEN c.aprobada = 1 THEN 1 END) * 100.0 / COUNT(*)), 1) as porcentaje_aprobacion
-    FROM calificaciones c
-    WHERE c.calificacion_final IS NOT NULL
-    GROUP BY c.cuatrimestre
-    ORDER BY c.cuatrimestre
-""",
-            
-            # Riesgo ACTUALIZADAS
-            "riesgo_stats": """
-                SELECT nivel_riesgo, COUNT(*) as cantidad
-                FROM riesgo_academico WHERE activo = 1
-                GROUP BY nivel_riesgo ORDER BY FIELD(nivel_riesgo, 'Bajo', 'Medio', 'Alto', 'Critico')
-            """,
-            
-            "factores_riesgo_carrera": """
-                SELECT 
-                    c.nombre as carrera,
-                    COUNT(CASE WHEN r.nivel_riesgo IN ('Alto', 'Critico') THEN 1 END) as alto_riesgo,
-                    COUNT(*) as total_estudiantes
-                FROM carreras c 
-                JOIN estudiantes e ON c.codigo = e.carrera_codigo
-                LEFT JOIN riesgo_academico r ON e.id = r.id_estudiante
-                WHERE c.activa = 1
-                GROUP BY c.id
-                ORDER BY alto_riesgo DESC
-            """,
-            
-            "abandono_stats": """
-                SELECT tipo, COUNT(*) as cantidad
-                FROM abandonos GROUP BY tipo ORDER BY cantidad DESC
-            """,
-            
-            "indicadores_alerta": """
-                SELECT 
-                    'Inasistencias >30%' as indicador, 23 as casos
-                UNION ALL
-                SELECT 'Reprobación 2+ materias' as indicador, 18 as casos
-                UNION ALL
-                SELECT 'Promedio <70' as indicador, 15 as casos
-                UNION ALL
-                SELECT 'Sin pago 2+ meses' as indicador, 12 as casos
-                UNION ALL
-                SELECT 'Sin actividad plataforma' as indicador, 8 as casos
-            """,
-            
-            "efectividad_intervenciones": """
-                SELECT 
-                    'Tutoría Académica' as intervencion, 
-                    28 as casos_exitosos, 35 as casos_totales
-                UNION ALL
-                SELECT 'Apoyo Psicológico' as intervencion,
-                    15 as casos_exitosos, 22 as casos_totales
-                UNION ALL
-                SELECT 'Beca de Apoyo' as intervencion,
-                    18 as casos_exitosos, 20 as casos_totales
-                UNION ALL
-                SELECT 'Flexibilidad Horaria' as intervencion,
-                    12 as casos_exitosos, 18 as casos_totales
-            """,
-            
-            # Financiero ACTUALIZADAS
-            "pagos_stats": """
-                SELECT periodo, 
-                       SUM(CASE WHEN pagado = 1 THEN 1 ELSE 0 END) as realizados,
-                       SUM(CASE WHEN pagado = 0 THEN 1 ELSE 0 END) as pendientes,
-                       SUM(monto) as total
-                FROM pagos GROUP BY periodo ORDER BY periodo DESC LIMIT 10
-            """,
-            
-           "morosidad_carrera": """
-    SELECT 
-        'Ingeniería en Sistemas' as carrera, 12 as estudiantes_morosos, 85 as total_estudiantes, 14.1 as porcentaje_morosidad, 45000 as monto_moroso
-    UNION ALL
-    SELECT 'Ingeniería Industrial' as carrera, 8 as estudiantes_morosos, 72 as total_estudiantes, 11.1 as porcentaje_morosidad, 32000 as monto_moroso
-    UNION ALL
-    SELECT 'Ingeniería Mecánica' as carrera, 15 as estudiantes_morosos, 68 as total_estudiantes, 22.1 as porcentaje_morosidad, 58000 as monto_moroso
-    UNION ALL
-    SELECT 'Ingeniería Civil' as carrera, 6 as estudiantes_morosos, 55 as total_estudiantes, 10.9 as porcentaje_morosidad, 24000 as monto_moroso
-    UNION ALL
-    SELECT 'Administración' as carrera, 18 as estudiantes_morosos, 95 as total_estudiantes, 18.9 as porcentaje_morosidad, 67000 as monto_moroso
-""",
-            
-            "inversion_becas": """
-                SELECT 
-                    'Excelencia Académica' as tipo_beca, 450000 as monto
-                UNION ALL
-                SELECT 'Situación Económica' as tipo_beca, 680000 as monto
-                UNION ALL
-                SELECT 'Deportiva' as tipo_beca, 180000 as monto
-                UNION ALL
-                SELECT 'Cultural' as tipo_beca, 95000 as monto
-                UNION ALL
-                SELECT 'Convenio Empresarial' as tipo_beca, 320000 as monto
-            """,
-            
-            "diversificacion_ingresos": """
-                SELECT 
-                    'Colegiaturas' as fuente, 78.5 as porcentaje
-                UNION ALL
-                SELECT 'Cursos de Educación Continua' as fuente, 12.3 as porcentaje
-                UNION ALL
-                SELECT 'Servicios Tecnológicos' as fuente, 5.8 as porcentaje
-                UNION ALL
-                SELECT 'Consultoría' as fuente, 2.1 as porcentaje
-                UNION ALL
-                SELECT 'Otros' as fuente, 1.3 as porcentaje
-            """,
-            
-            "becas_rendimiento": """
-                SELECT 
-                    ROUND(RAND() * 20 + 80, 1) as promedio_academico,
-                    ROUND(RAND() * 8000 + 2000, 0) as monto_beca,
-                    CONCAT('Estudiante ', ROW_NUMBER() OVER()) as estudiante
-                FROM (
-                    SELECT 1 UNION SELECT 2 UNION SELECT 3 UNION SELECT 4 UNION SELECT 5
-                    UNION SELECT 6 UNION SELECT 7 UNION SELECT 8 UNION SELECT 9 UNION SELECT 10
-                    UNION SELECT 11 UNION SELECT 12 UNION SELECT 13 UNION SELECT 14 UNION SELECT 15
-                ) as nums
-            """,
-            
-            # Egresados ACTUALIZADAS
-            "egresados_stats": """
-                SELECT YEAR(fecha_egreso) as año, COUNT(*) as cantidad,
-                       AVG(promedio_general) as promedio
-                FROM egresados GROUP BY YEAR(fecha_egreso) ORDER BY año DESC
-            """,
-            
-            "insercion_laboral": """
-    SELECT 
-        'Ingeniería en Sistemas' as carrera, 45 as total_egresados, 42 as empleados, 3 as desempleados, 28500 as salario_promedio, 93.3 as porcentaje_empleabilidad
-    UNION ALL
-    SELECT 'Ingeniería Industrial' as carrera, 38 as total_egresados, 35 as empleados, 3 as desempleados, 26800 as salario_promedio, 92.1 as porcentaje_empleabilidad
-    UNION ALL
-    SELECT 'Ingeniería Mecánica' as carrera, 32 as total_egresados, 28 as empleados, 4 as desempleados, 25200 as salario_promedio, 87.5 as porcentaje_empleabilidad
-    UNION ALL
-    SELECT 'Ingeniería Civil' as carrera, 28 as total_egresados, 24 as empleados, 4 as desempleados, 24500 as salario_promedio, 85.7 as porcentaje_empleabilidad
-    UNION ALL
-    SELECT 'Administración' as carrera, 52 as total_egresados, 43 as empleados, 9 as desempleados, 18200 as salario_promedio, 82.7 as porcentaje_empleabilidad
-""",
-
-            
-            "analisis_salarial": """
-    SELECT 
-        'Ingeniería' as area, 'Ingeniería en Sistemas' as carrera, 32000 as salario, 'Alto (25K-35K)' as rango_salarial, 18 as tiempo_empleado_meses, 4.2 as satisfaccion_laboral
-    UNION ALL
-    SELECT 'Ingeniería' as area, 'Ingeniería Industrial' as carrera, 28000 as salario, 'Alto (25K-35K)' as rango_salarial, 22 as tiempo_empleado_meses, 4.0 as satisfaccion_laboral
-    UNION ALL
-    SELECT 'Ingeniería' as area, 'Ingeniería Mecánica' as carrera, 26500 as salario, 'Alto (25K-35K)' as rango_salarial, 15 as tiempo_empleado_meses, 3.8 as satisfaccion_laboral
-    UNION ALL
-    SELECT 'Ingeniería' as area, 'Ingeniería Civil' as carrera, 25000 as salario, 'Medio (15K-25K)' as rango_salarial, 20 as tiempo_empleado_meses, 3.9 as satisfaccion_laboral
-    UNION ALL
-    SELECT 'Administración' as area, 'Licenciatura en Administración' as carrera, 18000 as salario, 'Medio (15K-25K)' as rango_salarial, 12 as tiempo_empleado_meses, 3.5 as satisfaccion_laboral
-    UNION ALL
-    SELECT 'Ingeniería' as area, 'Ingeniería en Sistemas' as carrera, 35000 as salario, 'Alto (25K-35K)' as rango_salarial, 36 as tiempo_empleado_meses, 4.5 as satisfaccion_laboral
-    UNION ALL
-    SELECT 'Ingeniería' as area, 'Ingeniería Industrial' as carrera, 22000 as salario, 'Medio (15K-25K)' as rango_salarial, 8 as tiempo_empleado_meses, 3.7 as satisfaccion_laboral
-    UNION ALL
-    SELECT 'Administración' as area, 'Licenciatura en Administración' as carrera, 16500 as salario, 'Medio (15K-25K)' as rango_salarial, 14 as tiempo_empleado_meses, 3.3 as satisfaccion_laboral
-    UNION ALL
-    SELECT 'Ingeniería' as area, 'Ingeniería Mecánica' as carrera, 29000 as salario, 'Alto (25K-35K)' as rango_salarial, 28 as tiempo_empleado_meses, 4.1 as satisfaccion_laboral
-    UNION ALL
-    SELECT 'Administración' as area, 'Licenciatura en Administración' as carrera, 24000 as salario, 'Medio (15K-25K)' as rango_salarial, 30 as tiempo_empleado_meses, 4.0 as satisfaccion_laboral
-""",
-            "evaluacion_institucional": """
-                SELECT 
-                    'Calidad Educativa' as aspecto, 4.2 as calificacion
-                UNION ALL
-                SELECT 'Instalaciones' as aspecto, 3.8 as calificacion
-                UNION ALL
-                SELECT 'Profesores' as aspecto, 4.5 as calificacion
-                UNION ALL
-                SELECT 'Servicios Estudiantiles' as aspecto, 3.9 as calificacion
-                UNION ALL
-                SELECT 'Empleabilidad' as aspecto, 4.1 as calificacion
-                UNION ALL
-                SELECT 'Recomendaría la Institución' as aspecto, 4.3 as calificacion
-            """,
-            
-           "eficiencia_terminal": """
-    SELECT 
-        'Ingeniería en Sistemas' as carrera, 36 as duracion_meses_teorica, 45 as total_egresados, 32 as egresados_tiempo_regular, 42.5 as promedio_meses_reales, 71.1 as eficiencia_porcentaje
-    UNION ALL
-    SELECT 'Ingeniería Industrial' as carrera, 36 as duracion_meses_teorica, 38 as total_egresados, 28 as egresados_tiempo_regular, 40.2 as promedio_meses_reales, 73.7 as eficiencia_porcentaje
-    UNION ALL
-    SELECT 'Ingeniería Mecánica' as carrera, 36 as duracion_meses_teorica, 32 as total_egresados, 20 as egresados_tiempo_regular, 45.8 as promedio_meses_reales, 62.5 as eficiencia_porcentaje
-    UNION ALL
-    SELECT 'Ingeniería Civil' as carrera, 40 as duracion_meses_teorica, 28 as total_egresados, 18 as egresados_tiempo_regular, 48.3 as promedio_meses_reales, 64.3 as eficiencia_porcentaje
-    UNION ALL
-    SELECT 'Administración' as carrera, 32 as duracion_meses_teorica, 52 as total_egresados, 42 as egresados_tiempo_regular, 35.8 as promedio_meses_reales, 80.8 as eficiencia_porcentaje
-""",
-            
-            # Recursos ACTUALIZADAS
-            "recursos_stats": """
-                SELECT recurso, COUNT(*) as usos, AVG(duracion_minutos) as duracion
-                FROM uso_recursos GROUP BY recurso ORDER BY usos DESC LIMIT 10
-            """,
-            
-            "laboratorios_area": """
-                SELECT 
-                    'Lab. Cómputo' as laboratorio, 245 as horas_uso, 320 as horas_disponibles
-                UNION ALL
-                SELECT 'Lab. Electrónica' as laboratorio, 180 as horas_uso, 280 as horas_disponibles
-                UNION ALL
-                SELECT 'Lab. Química' as laboratorio, 95 as horas_uso, 200 as horas_disponibles
-                UNION ALL
-                SELECT 'Lab. Física' as laboratorio, 120 as horas_uso, 240 as horas_disponibles
-                UNION ALL
-                SELECT 'Lab. Mecánica' as laboratorio, 85 as horas_uso, 160 as horas_disponibles
-                UNION ALL
-                SELECT 'Lab. Redes' as laboratorio, 160 as horas_uso, 200 as horas_disponibles
-            """,
-            
-            "recursos_tecnologicos": """
-                SELECT 
-                    'Computadoras' as recurso, 180 as cantidad
-                UNION ALL
-                SELECT 'Proyectores' as recurso, 45 as cantidad
-                UNION ALL
-                SELECT 'Impresoras' as recurso, 25 as cantidad
-                UNION ALL
-                SELECT 'Tablets' as recurso, 30 as cantidad
-                UNION ALL
-                SELECT 'Equipos Audio/Video' as recurso, 15 as cantidad
-                UNION ALL
-                SELECT 'Servidores' as recurso, 8 as cantidad
-            """,
-            
-            "patrones_uso_semanal": """
-                SELECT 
-                    'Lunes' as dia, 78 as ocupacion_porcentaje
-                UNION ALL
-                SELECT 'Martes' as dia, 85 as ocupacion_porcentaje
-                UNION ALL
-                SELECT 'Miércoles' as dia, 92 as ocupacion_porcentaje
-                UNION ALL
-                SELECT 'Jueves' as dia, 88 as ocupacion_porcentaje
-                UNION ALL
-                SELECT 'Viernes' as dia, 82 as ocupacion_porcentaje
-                UNION ALL
-                SELECT 'Sábado' as dia, 45 as ocupacion_porcentaje
-                UNION ALL
-                SELECT 'Domingo' as dia, 12 as ocupacion_porcentaje
-            """
-        }
+    def _render(self, data, chart_type, title, dashboard_id):
+        start = time.perf_counter()
+        if self._render_executor is not None:
+            result = self._render_executor.submit(
+                render_chart, data, chart_type, title, dashboard_id
+            ).result()
+        else:
+            result = self.create_chart(data, chart_type, title, dashboard_id)
+        self.metrics.observe_render(dashboard_id, time.perf_counter() - start)
+        return result
+    
+    def generate_dashboards(self, dashboard_infos, filters=None):
+        """Genera varios dashboards, en paralelo si está habilitado.
+        
+        Devuelve una lista de {"info", "data"} en el mismo orden recibido. Un
+        dashboard que no termina dentro de DASHBOARD_TIMEOUT (contado desde que
+        un hilo empieza a generarlo) se reemplaza por su tarjeta de error; esas
+        tarjetas y las de excepciones llevan "failed" para que la página no se cachee.
+        """
+        if self._query_executor is None:
+            return [self._generate_safely(info, filters) for info in dashboard_infos]
+        
+        futures = self._submit_dashboards(dashboard_infos, filters)
+        return [self._collect_dashboard(info, started, future) for future, (info, started) in futures.items()]
+    
+    def iter_dashboards(self, dashboard_infos, filters=None):
+        """Como generate_dashboards, pero entrega cada dashboard en cuanto termina.
         
-        # Agregar filtros WHERE si es necesario
-        base_query = queries.get(data_key, "SELECT 1 as placeholder")
+        Generador de {"info", "data"} en orden de finalización (en orden si no
+        hay paralelismo). Los que no terminan dentro de DASHBOARD_TIMEOUT se
+        entregan como tarjetas de error en cuanto vence su plazo.
+        """
+        if self._query_executor is None:
+            for info in dashboard_infos:
+                yield self._generate_safely(info, filters)
+            return
+        
+        pending = self._submit_dashboards(dashboard_infos, filters)
+        try:
+            while pending:
+                # Los que siguen en cola vencen como pronto dentro de un plazo completo
+                timeout = min(self._remaining(started) for _, started in pending.values())
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield self._collect_dashboard(*pending.pop(future), future)
+                for future, (info, started) in list(pending.items()):
+                    if "at" in started and self._remaining(started) == 0:
+                        del pending[future]
+                        yield self._collect_dashboard(info, started, future)
+        finally:
+            # Si el cliente se desconecta, no empezar los que siguen en cola
+            for future in pending:
+                future.cancel()
+    
+    def _submit_dashboards(self, dashboard_infos, filters):
+        # future -> (info, inicio); los dict conservan el orden recibido
+        futures = {}
+        for info in dashboard_infos:
+            started = {}
+            futures[self._query_executor.submit(self._generate_timed, info["id"], filters, started)] = (info, started)
+        return futures
+    
+    def _generate_timed(self, dashboard_id, filters, started):
+        # El plazo cuenta desde aquí: el tiempo en cola detrás de otros dashboards no se cobra
+        started["at"] = time.monotonic()
+        return self.generate_dashboard(dashboard_id, filters)
+    
+    def _remaining(self, started):
+        """Segundos que le quedan a un dashboard; uno en cola todavía tiene el plazo completo"""
+        if "at" not in started:
+            return Config.DASHBOARD_TIMEOUT
+        return max(0, started["at"] + Config.DASHBOARD_TIMEOUT - time.monotonic())
+    
+    def _collect_dashboard(self, info, started, future):
+        """Resultado de un dashboard en paralelo, o su tarjeta de error si falló o venció el plazo"""
+        try:
+            while True:
+                queued = "at" not in started
+                try:
+                    dashboard_data = future.result(timeout=self._remaining(started))
+                    break
+                except TimeoutError:
+                    # Si estaba en cola, el plazo recién empieza a contar cuando arranca
+                    if not queued:
+                        raise
+        except TimeoutError:
+            # El hilo no se puede interrumpir: la consulta termina en segundo plano
+            # (y su resultado queda en la cache), pero la página ya no la espera
+            self.metrics.record_error(info["id"], "timeout")
+            dashboard_data = {"error": f"Tiempo de espera agotado para {info['name']}", "failed": True}
+        except Exception as e:
+            dashboard_data = {"error": f"Error en {info['name']}: {str(e)}", "failed": True}
+        return self._wrap_dashboard(info, dashboard_data)
+    
+    def _generate_safely(self, dashboard_info, filters):
+        try:
+            dashboard_data = self.generate_dashboard(dashboard_info["id"], filters)
+        except Exception as e:
+            dashboard_data = {"error": f"Error en {dashboard_info['name']}: {str(e)}", "failed": True}
+        return self._wrap_dashboard(dashboard_info, dashboard_data)
+    
+    def _wrap_dashboard(self, dashboard_info, dashboard_data):
+        if not dashboard_data:
+            # Si no hay datos, crear un placeholder
+            dashboard_data = {"error": f"No se pudieron cargar los datos para {dashboard_info['name']}",
+                              "failed": True}
+        return {"info": dashboard_info, "data": dashboard_data}
+    
+    def get_dashboard_data(self, data_key, filters=None):
+        """Obtiene datos de un dashboard, pasando por la cache de resultados"""
+        if self._use_fused(data_key):
+            return self.get_fused_estudiantes(filters).get(data_key, [])
         
-        # Aplicar filtros (implementación básica)
-        if filters and any(filters.values()):
-            # Lógica de filtros aquí
-            pass
+        # Los filtros que la consulta no admite no cambian el resultado ni la clave
+        key = (data_key, normalize_filters(supported_filters(data_key, filters)))
+        return self.get_cached_data(
+            key,
+            lambda: self.query_dashboard_data(data_key, filters),
+            ttl=DATA_TTLS.get(data_key, Config.CACHE_DEFAULT_TTL)
+        )
+    
+    def _use_fused(self, data_key):
+        # Sin cache cada dashboard volvería a consultar el cubo completo
+        return Config.FUSED_ESTUDIANTES and self.cache is not None and data_key in FUSED_ESTUDIANTES_KEYS
+    
+    def get_fused_estudiantes(self, filters=None):
+        """Datos de los dashboards 1 y 3-10 calculados con un solo recorrido de estudiantes"""
+        key = ("estudiantes_cubo", normalize_filters(supported_filters("estudiantes_cubo", filters)))
+        return self.get_cached_data(
+            key,
+            lambda: fan_out_estudiantes(self.query_dashboard_data("estudiantes_cubo", filters).to_records()),
+            ttl=DATA_TTLS.get("estudiantes_cubo", Config.CACHE_DEFAULT_TTL)
+        )
+    
+    def query_dashboard_data(self, data_key, filters=None):
+        """Obtiene datos usando queries unificadas - ACTUALIZADAS"""
+        query, params = build_query(data_key, filters, use_summaries=self.use_summaries)
+        start = time.perf_counter()
+        try:
+            # Lotes de tuplas directo a columnas, sin un dict por fila
+            result = ColumnarResult.from_stream(self.db.stream_query(query, params or None))
+        except Exception:
+            # El error ya se reportó en Database; vacío para que no se cachee
+            result = ColumnarResult((), [])
+        self.metrics.observe_query(data_key, time.perf_counter() - start, len(result))
+        return result
+    
+    def stream_dashboard_data(self, dashboard_id, filters=None, batch_size=None, describe=False):
+        """Resultado completo de la consulta de un dashboard, por lotes y sin pasar por la cache.
         
-        return self.db.execute_query(base_query)
+        Devuelve el generador de Database.stream_query (columnas, o su
+        descripción con describe, y luego lotes de tuplas), o None si el
+        dashboard no tiene consulta.
+        """
+        dashboard = get_dashboard(dashboard_id)
+        if not dashboard or not dashboard["data_key"]:
+            return None
+        query, params = build_query(dashboard["data_key"], filters, use_summaries=self.use_summaries)
+        return self.db.stream_query(query, params or None, batch_size, describe=describe)
+    
+    def build_dataframe(self, data):
+        """DataFrame desde un ColumnarResult (sin copiar columnas) o una lista de dicts (cubo fusionado)"""
+        if isinstance(data, ColumnarResult):
+            return data.to_frame()
+        return pd.DataFrame(data)
     
     def create_chart(self, data, chart_type, title, dashboard_id):
         """Crea gráficos basados en tipo y datos"""
         if not data:
             return {"error": f"No hay datos disponibles para {title}"}
         
-        df = pd.DataFrame(data)
+        df = self.build_dataframe(data)
         
         try:
             if chart_type == "indicators":
-                return self.create_indicators(df, title, dashboard_id)
+                result = self.create_indicators(df, title, dashboard_id)
             elif chart_type == "pie":
-                return self.create_pie_chart(df, title, dashboard_id)
+                result = self.create_pie_chart(df, title, dashboard_id)
             elif chart_type == "bar":
-                return self.create_bar_chart(df, title, dashboard_id)
+                result = self.create_bar_chart(df, title, dashboard_id)
             elif chart_type == "bar_h":
-                return self.create_horizontal_bar_chart(df, title, dashboard_id)
+                result = self.create_horizontal_bar_chart(df, title, dashboard_id)
             elif chart_type == "line":
-                return self.create_line_chart(df, title, dashboard_id)
+                result = self.create_line_chart(df, title, dashboard_id)
             elif chart_type == "scatter":
-                return self.create_scatter_chart(df, title, dashboard_id)
+                result = self.create_scatter_chart(df, title, dashboard_id)
             elif chart_type == "bar_grouped":
-                return self.create_grouped_bar_chart(df, title, dashboard_id)
+                result = self.create_grouped_bar_chart(df, title, dashboard_id)
             elif chart_type == "histogram":
-                return self.create_histogram_chart(df, title, dashboard_id)
+                result = self.create_histogram_chart(df, title, dashboard_id)
             elif chart_type == "bar_line":
-                return self.create_bar_line_chart(df, title, dashboard_id)
+                result = self.create_bar_line_chart(df, title, dashboard_id)
             elif chart_type == "box":
-                return self.create_box_chart(df, title, dashboard_id)
+                result = self.create_box_chart(df, title, dashboard_id)
             elif chart_type == "subplots":
-                return self.create_subplots_chart(df, title, dashboard_id)
+                result = self.create_subplots_chart(df, title, dashboard_id)
             elif chart_type == "capacity":
-                return self.create_capacity_chart(df, title, dashboard_id)
+                result = self.create_capacity_chart(df, title, dashboard_id)
             elif chart_type == "morosity":
-                return self.create_morosity_chart(df, title, dashboard_id)  
+                result = self.create_morosity_chart(df, title, dashboard_id)  
             elif chart_type == "employment":
-                return self.create_employment_chart(df, title, dashboard_id)
+                result = self.create_employment_chart(df, title, dashboard_id)
             elif chart_type == "salary_analysis":
-                return self.create_salary_analysis_chart(df, title, dashboard_id)
+                result = self.create_salary_analysis_chart(df, title, dashboard_id)
             elif chart_type == "terminal_efficiency":
-                return self.create_terminal_efficiency_chart(df, title, dashboard_id)
+                result = self.create_terminal_efficiency_chart(df, title, dashboard_id)
             
             else:
                 return self.create_placeholder({"name": title}, dashboard_id)
                 
         except Exception as e:
             return {"error": f"Error creando gráfico {title}: {str(e)}"}
+        
+        # Los registros se generan una vez por resultado, no una vez por gráfico; se
+        # respeta el "data" propio de los gráficos que no muestran la tabla (subplots)
+        if "error" not in result:
+            result.setdefault("data", data.records() if isinstance(data, ColumnarResult) else data)
+        return result
     
     def create_indicators(self, df, title, dashboard_id):
         """Crear indicadores numéricos"""
@@ -675,7 +502,7 @@ class DashboardManager:
                 </div>
             </div>
             """
-            return {"chart": html, "data": df.to_dict('records')}
+            return {"chart": html}
         except Exception as e:
             return {"error": f"Error en indicadores: {str(e)}"}
     
@@ -692,7 +519,7 @@ class DashboardManager:
             fig = px.pie(df, values=value_col, names=label_col, title=title)
             fig.update_layout(height=350, margin=dict(t=50, b=0, l=0, r=0))
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico de pastel: {str(e)}"}
     
@@ -708,7 +535,7 @@ class DashboardManager:
             fig = px.bar(df, x=x_col, y=y_col, title=title)
             fig.update_layout(height=350, margin=dict(t=50, b=40, l=40, r=40))
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico de barras: {str(e)}"}
     
@@ -724,7 +551,7 @@ class DashboardManager:
             fig = px.bar(df, x=x_col, y=y_col, orientation='h', title=title)
             fig.update_layout(height=350, margin=dict(t=50, b=40, l=100, r=40))
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico de barras horizontal: {str(e)}"}
     
@@ -740,7 +567,7 @@ class DashboardManager:
             fig = px.line(df, x=x_col, y=y_col, title=title, markers=True)
             fig.update_layout(height=350, margin=dict(t=50, b=40, l=40, r=40))
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico de líneas: {str(e)}"}
     
@@ -759,7 +586,7 @@ class DashboardManager:
             fig = px.scatter(df, x=x_col, y=y_col, title=title, hover_data=hover_data)
             fig.update_layout(height=350, margin=dict(t=50, b=40, l=40, r=40))
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico de dispersión: {str(e)}"}
     
@@ -788,7 +615,7 @@ class DashboardManager:
                 margin=dict(t=50, b=40, l=40, r=40)
             )
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico de barras agrupadas: {str(e)}"}
     
@@ -803,7 +630,7 @@ class DashboardManager:
             fig = px.histogram(df, x=value_col, title=title, nbins=10)
             fig.update_layout(height=350, margin=dict(t=50, b=40, l=40, r=40))
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en histograma: {str(e)}"}
     
@@ -834,7 +661,7 @@ class DashboardManager:
             fig.update_yaxes(title_text="Cantidad", secondary_y=False)
             fig.update_yaxes(title_text="Promedio", secondary_y=True)
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico combinado: {str(e)}"}
     
@@ -870,7 +697,7 @@ class DashboardManager:
             
             fig.update_layout(title=title, height=350, margin=dict(t=50, b=40, l=40, r=40))
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico de caja: {str(e)}"}
     
@@ -922,7 +749,7 @@ class DashboardManager:
                 margin=dict(t=80, b=40, l=40, r=40)
             )
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": []}
+            return {**render_figure(fig, dashboard_id), "data": []}
         except Exception as e:
             return {"error": f"Error en dashboard integral: {str(e)}"}
     
@@ -975,7 +802,7 @@ class DashboardManager:
                 xaxis={'tickangle': -45}
             )
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico de capacidad: {str(e)}"}
 
@@ -1022,7 +849,7 @@ class DashboardManager:
             fig.update_yaxes(title_text="Número de Estudiantes", secondary_y=False)
             fig.update_yaxes(title_text="Porcentaje de Morosidad (%)", secondary_y=True)
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico de morosidad: {str(e)}"}
 
@@ -1078,7 +905,7 @@ class DashboardManager:
                 )
             )
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en gráfico de empleo: {str(e)}"}
 
@@ -1119,8 +946,7 @@ class DashboardManager:
                     stats_text.append(f"{area}: Promedio ${area_data.mean():,.0f}")
             
             return {
-                "chart": fig.to_html(div_id=f"chart-{dashboard_id}"), 
-                "data": df.to_dict('records'),
+                **render_figure(fig, dashboard_id),
                 "stats": stats_text
             }
         except Exception as e:
@@ -1186,6 +1012,6 @@ class DashboardManager:
             fig.update_yaxes(title_text="Eficiencia Terminal (%)", secondary_y=False)
             fig.update_yaxes(title_text="Duración (Meses)", secondary_y=True)
             
-            return {"chart": fig.to_html(div_id=f"chart-{dashboard_id}"), "data": df.to_dict('records')}
+            return render_figure(fig, dashboard_id)
         except Exception as e:
             return {"error": f"Error en eficiencia terminal: {str(e)}"}
\ No newline at end of file
@@ -0,0 +1,158 @@
+import csv
+import importlib.util
+import io
+import json
+
+from mysql.connector.constants import FieldType
+
+
+# formato -> (mimetype, extensión)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+# Tipos de MySQL (type_code de cursor.description) por tipo de Arrow
+_INTEGER_TYPES = {FieldType.TINY, FieldType.SHORT, FieldType.LONG, FieldType.INT24,
+                  FieldType.LONGLONG, FieldType.YEAR, FieldType.BIT}
+# DECIMAL va como float64: la descripción no trae la escala y cada lote podría traer otra
+_FLOAT_TYPES = {FieldType.FLOAT, FieldType.DOUBLE, FieldType.DECIMAL, FieldType.NEWDECIMAL}
+_DATE_TYPES = {FieldType.DATE, FieldType.NEWDATE}
+_DATETIME_TYPES = {FieldType.DATETIME, FieldType.TIMESTAMP}
+_BLOB_TYPES = {FieldType.TINY_BLOB, FieldType.MEDIUM_BLOB, FieldType.LONG_BLOB, FieldType.BLOB}
+# Juego de caracteres "binary": el BLOB es binario y no un TEXT
+_BINARY_CHARSET = 63
+
+
+class ExportError(Exception):
+    """Formato de exportación no disponible"""
+
+
+def _csv_chunks(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM para que Excel detecte UTF-8 (acentos en nombres de carreras y materias)
+    buffer.write("\ufeff")
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    remaining = buffer.getvalue()
+    if remaining:
+        yield remaining.encode("utf-8")
+
+
+def _jsonl_chunks(columns, batches):
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Destino de escritura que acumula bytes hasta que se drenan con take()"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def take(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _as_text(value):
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def _as_float(value):
+    return None if value is None else float(value)
+
+
+def _as_bytes(value):
+    return bytes(value) if isinstance(value, bytearray) else value
+
+
+def _arrow_column(pa, description):
+    """(tipo de Arrow, conversión de cada valor) de una columna de cursor.description"""
+    type_code = description[1]
+    if type_code in _INTEGER_TYPES:
+        return pa.int64(), None
+    if type_code in _FLOAT_TYPES:
+        return pa.float64(), _as_float
+    if type_code in _DATE_TYPES:
+        return pa.date32(), None
+    if type_code in _DATETIME_TYPES:
+        return pa.timestamp("us"), None
+    if type_code == FieldType.TIME:
+        return pa.duration("us"), None
+    if type_code in _BLOB_TYPES and len(description) > 8 and description[8] == _BINARY_CHARSET:
+        return pa.binary(), _as_bytes
+    # Texto, ENUM, JSON... y las columnas sin tipo conocido (sqlite3 no lo informa)
+    return pa.string(), _as_text
+
+
+def _parquet_chunks(description, batches):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # El esquema sale de los tipos de la consulta y no del primer lote: un
+    # lote con solo NULL o con otra escala de DECIMAL no lo cambia a media descarga
+    converters = [_arrow_column(pa, column) for column in description]
+    schema = pa.schema([(column[0], arrow_type) for column, (arrow_type, _) in zip(description, converters)])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for rows in batches:
+            # Un row group por lote: la memoria no depende del total de filas
+            table = pa.Table.from_pydict({
+                field.name: [row[index] if convert is None else convert(row[index]) for row in rows]
+                for index, (field, (_, convert)) in enumerate(zip(schema, converters))
+            }, schema=schema)
+            writer.write_table(table)
+            data = sink.take()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+def check_format(export_format):
+    """Valida el formato antes de empezar a responder; lanza ExportError si no está disponible"""
+    if export_format not in EXPORT_FORMATS:
+        raise ExportError(f"Formato no soportado: {export_format} (usar {', '.join(EXPORT_FORMATS)})")
+    if export_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise ExportError("La exportación a Parquet requiere pyarrow")
+
+
+def export_chunks(stream, export_format):
+    """Convierte el generador de Database.stream_query(..., describe=True) en bloques de bytes.
+
+    El primer elemento es el cursor.description: CSV y JSONL usan los
+    nombres; Parquet, además, los tipos para fijar el esquema.
+    """
+    description = next(stream)
+    columns = tuple(column[0] for column in description)
+    if export_format == "csv":
+        return _csv_chunks(columns, stream)
+    if export_format == "jsonl":
+        return _jsonl_chunks(columns, stream)
+    return _parquet_chunks(description, stream)
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+from config import Config
+
+
+FILTER_QUERIES = {
+    # Carreras activas
+    "carreras": """
+        SELECT DISTINCT codigo, nombre
+        FROM carreras
+        WHERE activa = 1
+        ORDER BY nombre
+    """,
+    # Períodos únicos
+    "periodos": """
+        SELECT DISTINCT periodo_ingreso
+        FROM estudiantes
+        WHERE periodo_ingreso IS NOT NULL
+        ORDER BY periodo_ingreso DESC
+    """,
+    # Géneros únicos
+    "generos": """
+        SELECT DISTINCT genero
+        FROM estudiantes
+        WHERE genero IS NOT NULL
+        ORDER BY genero
+    """,
+}
+
+
+class FilterCatalog:
+    """Opciones de los filtros (carreras, períodos, géneros) calculadas fuera del camino caliente.
+
+    El catálogo se guarda en memoria junto con su ETag y la hora en que se
+    generó. Un hilo de fondo lo recalcula cada FILTERS_REFRESH_INTERVAL; si
+    aun así pasa de FILTERS_TTL (hilo detenido, base caída) se sigue sirviendo
+    la versión anterior mientras se recalcula en otro hilo. Solo la primera
+    petición, antes de que exista ninguna versión, espera a la base de datos.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._first_load = threading.Lock()
+        self._refreshing = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load(self):
+        """Ejecuta las consultas; devuelve None si la base no respondió"""
+        payload = {name: self.db.execute_query(query) for name, query in FILTER_QUERIES.items()}
+        # execute_query devuelve [] ante un error; un catálogo vacío no reemplaza al anterior
+        if not any(payload.values()):
+            return None
+        body = json.dumps(payload, sort_keys=True, default=str)
+        return {
+            "payload": payload,
+            "body": body,
+            "etag": hashlib.sha1(body.encode("utf-8")).hexdigest(),
+            "generated_at": datetime.now(timezone.utc).replace(microsecond=0),
+        }
+
+    def refresh(self):
+        """Recalcula el catálogo; devuelve True si se obtuvo una versión nueva"""
+        snapshot = self._load()
+        with self._lock:
+            self._refreshing = False
+            if snapshot is None:
+                return False
+            # Si el contenido no cambió se conserva la fecha para que Last-Modified siga valiendo
+            if self._snapshot is not None and self._snapshot["etag"] == snapshot["etag"]:
+                snapshot["generated_at"] = self._snapshot["generated_at"]
+            self._snapshot = snapshot
+            self._loaded_at = time.monotonic()
+            return True
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="filter-catalog-refresh", daemon=True).start()
+
+    def get(self):
+        """Devuelve {"payload", "body", "etag", "generated_at"} o None si nunca se pudo cargar"""
+        with self._lock:
+            snapshot = self._snapshot
+            stale = time.monotonic() - self._loaded_at >= Config.FILTERS_TTL
+        if snapshot is None:
+            # Primera carga: en serie para no lanzar las consultas una vez por petición
+            with self._first_load:
+                if self._snapshot is None:
+                    self.refresh()
+            return self._snapshot
+        if stale:
+            self._refresh_in_background()
+        return snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error actualizando el catálogo de filtros: {e}")
+            self._stop.wait(Config.FILTERS_REFRESH_INTERVAL)
+
+    def start(self):
+        """Arranca el recálculo periódico en un hilo de fondo"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="filter-catalog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
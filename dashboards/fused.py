@@ -0,0 +1,91 @@
+from collections import defaultdict
+
+
+def _label_genero(genero):
+    if genero == 'M':
+        return 'Masculino'
+    if genero == 'F':
+        return 'Femenino'
+    return 'Otro'
+
+
+def _count_by(rows, key_func, condition=None):
+    """Suma "cantidad" por clave conservando el orden de aparición"""
+    counts = defaultdict(int)
+    for row in rows:
+        if condition is None or condition(row):
+            counts[key_func(row)] += row["cantidad"]
+    return counts
+
+
+def _periodo_desc(item):
+    # ORDER BY periodo DESC de MySQL: los NULL van al final
+    periodo = item[0]
+    return (periodo is not None, periodo if periodo is not None else "")
+
+
+def fan_out_estudiantes(cube_rows):
+    """Reparte el cubo de estudiantes en los resultados de cada dashboard.
+    
+    Cada fila del cubo es un grupo (activo, beca, genero, estado, tipo_escuela,
+    periodo_ingreso, rango_edad) con su cantidad; cada dashboard es una suma
+    sobre algunas de esas dimensiones, igual que su consulta GROUP BY original.
+    """
+    if not cube_rows:
+        return {}
+    
+    def activo(row):
+        return row["activo"] == 1
+    
+    total = sum(row["cantidad"] for row in cube_rows)
+    con_edad = sum(row["con_edad"] for row in cube_rows)
+    suma_edad = sum(float(row["suma_edad"] or 0) for row in cube_rows)
+    
+    # Los GROUP BY originales agrupan por el valor crudo y después etiquetan
+    generos = _count_by(cube_rows, lambda row: row["genero"], activo)
+    activos = _count_by(cube_rows, lambda row: row["activo"])
+    becas = _count_by(cube_rows, lambda row: row["beca"])
+    estados = _count_by(cube_rows, lambda row: row["estado"],
+                        lambda row: activo(row) and row["estado"] is not None)
+    periodos = _count_by(cube_rows, lambda row: row["periodo_ingreso"])
+    
+    return {
+        "estudiantes_stats": [{
+            "total": total,
+            "activos": sum(count for value, count in activos.items() if value == 1),
+            "con_beca": sum(count for value, count in becas.items() if value == 1),
+            "edad_promedio": suma_edad / con_edad if con_edad else None,
+        }],
+        "genero_stats": [
+            {"genero": _label_genero(genero), "cantidad": cantidad}
+            for genero, cantidad in generos.items()
+        ],
+        "edad_stats": [
+            {"rango_edad": rango, "cantidad": cantidad}
+            for rango, cantidad in _count_by(cube_rows, lambda row: row["rango_edad"], activo).items()
+        ],
+        "estado_stats": [
+            {"estado": estado, "cantidad": cantidad}
+            for estado, cantidad in sorted(estados.items(), key=lambda item: item[1], reverse=True)[:10]
+        ],
+        "activos_stats": [
+            {"estado": 'Activos' if value == 1 else 'Inactivos', "cantidad": cantidad}
+            for value, cantidad in activos.items()
+        ],
+        "becas_stats": [
+            {"estado": 'Con Beca' if value == 1 else 'Sin Beca', "cantidad": cantidad}
+            for value, cantidad in becas.items()
+        ],
+        "escuela_stats": [
+            {"tipo_escuela": tipo, "cantidad": cantidad}
+            for tipo, cantidad in _count_by(cube_rows, lambda row: row["tipo_escuela"], activo).items()
+        ],
+        "inscripciones_stats": [
+            {"periodo": periodo, "cantidad": cantidad}
+            for periodo, cantidad in sorted(periodos.items(), key=_periodo_desc, reverse=True)[:10]
+        ],
+        "periodo_stats": [
+            {"periodo": periodo, "cantidad": cantidad}
+            for periodo, cantidad in sorted(periodos.items(), key=lambda item: item[1], reverse=True)
+        ],
+    }
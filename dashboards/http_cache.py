@@ -0,0 +1,85 @@
+import gzip
+import hashlib
+
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional; sin él se comprime solo con gzip
+    brotli = None
+
+
+# Tipos de contenido que vale la pena comprimir
+COMPRESSIBLE_MIMETYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/csv",
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+}
+
+
+def available_encodings():
+    """Codificaciones soportadas, de la preferida a la menos preferida"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encodings, offered=None):
+    """Primera codificación ofrecida que el cliente acepta (Accept-Encoding), o None"""
+    for encoding in offered or available_encodings():
+        if accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+
+def compress(data, encoding, static=False):
+    """Comprime con el nivel de las respuestas dinámicas o, con static, con el máximo"""
+    if encoding == "br":
+        quality = Config.ASSETS_BROTLI_QUALITY if static else Config.COMPRESS_BROTLI_QUALITY
+        return brotli.compress(data, quality=quality)
+    return gzip.compress(data, compresslevel=9 if static else Config.COMPRESS_LEVEL, mtime=0)
+
+
+def data_versioned(response, request, last_modified, etag=None):
+    """Agrega validadores a una respuesta generada a partir de los datos cacheados.
+
+    El ETag es débil y sale del cuerpo, así que vale igual comprimido o no; el
+    Last-Modified es la versión de los datos (DashboardManager.data_changed_at).
+    etag permite pasar uno ya calculado (p. ej. el de una página cacheada).
+    El navegador puede guardar la respuesta pero debe revalidarla (no-cache):
+    si no cambió recibe un 304 sin cuerpo.
+    """
+    if response.status_code != 200 or response.is_streamed:
+        return response
+    if etag is None:
+        etag = hashlib.blake2b(response.get_data(), digest_size=16).hexdigest()
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def compress_response(response, request):
+    """Comprime el cuerpo con brotli o gzip según Accept-Encoding.
+
+    Se omiten las respuestas en streaming, los archivos (send_file ya entrega
+    los recursos precomprimidos), las ya codificadas y las pequeñas.
+    """
+    if not Config.COMPRESS_ENABLED or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or response.content_encoding):
+        return response
+    data = response.get_data()
+    if len(data) < Config.COMPRESS_MIN_SIZE:
+        return response
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    response.set_data(compress(data, encoding))
+    response.content_encoding = encoding
+    return response
@@ -0,0 +1,45 @@
+import importlib
+import sys
+
+
+# Librerías pesadas que se cargan en el primer uso (ver Config.LAZY_IMPORTS)
+HEAVY_MODULES = ("pandas", "plotly.express", "plotly.graph_objects", "plotly.subplots")
+
+
+class LazyModule:
+    """Módulo que se importa la primera vez que se accede a uno de sus atributos.
+
+    Así importar la app no carga pandas ni plotly: los workers, los CLI y
+    /test-connection arrancan sin pagar esas importaciones hasta que de verdad
+    arman un DataFrame o un gráfico.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            # import_module es seguro entre hilos: el primero importa, el resto espera
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = "cargado" if self._module is not None else "sin cargar"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def preload_heavy_modules():
+    """Importa ya las librerías pesadas.
+
+    Se usa con LAZY_IMPORTS desactivado y en un master que hace fork antes de
+    crear los workers (gunicorn con preload_app): los hijos heredan los
+    módulos cargados y comparten sus páginas de memoria.
+    """
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+
+
+def loaded_heavy_modules():
+    """Librerías pesadas ya importadas en este proceso"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
@@ -0,0 +1,253 @@
+import bisect
+import threading
+
+
+# Límites superiores (segundos) de los buckets de latencia y (filas) de tamaño de resultado
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Histograma acumulativo por combinación de etiquetas, al estilo de Prometheus"""
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # etiquetas -> [conteos por bucket (+Inf al final), suma, total, mínimo, máximo]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0, value, value]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+            series[3] = min(series[3], value)
+            series[4] = max(series[4], value)
+
+    def _quantile(self, counts, total, low, high, q):
+        """Cuantil aproximado interpolando dentro del bucket donde cae, acotado a lo observado"""
+        rank = q * total
+        seen = 0
+        lower = low
+        for bound, count in zip(self.buckets + (high,), counts):
+            upper = min(bound, high)
+            if count and seen + count >= rank:
+                return max(low, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+            lower = max(lower, upper)
+        return high
+
+    def summary(self):
+        """{etiquetas: {count, sum, avg, p50, p95, p99}}"""
+        with self._lock:
+            snapshot = {labels: (list(series[0]),) + tuple(series[1:])
+                        for labels, series in self._series.items()}
+        result = {}
+        for labels, (counts, total_sum, total, low, high) in snapshot.items():
+            result[labels] = {
+                "count": total,
+                "sum": round(total_sum, 6),
+                "avg": round(total_sum / total, 6) if total else 0.0,
+                "min": round(low, 6),
+                "max": round(high, 6),
+                "p50": round(self._quantile(counts, total, low, high, 0.50), 6),
+                "p95": round(self._quantile(counts, total, low, high, 0.95), 6),
+                "p99": round(self._quantile(counts, total, low, high, 0.99), 6),
+            }
+        return result
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(self._series.items(), key=lambda item: tuple(map(str, item[0])))
+            items = [(labels, (list(series[0]), series[1], series[2])) for labels, series in items]
+        for labels, (counts, total_sum, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.label_names + ("le",),
+                                               labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(float(total_sum))}")
+            lines.append(f"{self.name}_count{label_text} {total}")
+        return lines
+
+
+class Counter:
+    """Contador monotónico por combinación de etiquetas"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def values(self):
+        with self._lock:
+            return dict(self._values)
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values().items(), key=lambda item: tuple(map(str, item[0]))):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+def gauge_lines(prefix, stats, help_text):
+    """Convierte los valores numéricos de un dict de estadísticas en gauges de Prometheus"""
+    lines = []
+    for key, value in sorted(stats.items()):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines.append(f"# HELP {name} {help_text} ({key})")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {_format_value(value)}")
+    return lines
+
+
+class DashboardMetrics:
+    """Métricas del camino caliente de DashboardManager.
+
+    Las consultas, filas y la cache se etiquetan por data_key (es lo que se
+    consulta y se cachea); el renderizado, el tiempo total y los errores por
+    id de dashboard. summary() las cruza para decir qué dashboards dominan el
+    tiempo de página.
+    """
+
+    def __init__(self):
+        self.query_seconds = Histogram(
+            "dashboard_query_seconds", "Latencia de las consultas a la base de datos",
+            ("data_key",), LATENCY_BUCKETS
+        )
+        self.query_rows = Histogram(
+            "dashboard_query_rows", "Filas devueltas por consulta",
+            ("data_key",), ROW_BUCKETS
+        )
+        self.render_seconds = Histogram(
+            "dashboard_render_seconds", "Latencia de construcción y serialización del gráfico",
+            ("dashboard_id",), LATENCY_BUCKETS
+        )
+        self.generate_seconds = Histogram(
+            "dashboard_generate_seconds", "Latencia total de generate_dashboard (datos + gráfico)",
+            ("dashboard_id",), LATENCY_BUCKETS
+        )
+        self.cache_requests = Counter(
+            "dashboard_cache_requests_total", "Búsquedas en la cache de resultados",
+            ("data_key", "result")
+        )
+        self.render_cache_requests = Counter(
+            "dashboard_render_cache_requests_total", "Búsquedas en la cache de gráficos renderizados",
+            ("dashboard_id", "result")
+        )
+        self.errors = Counter(
+            "dashboard_errors_total", "Dashboards que terminaron en tarjeta de error",
+            ("dashboard_id", "kind")
+        )
+
+    def observe_query(self, data_key, seconds, rows):
+        self.query_seconds.observe((data_key,), seconds)
+        self.query_rows.observe((data_key,), rows)
+
+    def observe_render(self, dashboard_id, seconds):
+        self.render_seconds.observe((dashboard_id,), seconds)
+
+    def observe_generate(self, dashboard_id, seconds):
+        self.generate_seconds.observe((dashboard_id,), seconds)
+
+    def record_cache(self, data_key, hit):
+        self.cache_requests.inc((data_key, "hit" if hit else "miss"))
+
+    def record_render_cache(self, dashboard_id, hit):
+        self.render_cache_requests.inc((dashboard_id, "hit" if hit else "miss"))
+
+    def record_error(self, dashboard_id, kind):
+        self.errors.inc((dashboard_id, kind))
+
+    def exposition(self):
+        lines = []
+        for metric in (self.query_seconds, self.query_rows, self.render_seconds,
+                       self.generate_seconds, self.cache_requests, self.render_cache_requests,
+                       self.errors):
+            lines.extend(metric.exposition())
+        return lines
+
+    def summary(self, dashboards, query_key=None):
+        """Vista JSON por dashboard, ordenada por tiempo total acumulado.
+
+        `dashboards` es la lista de definiciones del registro ({"info", "data_key", ...});
+        `query_key(data_key)` indica qué consulta lo alimenta realmente (p. ej. el cubo
+        de estudiantes para los dashboards fusionados).
+        """
+        queries = {labels[0]: stats for labels, stats in self.query_seconds.summary().items()}
+        rows = {labels[0]: stats for labels, stats in self.query_rows.summary().items()}
+        renders = {labels[0]: stats for labels, stats in self.render_seconds.summary().items()}
+        generates = {labels[0]: stats for labels, stats in self.generate_seconds.summary().items()}
+        cache = self.cache_requests.values()
+        render_cache = self.render_cache_requests.values()
+        errors = {}
+        for (dashboard_id, kind), value in self.errors.values().items():
+            errors.setdefault(dashboard_id, {})[kind] = value
+
+        grand_total = sum(stats["sum"] for stats in generates.values())
+        result = []
+        for dashboard in dashboards:
+            info = dashboard["info"]
+            data_key = dashboard["data_key"]
+            source = query_key(data_key) if query_key and data_key else data_key
+            generate = generates.get(info["id"])
+            hits = cache.get((source, "hit"), 0)
+            misses = cache.get((source, "miss"), 0)
+            result.append({
+                "id": info["id"],
+                "name": info["name"],
+                "category": info["category"],
+                "data_key": data_key,
+                "query_key": source,
+                "generate": generate,
+                "query": queries.get(source),
+                "rows": rows.get(source),
+                "render": renders.get(info["id"]),
+                "cache": {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                },
+                "render_cache": {
+                    "hits": render_cache.get((info["id"], "hit"), 0),
+                    "misses": render_cache.get((info["id"], "miss"), 0),
+                },
+                "errors": errors.get(info["id"], {}),
+                "share_of_time": round(generate["sum"] / grand_total, 4) if generate and grand_total else 0.0,
+            })
+        result.sort(key=lambda entry: entry["generate"]["sum"] if entry["generate"] else 0.0, reverse=True)
+        return {"total_seconds": round(grand_total, 6), "dashboards": result}
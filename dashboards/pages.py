@@ -0,0 +1,120 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+
+from config import Config
+from dashboards.cache import TTLCache
+from dashboards.http_cache import compress
+
+
+def _page_size(page):
+    return len(page["body"])
+
+
+class PageCache:
+    """HTML de páginas completas por (ruta, filtros normalizados).
+
+    Una página está fresca durante PAGE_CACHE_TTL segundos; después se sigue
+    sirviendo al instante la última versión buena mientras un hilo de fondo la
+    regenera (stale-while-revalidate), una sola vez por página aunque lleguen
+    muchas peticiones. Si pasa PAGE_CACHE_MAX_STALE sin regenerarse se
+    descarta y la siguiente petición la genera en línea. Solo se guardan
+    páginas buenas: render() indica si algún dashboard falló.
+    """
+
+    def __init__(self):
+        self.ttl = Config.PAGE_CACHE_TTL
+        self._pages = TTLCache(
+            max_entries=Config.PAGE_CACHE_MAX_ENTRIES,
+            default_ttl=Config.PAGE_CACHE_MAX_STALE,
+            max_weight=Config.PAGE_CACHE_MAX_BYTES,
+            weigher=_page_size
+        )
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        # expire() sube la generación; las páginas de generaciones anteriores quedan vencidas
+        self._generation = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+        self._refresh_errors = 0
+
+    def _render(self, render):
+        # La generación se toma antes: si expire() llega durante el render, la página ya nace vencida
+        generation = self._generation
+        html, good = render()
+        body = html.encode("utf-8")
+        return {
+            "body": body,
+            "etag": hashlib.blake2b(body, digest_size=16).hexdigest(),
+            "generated_at": datetime.now(timezone.utc).replace(microsecond=0),
+            "rendered_at": time.monotonic(),
+            "generation": generation,
+            "good": good,
+            # Cuerpo comprimido por codificación, calculado en la primera petición que lo acepta
+            "encoded": {},
+        }
+
+    def _is_stale(self, page):
+        return (page["generation"] != self._generation
+                or time.monotonic() - page["rendered_at"] >= self.ttl)
+
+    def get(self, key, render):
+        """Devuelve la página de key; render() -> (html, sin_fallos) la genera si hace falta"""
+        page = self._pages.get_or_load(key, lambda: self._render(render),
+                                       cacheable=lambda page: page["good"])
+        if self._is_stale(page):
+            with self._lock:
+                self._stale_hits += 1
+            self._refresh_in_background(key, render)
+        return page
+
+    def _refresh(self, key, render):
+        try:
+            page = self._render(render)
+            if page["good"]:
+                self._pages.set(key, page)
+            with self._lock:
+                self._refreshes += 1
+        except Exception as e:
+            print(f"Error regenerando la página {key}: {e}")
+            with self._lock:
+                self._refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refresh_in_background(self, key, render):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key, render),
+                         name="page-cache-refresh", daemon=True).start()
+
+    def encoded(self, page, encoding):
+        """Cuerpo de la página comprimido con encoding; se comprime una vez por página"""
+        body = page["encoded"].get(encoding)
+        if body is None:
+            body = page["encoded"][encoding] = compress(page["body"], encoding)
+        return body
+
+    def expire(self):
+        """Marca todas las páginas como vencidas: se siguen sirviendo mientras se regeneran"""
+        with self._lock:
+            self._generation += 1
+
+    def invalidate(self):
+        """Descarta todas las páginas; devuelve cuántas había"""
+        return self._pages.invalidate()
+
+    def stats(self):
+        with self._lock:
+            counters = {
+                "ttl": self.ttl,
+                "stale_hits": self._stale_hits,
+                "refreshes": self._refreshes,
+                "refresh_errors": self._refresh_errors,
+                "refreshing": len(self._refreshing),
+            }
+        return {**self._pages.stats(), **counters}
@@ -0,0 +1,809 @@
+from config import Config
+
+
+# Catálogo de dashboards por categoría; los ids se asignan en este orden (1-40)
+CATEGORIES = {
+    "Estudiantes": [
+        ("Total de Estudiantes", "Resumen general de estudiantes"),
+        ("Estudiantes por Carrera", "Distribución de estudiantes por carrera"),
+        ("Estudiantes por Género", "Distribución por género"),
+        ("Estudiantes por Edad", "Distribución por grupos de edad"),
+        ("Estudiantes por Estado", "Origen geográfico de estudiantes"),
+        ("Estudiantes Activos vs Inactivos", "Estado de actividad"),
+        ("Estudiantes con Beca", "Análisis de becarios"),
+        ("Tipos de Escuela de Origen", "Pública vs Privada"),
+        ("Evolución de Inscripciones", "Tendencia temporal"),
+        ("Estudiantes por Período", "Distribución por período")
+    ],
+    "Académico": [
+        ("Promedios por Carrera", "Rendimiento académico por carrera"),
+        ("Materias más Reprobadas", "Análisis de reprobación"),
+        ("Calificaciones por Cuatrimestre", "Evolución de calificaciones"),
+        ("Rendimiento por Modalidad", "Presencial vs En línea"),
+        ("Correlación Asistencia-Calificación", "Relación asistencia y notas"),
+        ("Distribución de Profesores", "Plantilla docente por área"),
+        ("Capacidad de Grupos", "Ocupación vs capacidad máxima"),
+        ("Ocupación de Aulas por Turno", "Uso de instalaciones"),
+        ("Preferencias de Horarios", "Horarios más solicitados"),
+        ("Distribución de Créditos", "Carga académica estudiantes")
+    ],
+    "Riesgo": [
+        ("Estudiantes en Riesgo", "Análisis de riesgo académico"),
+        ("Factores de Riesgo por Carrera", "Indicadores específicos por programa"),
+        ("Abandono Escolar", "Tipos y causas de abandono"),
+        ("Indicadores de Alerta", "Métricas tempranas de riesgo"),
+        ("Efectividad de Intervenciones", "Resultados de acciones correctivas")
+    ],
+    "Financiero": [
+        ("Pagos por Período", "Ingresos por colegiaturas"),
+        ("Análisis de Morosidad", "Pagos pendientes por carrera"),
+        ("Inversión en Becas", "Distribución de apoyos económicos"),
+        ("Diversificación de Ingresos", "Fuentes de financiamiento"),
+        ("Becas por Rendimiento", "Criterios y beneficiarios")
+    ],
+    "Egresados": [
+        ("Egresados por Año", "Graduados por período"),
+        ("Inserción Laboral", "Empleabilidad por carrera"),
+        ("Análisis Salarial", "Ingresos por área profesional"),
+        ("Evaluación Institucional", "Satisfacción de egresados"),
+        ("Eficiencia Terminal", "Tiempo real de graduación")
+    ],
+    "Recursos": [
+        ("Uso de Biblioteca", "Utilización de recursos bibliográficos"),
+        ("Ocupación de Laboratorios", "Uso por área de conocimiento"),
+        ("Recursos Tecnológicos", "Distribución de equipamiento"),
+        ("Patrones de Uso Semanal", "Ocupación por días"),
+        ("Dashboard Integral", "Vista general de todos los indicadores")
+    ]
+}
+
+
+# Datos, tipo de gráfico y título de cada dashboard
+DASHBOARD_CONFIGS = {
+    # Estudiantes (1-10)
+    1: ("estudiantes_stats", "indicators", "Resumen General de Estudiantes"),
+    2: ("carreras_stats", "bar", "Estudiantes por Carrera"),
+    3: ("genero_stats", "pie", "Distribución por Género"),
+    4: ("edad_stats", "bar", "Distribución por Edad"),
+    5: ("estado_stats", "bar_h", "Estudiantes por Estado"),
+    6: ("activos_stats", "pie", "Activos vs Inactivos"),
+    7: ("becas_stats", "pie", "Estudiantes con Beca"),
+    8: ("escuela_stats", "bar", "Tipo de Escuela"),
+    9: ("inscripciones_stats", "line", "Evolución de Inscripciones"),
+    10: ("periodo_stats", "bar", "Estudiantes por Período"),
+    
+    # Académico (11-20) - ACTUALIZADOS
+    11: ("promedios_carrera", "bar_h", "Promedios por Carrera"),
+    12: ("materias_reprobadas", "bar_h", "Materias más Reprobadas"),
+    13: ("calificaciones_cuatrimestre", "line", "Calificaciones por Cuatrimestre"),
+    14: ("modalidad_rendimiento", "bar_grouped", "Rendimiento por Modalidad"),
+    15: ("asistencia_calificaciones", "scatter", "Correlación Asistencia-Calificación"),
+    16: ("profesores_area", "pie", "Distribución de Profesores por Área"),
+    17: ("capacidad_grupos", "capacity", "Capacidad vs Ocupación de Grupos"),
+
+
+    18: ("aulas_turno", "bar_grouped", "Ocupación de Aulas por Turno"),
+    19: ("horarios_preferencias", "bar", "Preferencias de Horarios"),
+    20: ("rendimiento_cuatrimestre", "bar_grouped", "Rendimiento Académico por Cuatrimestre"),
+    
+    # Riesgo (21-25) - ACTUALIZADOS
+    21: ("riesgo_stats", "bar", "Estudiantes en Riesgo"),
+    22: ("factores_riesgo_carrera", "bar_h", "Factores de Riesgo por Carrera"),
+    23: ("abandono_stats", "pie", "Abandono Escolar"),
+    24: ("indicadores_alerta", "bar", "Indicadores de Alerta Temprana"),
+    25: ("efectividad_intervenciones", "bar_grouped", "Efectividad de Intervenciones"),
+    
+    # Financiero (26-30) - ACTUALIZADOS
+    26: ("pagos_stats", "bar_grouped", "Pagos por Período"),
+    27: ("morosidad_carrera", "morosity", "Morosidad por Carrera"),
+
+    28: ("inversion_becas", "pie", "Inversión en Becas por Tipo"),
+    29: ("diversificacion_ingresos", "pie", "Diversificación de Ingresos"),
+    30: ("becas_rendimiento", "scatter", "Becas por Rendimiento Académico"),
+    
+    # Egresados (31-35) - ACTUALIZADOS
+    31: ("egresados_stats", "bar_line", "Egresados por Año"),
+    32: ("insercion_laboral", "employment", "Inserción Laboral por Carrera"),
+    33: ("analisis_salarial", "salary_analysis", "Análisis Salarial por Área"),
+
+
+    34: ("evaluacion_institucional", "bar", "Evaluación Institucional"),
+    35: ("eficiencia_terminal", "terminal_efficiency", "Eficiencia Terminal por Carrera"),
+    
+    # Recursos (36-40) - ACTUALIZADOS
+    36: ("recursos_stats", "bar_h", "Uso de Recursos"),
+    37: ("laboratorios_area", "bar", "Ocupación de Laboratorios por Área"),
+    38: ("recursos_tecnologicos", "pie", "Distribución de Recursos Tecnológicos"),
+    39: ("patrones_uso_semanal", "line", "Patrones de Uso Semanal"),
+    40: ("dashboard_integral", "subplots", "Dashboard Integral")
+}
+
+
+# Consultas por data_key
+QUERIES = {
+    # Estudiantes (mantener originales)
+    "estudiantes_stats": """
+        SELECT COUNT(*) as total, 
+               COUNT(CASE WHEN activo = 1 THEN 1 END) as activos,
+               COUNT(CASE WHEN beca = 1 THEN 1 END) as con_beca,
+               AVG(edad) as edad_promedio
+        FROM estudiantes WHERE 1 = 1 {filtros}
+    """,
+    
+    "carreras_stats": """
+        SELECT c.nombre as carrera, c.nivel, COUNT(e.id) as total
+        FROM carreras c LEFT JOIN estudiantes e ON c.codigo = e.carrera_codigo {filtros_union}
+        WHERE c.activa = 1 {filtros} GROUP BY c.id ORDER BY total DESC
+    """,
+    
+    "genero_stats": """
+        SELECT CASE WHEN genero = 'M' THEN 'Masculino' 
+                   WHEN genero = 'F' THEN 'Femenino' ELSE 'Otro' END as genero,
+               COUNT(*) as cantidad
+        FROM estudiantes WHERE activo = 1 {filtros} GROUP BY genero
+    """,
+    
+    "edad_stats": """
+        SELECT CASE WHEN edad BETWEEN 17 AND 20 THEN '17-20 años'
+                   WHEN edad BETWEEN 21 AND 25 THEN '21-25 años'
+                   WHEN edad BETWEEN 26 AND 30 THEN '26-30 años'
+                   ELSE 'Más de 30 años' END as rango_edad,
+               COUNT(*) as cantidad
+        FROM estudiantes WHERE activo = 1 {filtros} GROUP BY rango_edad
+    """,
+    
+    "estado_stats": """
+        SELECT estado, COUNT(*) as cantidad
+        FROM estudiantes WHERE activo = 1 AND estado IS NOT NULL {filtros}
+        GROUP BY estado ORDER BY cantidad DESC LIMIT 10
+    """,
+    
+    "activos_stats": """
+        SELECT CASE WHEN activo = 1 THEN 'Activos' ELSE 'Inactivos' END as estado,
+               COUNT(*) as cantidad
+        FROM estudiantes WHERE 1 = 1 {filtros} GROUP BY activo
+    """,
+    
+    "becas_stats": """
+        SELECT CASE WHEN beca = 1 THEN 'Con Beca' ELSE 'Sin Beca' END as estado,
+               COUNT(*) as cantidad
+        FROM estudiantes WHERE 1 = 1 {filtros} GROUP BY beca
+    """,
+    
+    "escuela_stats": """
+        SELECT tipo_escuela, COUNT(*) as cantidad
+        FROM estudiantes WHERE activo = 1 {filtros} GROUP BY tipo_escuela
+    """,
+    
+    "inscripciones_stats": """
+        SELECT periodo_ingreso as periodo, COUNT(*) as cantidad
+        FROM estudiantes WHERE 1 = 1 {filtros}
+        GROUP BY periodo_ingreso ORDER BY periodo DESC LIMIT 10
+    """,
+    
+    "periodo_stats": """
+        SELECT periodo_ingreso as periodo, COUNT(*) as cantidad
+        FROM estudiantes WHERE 1 = 1 {filtros}
+        GROUP BY periodo_ingreso ORDER BY cantidad DESC
+    """,
+    
+    # Académico ACTUALIZADAS
+    "promedios_carrera": """
+        SELECT c.nombre as carrera, AVG(CAST(cal.calificacion_final AS DECIMAL(4,2))) as promedio
+        FROM carreras c JOIN estudiantes e ON c.codigo = e.carrera_codigo
+        JOIN calificaciones cal ON e.id = cal.id_estudiante
+        WHERE c.activa = 1 {filtros} GROUP BY c.id ORDER BY promedio DESC
+    """,
+    
+    "materias_reprobadas": """
+        SELECT m.nombre as materia, COUNT(*) as reprobados
+        FROM calificaciones cal JOIN materias m ON cal.materia_id = m.id
+        WHERE cal.aprobada = 0 {filtros}
+        GROUP BY m.id ORDER BY reprobados DESC LIMIT 10
+    """,
+    
+    "calificaciones_cuatrimestre": """
+        SELECT cuatrimestre, AVG(CAST(calificacion_final AS DECIMAL(4,2))) as promedio
+        FROM calificaciones WHERE 1 = 1 {filtros}
+        GROUP BY cuatrimestre ORDER BY cuatrimestre
+    """,
+    
+    # NUEVAS QUERIES ACTUALIZADAS
+    "modalidad_rendimiento": """
+        SELECT 
+            'Presencial' as modalidad, 85.5 as promedio, 320 as estudiantes
+        UNION ALL
+        SELECT 'En Línea' as modalidad, 82.3 as promedio, 180 as estudiantes
+        UNION ALL
+        SELECT 'Mixta' as modalidad, 83.8 as promedio, 95 as estudiantes
+        UNION ALL
+        SELECT 'Sabatina' as modalidad, 81.2 as promedio, 65 as estudiantes
+    """,
+    
+    "asistencia_calificaciones": """
+        SELECT 
+            ROUND(RAND() * 40 + 60, 1) as asistencia_porcentaje,
+            ROUND(RAND() * 30 + 70, 1) as calificacion_promedio,
+            CONCAT('Estudiante ', ROW_NUMBER() OVER()) as estudiante
+        FROM (
+            SELECT 1 UNION SELECT 2 UNION SELECT 3 UNION SELECT 4 UNION SELECT 5
+            UNION SELECT 6 UNION SELECT 7 UNION SELECT 8 UNION SELECT 9 UNION SELECT 10
+            UNION SELECT 11 UNION SELECT 12 UNION SELECT 13 UNION SELECT 14 UNION SELECT 15
+            UNION SELECT 16 UNION SELECT 17 UNION SELECT 18 UNION SELECT 19 UNION SELECT 20
+        ) as nums
+    """,
+    
+    "profesores_area": """
+        SELECT 
+            'Ingeniería' as area, 28 as cantidad
+        UNION ALL
+        SELECT 'Administración' as area, 15 as cantidad
+        UNION ALL
+        SELECT 'Ciencias Básicas' as area, 12 as cantidad
+        UNION ALL
+        SELECT 'Humanidades' as area, 8 as cantidad
+        UNION ALL
+        SELECT 'Idiomas' as area, 6 as cantidad
+        UNION ALL
+        SELECT 'Deportes' as area, 4 as cantidad
+    """,
+    
+    "capacidad_grupos": """
+    SELECT 
+        'Matemáticas I - Grupo A' as grupo, 28 as ocupacion, 35 as capacidad_maxima, 80.0 as porcentaje_ocupacion
+    UNION ALL
+    SELECT 'Programación - Grupo B' as grupo, 32 as ocupacion, 35 as capacidad_maxima, 91.4 as porcentaje_ocupacion
+    UNION ALL
+    SELECT 'Física I - Grupo A' as grupo, 25 as ocupacion, 30 as capacidad_maxima, 83.3 as porcentaje_ocupacion
+    UNION ALL
+    SELECT 'Química - Grupo C' as grupo, 22 as ocupacion, 25 as capacidad_maxima, 88.0 as porcentaje_ocupacion
+    UNION ALL
+    SELECT 'Inglés I - Grupo D' as grupo, 18 as ocupacion, 20 as capacidad_maxima, 90.0 as porcentaje_ocupacion
+    UNION ALL
+    SELECT 'Base de Datos - Grupo A' as grupo, 30 as ocupacion, 35 as capacidad_maxima, 85.7 as porcentaje_ocupacion
+    UNION ALL
+    SELECT 'Redes - Grupo B' as grupo, 15 as ocupacion, 20 as capacidad_maxima, 75.0 as porcentaje_ocupacion
+""",
+    
+    "aulas_turno": """
+        SELECT 
+            'Matutino' as turno, 18 as ocupadas, 25 as disponibles
+        UNION ALL
+        SELECT 'Vespertino' as turno, 22 as ocupadas, 25 as disponibles
+        UNION ALL
+        SELECT 'Nocturno' as turno, 12 as ocupadas, 25 as disponibles
+        UNION ALL
+        SELECT 'Sabatino' as turno, 8 as ocupadas, 15 as disponibles
+    """,
+    
+    "horarios_preferencias": """
+        SELECT 
+            '07:00-09:00' as horario, 45 as solicitudes
+        UNION ALL
+        SELECT '09:00-11:00' as horario, 78 as solicitudes
+        UNION ALL
+        SELECT '11:00-13:00' as horario, 92 as solicitudes
+        UNION ALL
+        SELECT '13:00-15:00' as horario, 65 as solicitudes
+        UNION ALL
+        SELECT '15:00-17:00' as horario, 58 as solicitudes
+        UNION ALL
+        SELECT '17:00-19:00' as horario, 73 as solicitudes
+        UNION ALL
+        SELECT '19:00-21:00' as horario, 41 as solicitudes
+    """,
+    
+    "rendimiento_cuatrimestre": """
+    SELECT 
+        CONCAT('Cuatrimestre ', c.cuatrimestre) as periodo,
+        AVG(CAST(c.calificacion_final AS DECIMAL(4,2))) as promedio,
+        COUNT(*) as total_calificaciones,
+        COUNT(CASE WHEN c.aprobada = 1 THEN 1 END) as aprobadas,
+        ROUND((COUNT(CASE WHEN c.aprobada = 1 THEN 1 END) * 100.0 / COUNT(*)), 1) as porcentaje_aprobacion
+    FROM calificaciones c
+    WHERE c.calificacion_final IS NOT NULL {filtros}
+    GROUP BY c.cuatrimestre
+    ORDER BY c.cuatrimestre
+""",
+    
+    # Riesgo ACTUALIZADAS
+    "riesgo_stats": """
+        SELECT nivel_riesgo, COUNT(*) as cantidad
+        FROM riesgo_academico WHERE activo = 1 {filtros}
+        GROUP BY nivel_riesgo ORDER BY FIELD(nivel_riesgo, 'Bajo', 'Medio', 'Alto', 'Critico')
+    """,
+    
+    "factores_riesgo_carrera": """
+        SELECT 
+            c.nombre as carrera,
+            COUNT(CASE WHEN r.nivel_riesgo IN ('Alto', 'Critico') THEN 1 END) as alto_riesgo,
+            COUNT(*) as total_estudiantes
+        FROM carreras c 
+        JOIN estudiantes e ON c.codigo = e.carrera_codigo
+        LEFT JOIN riesgo_academico r ON e.id = r.id_estudiante
+        WHERE c.activa = 1 {filtros}
+        GROUP BY c.id
+        ORDER BY alto_riesgo DESC
+    """,
+    
+    "abandono_stats": """
+        SELECT tipo, COUNT(*) as cantidad
+        FROM abandonos GROUP BY tipo ORDER BY cantidad DESC
+    """,
+    
+    "indicadores_alerta": """
+        SELECT 
+            'Inasistencias >30%' as indicador, 23 as casos
+        UNION ALL
+        SELECT 'Reprobación 2+ materias' as indicador, 18 as casos
+        UNION ALL
+        SELECT 'Promedio <70' as indicador, 15 as casos
+        UNION ALL
+        SELECT 'Sin pago 2+ meses' as indicador, 12 as casos
+        UNION ALL
+        SELECT 'Sin actividad plataforma' as indicador, 8 as casos
+    """,
+    
+    "efectividad_intervenciones": """
+        SELECT 
+            'Tutoría Académica' as intervencion, 
+            28 as casos_exitosos, 35 as casos_totales
+        UNION ALL
+        SELECT 'Apoyo Psicológico' as intervencion,
+            15 as casos_exitosos, 22 as casos_totales
+        UNION ALL
+        SELECT 'Beca de Apoyo' as intervencion,
+            18 as casos_exitosos, 20 as casos_totales
+        UNION ALL
+        SELECT 'Flexibilidad Horaria' as intervencion,
+            12 as casos_exitosos, 18 as casos_totales
+    """,
+    
+    # Financiero ACTUALIZADAS
+    "pagos_stats": """
+        SELECT periodo, 
+               SUM(CASE WHEN pagado = 1 THEN 1 ELSE 0 END) as realizados,
+               SUM(CASE WHEN pagado = 0 THEN 1 ELSE 0 END) as pendientes,
+               SUM(monto) as total
+        FROM pagos GROUP BY periodo ORDER BY periodo DESC LIMIT 10
+    """,
+    
+           "morosidad_carrera": """
+    SELECT 
+        'Ingeniería en Sistemas' as carrera, 12 as estudiantes_morosos, 85 as total_estudiantes, 14.1 as porcentaje_morosidad, 45000 as monto_moroso
+    UNION ALL
+    SELECT 'Ingeniería Industrial' as carrera, 8 as estudiantes_morosos, 72 as total_estudiantes, 11.1 as porcentaje_morosidad, 32000 as monto_moroso
+    UNION ALL
+    SELECT 'Ingeniería Mecánica' as carrera, 15 as estudiantes_morosos, 68 as total_estudiantes, 22.1 as porcentaje_morosidad, 58000 as monto_moroso
+    UNION ALL
+    SELECT 'Ingeniería Civil' as carrera, 6 as estudiantes_morosos, 55 as total_estudiantes, 10.9 as porcentaje_morosidad, 24000 as monto_moroso
+    UNION ALL
+    SELECT 'Administración' as carrera, 18 as estudiantes_morosos, 95 as total_estudiantes, 18.9 as porcentaje_morosidad, 67000 as monto_moroso
+""",
+    
+    "inversion_becas": """
+        SELECT 
+            'Excelencia Académica' as tipo_beca, 450000 as monto
+        UNION ALL
+        SELECT 'Situación Económica' as tipo_beca, 680000 as monto
+        UNION ALL
+        SELECT 'Deportiva' as tipo_beca, 180000 as monto
+        UNION ALL
+        SELECT 'Cultural' as tipo_beca, 95000 as monto
+        UNION ALL
+        SELECT 'Convenio Empresarial' as tipo_beca, 320000 as monto
+    """,
+    
+    "diversificacion_ingresos": """
+        SELECT 
+            'Colegiaturas' as fuente, 78.5 as porcentaje
+        UNION ALL
+        SELECT 'Cursos de Educación Continua' as fuente, 12.3 as porcentaje
+        UNION ALL
+        SELECT 'Servicios Tecnológicos' as fuente, 5.8 as porcentaje
+        UNION ALL
+        SELECT 'Consultoría' as fuente, 2.1 as porcentaje
+        UNION ALL
+        SELECT 'Otros' as fuente, 1.3 as porcentaje
+    """,
+    
+    "becas_rendimiento": """
+        SELECT 
+            ROUND(RAND() * 20 + 80, 1) as promedio_academico,
+            ROUND(RAND() * 8000 + 2000, 0) as monto_beca,
+            CONCAT('Estudiante ', ROW_NUMBER() OVER()) as estudiante
+        FROM (
+            SELECT 1 UNION SELECT 2 UNION SELECT 3 UNION SELECT 4 UNION SELECT 5
+            UNION SELECT 6 UNION SELECT 7 UNION SELECT 8 UNION SELECT 9 UNION SELECT 10
+            UNION SELECT 11 UNION SELECT 12 UNION SELECT 13 UNION SELECT 14 UNION SELECT 15
+        ) as nums
+    """,
+    
+    # Egresados ACTUALIZADAS
+    "egresados_stats": """
+        SELECT YEAR(fecha_egreso) as año, COUNT(*) as cantidad,
+               AVG(promedio_general) as promedio
+        FROM egresados GROUP BY YEAR(fecha_egreso) ORDER BY año DESC
+    """,
+    
+    "insercion_laboral": """
+    SELECT 
+        'Ingeniería en Sistemas' as carrera, 45 as total_egresados, 42 as empleados, 3 as desempleados, 28500 as salario_promedio, 93.3 as porcentaje_empleabilidad
+    UNION ALL
+    SELECT 'Ingeniería Industrial' as carrera, 38 as total_egresados, 35 as empleados, 3 as desempleados, 26800 as salario_promedio, 92.1 as porcentaje_empleabilidad
+    UNION ALL
+    SELECT 'Ingeniería Mecánica' as carrera, 32 as total_egresados, 28 as empleados, 4 as desempleados, 25200 as salario_promedio, 87.5 as porcentaje_empleabilidad
+    UNION ALL
+    SELECT 'Ingeniería Civil' as carrera, 28 as total_egresados, 24 as empleados, 4 as desempleados, 24500 as salario_promedio, 85.7 as porcentaje_empleabilidad
+    UNION ALL
+    SELECT 'Administración' as carrera, 52 as total_egresados, 43 as empleados, 9 as desempleados, 18200 as salario_promedio, 82.7 as porcentaje_empleabilidad
+""",
+
+    
+    "analisis_salarial": """
+    SELECT 
+        'Ingeniería' as area, 'Ingeniería en Sistemas' as carrera, 32000 as salario, 'Alto (25K-35K)' as rango_salarial, 18 as tiempo_empleado_meses, 4.2 as satisfaccion_laboral
+    UNION ALL
+    SELECT 'Ingeniería' as area, 'Ingeniería Industrial' as carrera, 28000 as salario, 'Alto (25K-35K)' as rango_salarial, 22 as tiempo_empleado_meses, 4.0 as satisfaccion_laboral
+    UNION ALL
+    SELECT 'Ingeniería' as area, 'Ingeniería Mecánica' as carrera, 26500 as salario, 'Alto (25K-35K)' as rango_salarial, 15 as tiempo_empleado_meses, 3.8 as satisfaccion_laboral
+    UNION ALL
+    SELECT 'Ingeniería' as area, 'Ingeniería Civil' as carrera, 25000 as salario, 'Medio (15K-25K)' as rango_salarial, 20 as tiempo_empleado_meses, 3.9 as satisfaccion_laboral
+    UNION ALL
+    SELECT 'Administración' as area, 'Licenciatura en Administración' as carrera, 18000 as salario, 'Medio (15K-25K)' as rango_salarial, 12 as tiempo_empleado_meses, 3.5 as satisfaccion_laboral
+    UNION ALL
+    SELECT 'Ingeniería' as area, 'Ingeniería en Sistemas' as carrera, 35000 as salario, 'Alto (25K-35K)' as rango_salarial, 36 as tiempo_empleado_meses, 4.5 as satisfaccion_laboral
+    UNION ALL
+    SELECT 'Ingeniería' as area, 'Ingeniería Industrial' as carrera, 22000 as salario, 'Medio (15K-25K)' as rango_salarial, 8 as tiempo_empleado_meses, 3.7 as satisfaccion_laboral
+    UNION ALL
+    SELECT 'Administración' as area, 'Licenciatura en Administración' as carrera, 16500 as salario, 'Medio (15K-25K)' as rango_salarial, 14 as tiempo_empleado_meses, 3.3 as satisfaccion_laboral
+    UNION ALL
+    SELECT 'Ingeniería' as area, 'Ingeniería Mecánica' as carrera, 29000 as salario, 'Alto (25K-35K)' as rango_salarial, 28 as tiempo_empleado_meses, 4.1 as satisfaccion_laboral
+    UNION ALL
+    SELECT 'Administración' as area, 'Licenciatura en Administración' as carrera, 24000 as salario, 'Medio (15K-25K)' as rango_salarial, 30 as tiempo_empleado_meses, 4.0 as satisfaccion_laboral
+""",
+    "evaluacion_institucional": """
+        SELECT 
+            'Calidad Educativa' as aspecto, 4.2 as calificacion
+        UNION ALL
+        SELECT 'Instalaciones' as aspecto, 3.8 as calificacion
+        UNION ALL
+        SELECT 'Profesores' as aspecto, 4.5 as calificacion
+        UNION ALL
+        SELECT 'Servicios Estudiantiles' as aspecto, 3.9 as calificacion
+        UNION ALL
+        SELECT 'Empleabilidad' as aspecto, 4.1 as calificacion
+        UNION ALL
+        SELECT 'Recomendaría la Institución' as aspecto, 4.3 as calificacion
+    """,
+    
+           "eficiencia_terminal": """
+    SELECT 
+        'Ingeniería en Sistemas' as carrera, 36 as duracion_meses_teorica, 45 as total_egresados, 32 as egresados_tiempo_regular, 42.5 as promedio_meses_reales, 71.1 as eficiencia_porcentaje
+    UNION ALL
+    SELECT 'Ingeniería Industrial' as carrera, 36 as duracion_meses_teorica, 38 as total_egresados, 28 as egresados_tiempo_regular, 40.2 as promedio_meses_reales, 73.7 as eficiencia_porcentaje
+    UNION ALL
+    SELECT 'Ingeniería Mecánica' as carrera, 36 as duracion_meses_teorica, 32 as total_egresados, 20 as egresados_tiempo_regular, 45.8 as promedio_meses_reales, 62.5 as eficiencia_porcentaje
+    UNION ALL
+    SELECT 'Ingeniería Civil' as carrera, 40 as duracion_meses_teorica, 28 as total_egresados, 18 as egresados_tiempo_regular, 48.3 as promedio_meses_reales, 64.3 as eficiencia_porcentaje
+    UNION ALL
+    SELECT 'Administración' as carrera, 32 as duracion_meses_teorica, 52 as total_egresados, 42 as egresados_tiempo_regular, 35.8 as promedio_meses_reales, 80.8 as eficiencia_porcentaje
+""",
+    
+    # Recursos ACTUALIZADAS
+    "recursos_stats": """
+        SELECT recurso, COUNT(*) as usos, AVG(duracion_minutos) as duracion
+        FROM uso_recursos GROUP BY recurso ORDER BY usos DESC LIMIT 10
+    """,
+    
+    "laboratorios_area": """
+        SELECT 
+            'Lab. Cómputo' as laboratorio, 245 as horas_uso, 320 as horas_disponibles
+        UNION ALL
+        SELECT 'Lab. Electrónica' as laboratorio, 180 as horas_uso, 280 as horas_disponibles
+        UNION ALL
+        SELECT 'Lab. Química' as laboratorio, 95 as horas_uso, 200 as horas_disponibles
+        UNION ALL
+        SELECT 'Lab. Física' as laboratorio, 120 as horas_uso, 240 as horas_disponibles
+        UNION ALL
+        SELECT 'Lab. Mecánica' as laboratorio, 85 as horas_uso, 160 as horas_disponibles
+        UNION ALL
+        SELECT 'Lab. Redes' as laboratorio, 160 as horas_uso, 200 as horas_disponibles
+    """,
+    
+    "recursos_tecnologicos": """
+        SELECT 
+            'Computadoras' as recurso, 180 as cantidad
+        UNION ALL
+        SELECT 'Proyectores' as recurso, 45 as cantidad
+        UNION ALL
+        SELECT 'Impresoras' as recurso, 25 as cantidad
+        UNION ALL
+        SELECT 'Tablets' as recurso, 30 as cantidad
+        UNION ALL
+        SELECT 'Equipos Audio/Video' as recurso, 15 as cantidad
+        UNION ALL
+        SELECT 'Servidores' as recurso, 8 as cantidad
+    """,
+    
+    "patrones_uso_semanal": """
+        SELECT 
+            'Lunes' as dia, 78 as ocupacion_porcentaje
+        UNION ALL
+        SELECT 'Martes' as dia, 85 as ocupacion_porcentaje
+        UNION ALL
+        SELECT 'Miércoles' as dia, 92 as ocupacion_porcentaje
+        UNION ALL
+        SELECT 'Jueves' as dia, 88 as ocupacion_porcentaje
+        UNION ALL
+        SELECT 'Viernes' as dia, 82 as ocupacion_porcentaje
+        UNION ALL
+        SELECT 'Sábado' as dia, 45 as ocupacion_porcentaje
+        UNION ALL
+        SELECT 'Domingo' as dia, 12 as ocupacion_porcentaje
+    """,
+    
+    # Agregación fusionada: un solo recorrido de estudiantes para los dashboards
+    # 1 y 3-10 (ver FUSED_ESTUDIANTES_KEYS y dashboards/fused.py)
+    "estudiantes_cubo": """
+        SELECT activo, beca, genero, estado, tipo_escuela, periodo_ingreso,
+               CASE WHEN edad BETWEEN 17 AND 20 THEN '17-20 años'
+                    WHEN edad BETWEEN 21 AND 25 THEN '21-25 años'
+                    WHEN edad BETWEEN 26 AND 30 THEN '26-30 años'
+                    ELSE 'Más de 30 años' END as rango_edad,
+               COUNT(*) as cantidad,
+               COUNT(edad) as con_edad,
+               SUM(edad) as suma_edad
+        FROM estudiantes WHERE 1 = 1 {filtros}
+        GROUP BY activo, beca, genero, estado, tipo_escuela, periodo_ingreso, rango_edad
+    """
+}
+
+# Variantes que leen de las tablas resumen (dashboards/summaries.py) cuando
+# USE_SUMMARY_TABLES está activo; devuelven las mismas columnas que QUERIES
+SUMMARY_QUERIES = {
+    "promedios_carrera": """
+        SELECT c.nombre as carrera,
+               SUM(r.suma_calificacion) / NULLIF(SUM(r.num_calificaciones), 0) as promedio
+        FROM carreras c JOIN resumen_calificaciones r ON c.codigo = r.carrera_codigo
+        WHERE c.activa = 1 {filtros} GROUP BY c.id ORDER BY promedio DESC
+    """,
+    
+    "calificaciones_cuatrimestre": """
+        SELECT cuatrimestre,
+               SUM(suma_calificacion) / NULLIF(SUM(num_calificaciones), 0) as promedio
+        FROM resumen_calificaciones WHERE 1 = 1 {filtros}
+        GROUP BY cuatrimestre ORDER BY cuatrimestre
+    """,
+    
+    "rendimiento_cuatrimestre": """
+        SELECT 
+            CONCAT('Cuatrimestre ', cuatrimestre) as periodo,
+            SUM(suma_calificacion) / NULLIF(SUM(num_calificaciones), 0) as promedio,
+            SUM(num_calificaciones) as total_calificaciones,
+            SUM(aprobadas) as aprobadas,
+            ROUND(SUM(aprobadas) * 100.0 / NULLIF(SUM(num_calificaciones), 0), 1) as porcentaje_aprobacion
+        FROM resumen_calificaciones
+        WHERE num_calificaciones > 0 {filtros}
+        GROUP BY cuatrimestre
+        ORDER BY cuatrimestre
+    """,
+    
+    "factores_riesgo_carrera": """
+        SELECT 
+            c.nombre as carrera,
+            SUM(r.alto_riesgo) as alto_riesgo,
+            SUM(r.total_estudiantes) as total_estudiantes
+        FROM carreras c
+        JOIN resumen_riesgo r ON c.codigo = r.carrera_codigo
+        WHERE c.activa = 1 {filtros}
+        GROUP BY c.id
+        ORDER BY alto_riesgo DESC
+    """,
+}
+
+# data_keys que se derivan de "estudiantes_cubo" cuando FUSED_ESTUDIANTES está activo
+FUSED_ESTUDIANTES_KEYS = frozenset({
+    "estudiantes_stats",
+    "genero_stats",
+    "edad_stats",
+    "estado_stats",
+    "activos_stats",
+    "becas_stats",
+    "escuela_stats",
+    "inscripciones_stats",
+    "periodo_stats",
+})
+
+
+# TTL (segundos) por data_key; el resto usa CACHE_DEFAULT_TTL. Las consultas de
+# esta lista devuelven valores fijos escritos en el SQL (no cambian entre
+# despliegues), así que se cachean un día completo. Las que generan una muestra
+# con RAND() (asistencia_calificaciones, becas_rendimiento) usan el TTL por defecto
+DATA_TTLS = {
+    "modalidad_rendimiento": 86400,
+    "profesores_area": 86400,
+    "capacidad_grupos": 86400,
+    "aulas_turno": 86400,
+    "horarios_preferencias": 86400,
+    "indicadores_alerta": 86400,
+    "efectividad_intervenciones": 86400,
+    "morosidad_carrera": 86400,
+    "inversion_becas": 86400,
+    "diversificacion_ingresos": 86400,
+    "insercion_laboral": 86400,
+    "analisis_salarial": 86400,
+    "evaluacion_institucional": 86400,
+    "eficiencia_terminal": 86400,
+    "laboratorios_area": 86400,
+    "recursos_tecnologicos": 86400,
+    "patrones_uso_semanal": 86400,
+}
+
+
+# Condiciones por dimensión de filtro sobre la tabla estudiantes; cada una
+# recibe exactamente un parámetro (el valor elegido en el panel de filtros)
+ESTUDIANTES_FILTERS = {
+    "carrera": "carrera_codigo = %s",
+    "periodo": "periodo_ingreso = %s",
+    "genero": "genero = %s",
+}
+
+
+def _joined_student_filters(alias, carrera_column=None):
+    """Filtros para consultas que unen estudiantes con el alias indicado"""
+    conditions = {dimension: f"{alias}.{condition}" for dimension, condition in ESTUDIANTES_FILTERS.items()}
+    if carrera_column:
+        conditions["carrera"] = f"{carrera_column} = %s"
+    return conditions
+
+
+# Dimensiones de filtro que admite cada consulta. El SQL marca con {filtros} el
+# punto donde se agregan las condiciones; las consultas que no aparecen aquí ni
+# en STUDENT_SUBQUERY_FILTERS (datos fijos o tablas sin relación con
+# estudiantes) ignoran los filtros
+QUERY_FILTERS = {
+    "estudiantes_stats": ESTUDIANTES_FILTERS,
+    "carreras_stats": _joined_student_filters("e", carrera_column="c.codigo"),
+    "genero_stats": ESTUDIANTES_FILTERS,
+    "edad_stats": ESTUDIANTES_FILTERS,
+    "estado_stats": ESTUDIANTES_FILTERS,
+    "activos_stats": ESTUDIANTES_FILTERS,
+    "becas_stats": ESTUDIANTES_FILTERS,
+    "escuela_stats": ESTUDIANTES_FILTERS,
+    "inscripciones_stats": ESTUDIANTES_FILTERS,
+    "periodo_stats": ESTUDIANTES_FILTERS,
+    "estudiantes_cubo": ESTUDIANTES_FILTERS,
+    "promedios_carrera": _joined_student_filters("e", carrera_column="c.codigo"),
+    "factores_riesgo_carrera": _joined_student_filters("e", carrera_column="c.codigo"),
+}
+
+# Las tablas resumen ya tienen las tres dimensiones como columnas
+SUMMARY_QUERY_FILTERS = {
+    "promedios_carrera": _joined_student_filters("r"),
+    "calificaciones_cuatrimestre": ESTUDIANTES_FILTERS,
+    "rendimiento_cuatrimestre": ESTUDIANTES_FILTERS,
+    "factores_riesgo_carrera": _joined_student_filters("r"),
+}
+
+# Consultas sobre tablas que solo guardan el id del estudiante: los filtros se
+# combinan en un único "columna IN (SELECT id FROM estudiantes WHERE ...)"
+STUDENT_SUBQUERY_FILTERS = {
+    "materias_reprobadas": "cal.id_estudiante",
+    "calificaciones_cuatrimestre": "id_estudiante",
+    "rendimiento_cuatrimestre": "c.id_estudiante",
+    "riesgo_stats": "id_estudiante",
+}
+
+# Consultas con LEFT JOIN a estudiantes: las condiciones de estas dimensiones van
+# en el ON ({filtros_union}); en el WHERE convertirían la unión en un JOIN y
+# desaparecerían las carreras sin estudiantes que coincidan con el filtro
+LEFT_JOIN_FILTERS = {
+    "carreras_stats": ("periodo", "genero"),
+}
+
+
+def _filter_conditions(data_key, use_summaries=False):
+    if use_summaries and data_key in SUMMARY_QUERY_FILTERS:
+        return SUMMARY_QUERY_FILTERS[data_key]
+    if data_key in STUDENT_SUBQUERY_FILTERS:
+        return ESTUDIANTES_FILTERS
+    return QUERY_FILTERS.get(data_key, {})
+
+
+def build_filter_clause(data_key, filters, use_summaries=False):
+    """Devuelve (condiciones " AND ...", parámetros) para los filtros que admite la consulta"""
+    use_summaries = use_summaries and data_key in SUMMARY_QUERIES
+    conditions = []
+    params = []
+    for dimension, condition in _filter_conditions(data_key, use_summaries).items():
+        value = filters.get(dimension) if filters else None
+        if value:
+            conditions.append(condition)
+            params.append(value)
+    if not conditions:
+        return "", ()
+    
+    if data_key in STUDENT_SUBQUERY_FILTERS and not use_summaries:
+        column = STUDENT_SUBQUERY_FILTERS[data_key]
+        conditions = [f"{column} IN (SELECT id FROM estudiantes WHERE {' AND '.join(conditions)})"]
+    return "".join(f" AND {condition}" for condition in conditions), tuple(params)
+
+
+def supported_filters(data_key, filters):
+    """Subconjunto de los filtros que realmente afectan a la consulta"""
+    dimensions = _filter_conditions(data_key)
+    return {key: value for key, value in (filters or {}).items() if key in dimensions}
+
+
+def _build_registry():
+    """Construye una sola vez el índice id -> definición completa del dashboard"""
+    dashboards = []
+    by_id = {}
+    by_category = {}
+    dashboard_id = 1
+    for category, items in CATEGORIES.items():
+        for name, description in items:
+            info = {
+                "id": dashboard_id,
+                "name": name,
+                "category": category,
+                "description": description
+            }
+            entry = {"info": info, "data_key": None, "chart_type": None, "title": name,
+                     "sql": None, "summary_sql": None, "filters": (), "ttl": None}
+            if dashboard_id in DASHBOARD_CONFIGS:
+                data_key, chart_type, title = DASHBOARD_CONFIGS[dashboard_id]
+                entry.update({
+                    "data_key": data_key,
+                    "chart_type": chart_type,
+                    "title": title,
+                    "sql": QUERIES.get(data_key, "SELECT 1 as placeholder"),
+                    "summary_sql": SUMMARY_QUERIES.get(data_key),
+                    "filters": tuple(_filter_conditions(data_key)),
+                    "ttl": DATA_TTLS.get(data_key, Config.CACHE_DEFAULT_TTL),
+                })
+            dashboards.append(info)
+            by_id[dashboard_id] = entry
+            by_category.setdefault(category, []).append(info)
+            dashboard_id += 1
+    return dashboards, by_id, by_category
+
+
+# Lista pública (la que devuelve /api/dashboards/list) e índices de búsqueda O(1)
+DASHBOARDS, DASHBOARDS_BY_ID, DASHBOARDS_BY_CATEGORY = _build_registry()
+
+
+def get_dashboard(dashboard_id):
+    """Definición completa de un dashboard, o None si no existe"""
+    return DASHBOARDS_BY_ID.get(dashboard_id)
+
+
+def get_dashboard_info(dashboard_id):
+    entry = DASHBOARDS_BY_ID.get(dashboard_id)
+    return entry["info"] if entry else None
+
+
+def get_category_dashboards(category):
+    return DASHBOARDS_BY_CATEGORY.get(category, [])
+
+
+def build_query(data_key, filters=None, use_summaries=False):
+    """Devuelve (sql, params) de un data_key con los filtros admitidos aplicados"""
+    if use_summaries and data_key in SUMMARY_QUERIES:
+        base_query = SUMMARY_QUERIES[data_key]
+    else:
+        base_query = QUERIES.get(data_key, "SELECT 1 as placeholder")
+    
+    # Aplicar filtros como condiciones parametrizadas en el WHERE (y en el ON de los LEFT JOIN)
+    join_dimensions = LEFT_JOIN_FILTERS.get(data_key, ())
+    filters = filters or {}
+    join_clause, join_params = build_filter_clause(
+        data_key, {key: value for key, value in filters.items() if key in join_dimensions}, use_summaries
+    )
+    clause, params = build_filter_clause(
+        data_key, {key: value for key, value in filters.items() if key not in join_dimensions}, use_summaries
+    )
+    # El ON va antes que el WHERE en el SQL, así que sus parámetros también
+    query = base_query.replace("{filtros_union}", join_clause).replace("{filtros}", clause)
+    return query, join_params + params
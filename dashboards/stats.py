@@ -0,0 +1,160 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+from config import Config
+
+
+# Un solo recorrido de estudiantes para los dos contadores que salen de ella;
+# el resto son conteos de una tabla cada uno
+SUMMARY_QUERY = """
+    SELECT
+        COUNT(CASE WHEN activo = 1 THEN 1 END) as estudiantes_activos,
+        (SELECT COUNT(*) FROM carreras WHERE activa = 1) as carreras_activas,
+        (SELECT COUNT(*) FROM calificaciones) as total_calificaciones,
+        (SELECT COUNT(*) FROM egresados) as total_egresados,
+        COUNT(CASE WHEN beca = 1 THEN 1 END) as estudiantes_con_beca
+    FROM estudiantes
+"""
+
+# Cómo afecta una fila de cada tabla a los contadores: contador -> condición sobre la fila
+COUNTER_RULES = {
+    "estudiantes": {
+        "estudiantes_activos": lambda row: _flag(row, "activo"),
+        "estudiantes_con_beca": lambda row: _flag(row, "beca"),
+    },
+    "carreras": {
+        "carreras_activas": lambda row: _flag(row, "activa"),
+    },
+    "calificaciones": {
+        "total_calificaciones": lambda row: True,
+    },
+    "egresados": {
+        "total_egresados": lambda row: True,
+    },
+}
+
+
+def _flag(row, column):
+    return str(row.get(column)) in ("1", "True", "true")
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def validate_changes(changes):
+    """Comprueba la forma de [{"tabla", "antes", "despues"}]; lanza ValueError si no es válida"""
+    if not isinstance(changes, list):
+        raise ValueError("Se esperaba una lista de cambios")
+    for index, change in enumerate(changes):
+        if not isinstance(change, dict):
+            raise ValueError(f"Cambio {index}: se esperaba un objeto")
+        if change.get("tabla") not in COUNTER_RULES:
+            raise ValueError(f"Cambio {index}: tabla no soportada: {change.get('tabla')}")
+        before, after = change.get("antes"), change.get("despues")
+        if not all(row is None or isinstance(row, dict) for row in (before, after)):
+            raise ValueError(f"Cambio {index}: \"antes\" y \"despues\" deben ser objetos o null")
+        if before is None and after is None:
+            raise ValueError(f"Cambio {index}: falta \"antes\" o \"despues\"")
+
+
+def counter_deltas(table, before=None, after=None):
+    """Traduce un cambio de fila (antes/después, None en altas y bajas) a deltas de contadores"""
+    deltas = {}
+    for counter, matches in COUNTER_RULES.get(table, {}).items():
+        delta = int(bool(after is not None and matches(after))) - int(bool(before is not None and matches(before)))
+        if delta:
+            deltas[counter] = delta
+    return deltas
+
+
+class SummaryStats:
+    """Contadores de /api/stats/summary servidos desde memoria.
+
+    Se recuentan con SUMMARY_QUERY cada STATS_RECOUNT_INTERVAL (sirviendo la
+    versión anterior mientras tanto) y, entre recuentos, se mantienen con los
+    cambios de filas que se reportan a apply_changes(). Así la petición es O(1)
+    aunque crezcan las tablas, y el recuento periódico corrige cualquier
+    cambio que no se haya reportado. generated_at es siempre la hora del
+    último recuento real.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._summary = None
+        self._generated_at = None
+        self._counted_at = 0.0
+        self._lock = threading.Lock()
+        self._first_load = threading.Lock()
+        self._recounting = False
+        # Cambios [(reportado_en, deltas)] llegados durante un recuento; se
+        # reaplican sobre su resultado los que llegaron después de empezar la consulta
+        self._pending = None
+
+    def recount(self):
+        """Recuenta todo desde la base; devuelve True si se obtuvo un resultado"""
+        with self._lock:
+            self._pending = []
+        # Lo reportado antes de este punto ya está en la base y lo ve la consulta
+        started = time.monotonic()
+        rows = self.db.execute_query(SUMMARY_QUERY)
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._recounting = False
+            if not rows:
+                return False
+            summary = {key: int(value or 0) for key, value in rows[0].items()}
+            for reported_at, deltas in pending:
+                if reported_at < started:
+                    continue
+                for counter, delta in deltas.items():
+                    summary[counter] = summary.get(counter, 0) + delta
+            self._summary = summary
+            self._generated_at = _timestamp()
+            self._counted_at = time.monotonic()
+            return True
+
+    def _recount_in_background(self):
+        with self._lock:
+            if self._recounting:
+                return
+            self._recounting = True
+        threading.Thread(target=self.recount, name="summary-stats-recount", daemon=True).start()
+
+    def get(self):
+        """Devuelve {"summary", "generated_at"} o None si nunca se pudo contar"""
+        with self._lock:
+            loaded = self._summary is not None
+            stale = time.monotonic() - self._counted_at >= Config.STATS_RECOUNT_INTERVAL
+        if not loaded:
+            with self._first_load:
+                if self._summary is None:
+                    self.recount()
+        elif stale:
+            self._recount_in_background()
+        with self._lock:
+            if self._summary is None:
+                return None
+            return {"summary": dict(self._summary), "generated_at": self._generated_at}
+
+    def apply_changes(self, changes):
+        """Aplica cambios de filas [{"tabla", "antes", "despues"}]; devuelve los deltas sumados.
+
+        Lanza ValueError si algún cambio no tiene la forma esperada (no se aplica ninguno).
+        """
+        validate_changes(changes)
+        totals = {}
+        for change in changes:
+            deltas = counter_deltas(change.get("tabla"), change.get("antes"), change.get("despues"))
+            for counter, delta in deltas.items():
+                totals[counter] = totals.get(counter, 0) + delta
+        if not totals:
+            return totals
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((time.monotonic(), totals))
+            if self._summary is not None:
+                for counter, delta in totals.items():
+                    self._summary[counter] = self._summary.get(counter, 0) + delta
+        return totals
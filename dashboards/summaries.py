@@ -0,0 +1,230 @@
+import threading
+import time
+from datetime import timedelta
+
+from config import Config
+
+
+# Tablas resumen por carrera × periodo de ingreso × género. Las consultas de
+# SUMMARY_QUERIES (registry.py) leen de aquí en lugar de unir calificaciones y
+# riesgo_academico con estudiantes en cada petición
+SUMMARY_TABLES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS resumen_calificaciones (
+        carrera_codigo VARCHAR(50) NULL,
+        periodo_ingreso VARCHAR(50) NULL,
+        genero VARCHAR(20) NULL,
+        cuatrimestre INT NULL,
+        suma_calificacion DECIMAL(16,2) NOT NULL DEFAULT 0,
+        num_calificaciones INT NOT NULL DEFAULT 0,
+        aprobadas INT NOT NULL DEFAULT 0,
+        KEY idx_resumen_calificaciones (carrera_codigo, periodo_ingreso, genero)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resumen_riesgo (
+        carrera_codigo VARCHAR(50) NULL,
+        periodo_ingreso VARCHAR(50) NULL,
+        genero VARCHAR(20) NULL,
+        alto_riesgo INT NOT NULL DEFAULT 0,
+        total_estudiantes INT NOT NULL DEFAULT 0,
+        KEY idx_resumen_riesgo (carrera_codigo, periodo_ingreso, genero)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resumen_control (
+        tabla VARCHAR(64) PRIMARY KEY,
+        ultima_actualizacion DATETIME NULL,
+        refrescado_en DATETIME NULL
+    )
+    """,
+]
+
+# num_calificaciones y aprobadas solo cuentan calificaciones con valor final,
+# igual que las consultas originales; el LEFT JOIN conserva las calificaciones
+# sin estudiante para que los totales sin filtros coincidan
+_CALIFICACIONES_SELECT = """
+    SELECT e.carrera_codigo, e.periodo_ingreso, e.genero, cal.cuatrimestre,
+           COALESCE(SUM(CAST(cal.calificacion_final AS DECIMAL(4,2))), 0),
+           COUNT(cal.calificacion_final),
+           COUNT(CASE WHEN cal.aprobada = 1 AND cal.calificacion_final IS NOT NULL THEN 1 END)
+    FROM calificaciones cal LEFT JOIN estudiantes e ON e.id = cal.id_estudiante
+    {where}
+    GROUP BY e.carrera_codigo, e.periodo_ingreso, e.genero, cal.cuatrimestre
+"""
+
+_RIESGO_SELECT = """
+    SELECT e.carrera_codigo, e.periodo_ingreso, e.genero,
+           COUNT(CASE WHEN r.nivel_riesgo IN ('Alto', 'Critico') THEN 1 END),
+           COUNT(*)
+    FROM estudiantes e LEFT JOIN riesgo_academico r ON e.id = r.id_estudiante
+    {where}
+    GROUP BY e.carrera_codigo, e.periodo_ingreso, e.genero
+"""
+
+_INSERT_CALIFICACIONES = """
+    INSERT INTO resumen_calificaciones
+        (carrera_codigo, periodo_ingreso, genero, cuatrimestre,
+         suma_calificacion, num_calificaciones, aprobadas)
+"""
+
+_INSERT_RIESGO = """
+    INSERT INTO resumen_riesgo
+        (carrera_codigo, periodo_ingreso, genero, alto_riesgo, total_estudiantes)
+"""
+
+# Comparación con <=> para que los NULL de una dimensión formen su propio grupo
+_SLICE_WHERE = "WHERE e.carrera_codigo <=> %s AND e.periodo_ingreso <=> %s AND e.genero <=> %s"
+_SLICE_DELETE = "WHERE carrera_codigo <=> %s AND periodo_ingreso <=> %s AND genero <=> %s"
+
+# Grupos carrera × periodo × género con cambios desde la marca de agua
+_CHANGED_SLICES = """
+    SELECT DISTINCT e.carrera_codigo, e.periodo_ingreso, e.genero
+    FROM estudiantes e
+    WHERE e.{col} >= %s
+       OR e.id IN (SELECT id_estudiante FROM calificaciones WHERE {col} >= %s)
+       OR e.id IN (SELECT id_estudiante FROM riesgo_academico WHERE {col} >= %s)
+"""
+
+_CONTROL_KEY = "resumenes"
+
+
+class SummaryRefresher:
+    """Mantiene las tablas resumen a partir de las marcas de tiempo de cambio.
+
+    El refresco incremental recalcula solo los grupos carrera × periodo × género
+    que tienen filas con SUMMARY_CHANGE_COLUMN posterior a la última marca de
+    agua. Las filas borradas y los estudiantes que cambian de grupo no dejan
+    rastro en esas columnas, así que cada SUMMARY_FULL_REFRESH_INTERVAL se
+    reconstruye todo.
+    """
+
+    def __init__(self, db, on_refresh=None):
+        self.db = db
+        self.on_refresh = on_refresh
+        self._tables_ready = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_full = time.monotonic()
+        self.last_result = None
+
+    def ensure_tables(self):
+        if not self._tables_ready:
+            self._tables_ready = self.db.execute_transaction((ddl, None) for ddl in SUMMARY_TABLES_DDL)
+        return self._tables_ready
+
+    def _get_watermark(self):
+        rows = self.db.execute_query(
+            "SELECT ultima_actualizacion FROM resumen_control WHERE tabla = %s", (_CONTROL_KEY,)
+        )
+        return rows[0]["ultima_actualizacion"] if rows else None
+
+    def _control_statement(self, new_mark):
+        return ("""
+            INSERT INTO resumen_control (tabla, ultima_actualizacion, refrescado_en)
+            VALUES (%s, %s, NOW())
+            ON DUPLICATE KEY UPDATE ultima_actualizacion = VALUES(ultima_actualizacion),
+                                    refrescado_en = VALUES(refrescado_en)
+        """, (_CONTROL_KEY, new_mark))
+
+    def _full_statements(self, new_mark):
+        yield "DELETE FROM resumen_calificaciones", None
+        yield _INSERT_CALIFICACIONES + _CALIFICACIONES_SELECT.format(where=""), None
+        yield "DELETE FROM resumen_riesgo", None
+        yield _INSERT_RIESGO + _RIESGO_SELECT.format(where=""), None
+        yield self._control_statement(new_mark)
+
+    def _slice_statements(self, slices, new_mark):
+        for row in slices:
+            params = (row["carrera_codigo"], row["periodo_ingreso"], row["genero"])
+            yield "DELETE FROM resumen_calificaciones " + _SLICE_DELETE, params
+            yield _INSERT_CALIFICACIONES + _CALIFICACIONES_SELECT.format(where=_SLICE_WHERE), params
+            yield "DELETE FROM resumen_riesgo " + _SLICE_DELETE, params
+            yield _INSERT_RIESGO + _RIESGO_SELECT.format(where=_SLICE_WHERE), params
+        yield self._control_statement(new_mark)
+
+    def _changed_slices(self, since):
+        """Grupos con cambios desde since, o None si la consulta falla.
+        
+        Se lee con stream_query, que lanza la excepción: execute_query devuelve
+        [] ante un error (p. ej. si no existe SUMMARY_CHANGE_COLUMN) y eso no se
+        distingue de "sin cambios", que avanzaría la marca de agua sin refrescar.
+        """
+        query = _CHANGED_SLICES.format(col=Config.SUMMARY_CHANGE_COLUMN)
+        try:
+            stream = self.db.stream_query(query, (since, since, since))
+            columns = next(stream)
+            return [dict(zip(columns, row)) for rows in stream for row in rows]
+        except Exception as e:
+            print(f"Error buscando cambios para las tablas resumen, se reconstruyen completas: {e}")
+            return None
+
+    def refresh(self, full=False):
+        """Refresca las tablas resumen; devuelve un dict con lo que se hizo"""
+        with self._lock:
+            start = time.perf_counter()
+            if not self.ensure_tables():
+                return {"ok": False, "mode": None, "error": "No se pudieron crear las tablas resumen"}
+
+            now_rows = self.db.execute_query("SELECT NOW() as ahora")
+            if not now_rows:
+                return {"ok": False, "mode": None, "error": "Sin conexión a la base de datos"}
+            new_mark = now_rows[0]["ahora"]
+
+            watermark = None if full else self._get_watermark()
+            slices = None
+            if watermark is not None:
+                # Solapamiento para no perder filas confirmadas con una marca anterior
+                since = watermark - timedelta(seconds=Config.SUMMARY_WATERMARK_OVERLAP)
+                slices = self._changed_slices(since)
+                if slices is not None and len(slices) > Config.SUMMARY_MAX_INCREMENTAL_SLICES:
+                    slices = None
+
+            if slices is None:
+                mode = "full"
+                ok = self.db.execute_transaction(self._full_statements(new_mark))
+                if ok:
+                    self._last_full = time.monotonic()
+            else:
+                mode = "incremental"
+                ok = self.db.execute_transaction(self._slice_statements(slices, new_mark))
+
+            self.last_result = {
+                "ok": ok,
+                "mode": mode,
+                "slices": len(slices) if slices is not None else None,
+                "seconds": round(time.perf_counter() - start, 3),
+                "watermark": str(new_mark),
+            }
+            if ok and self.on_refresh is not None:
+                self.on_refresh()
+            return self.last_result
+
+    def _run(self):
+        while not self._stop.is_set():
+            due_full = time.monotonic() - self._last_full >= Config.SUMMARY_FULL_REFRESH_INTERVAL
+            try:
+                self.refresh(full=due_full)
+            except Exception as e:
+                print(f"Error refrescando tablas resumen: {e}")
+            self._stop.wait(Config.SUMMARY_REFRESH_INTERVAL)
+
+    def start(self):
+        """Arranca el refresco periódico en un hilo de fondo"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="summary-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+if __name__ == '__main__':
+    import sys
+    from database import Database
+
+    # python -m dashboards.summaries [--completo]
+    result = SummaryRefresher(Database()).refresh(full='--completo' in sys.argv)
+    print(result)
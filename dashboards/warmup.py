@@ -0,0 +1,160 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from config import Config
+from dashboards.registry import DASHBOARDS, get_dashboard, supported_filters
+
+
+def filter_combinations(catalog, limit=None):
+    """Combinaciones de filtros a precalentar a partir del catálogo de /api/filters.
+
+    Primero sin filtros (la portada), luego cada filtro suelto: géneros, los
+    WARMUP_RECENT_PERIODS períodos más recientes y las carreras; se cortan en
+    `limit` combinaciones (WARMUP_MAX_COMBINATIONS por defecto).
+    """
+    limit = Config.WARMUP_MAX_COMBINATIONS if limit is None else limit
+    catalog = catalog or {}
+    combinations = [{}]
+    combinations += [{"genero": row["genero"]} for row in catalog.get("generos", [])]
+    combinations += [{"periodo": row["periodo_ingreso"]}
+                     for row in catalog.get("periodos", [])[:Config.WARMUP_RECENT_PERIODS]]
+    combinations += [{"carrera": row["codigo"]} for row in catalog.get("carreras", [])]
+    return combinations[:limit]
+
+
+def warmup_plan(combinations, dashboard_infos=None):
+    """Pares (dashboard_id, filtros) a generar.
+
+    Con filtros se omiten los dashboards a los que no les afectan: su entrada
+    de cache es la misma que sin filtros y ya se calentó.
+    """
+    for filters in combinations:
+        for info in dashboard_infos or DASHBOARDS:
+            data_key = get_dashboard(info["id"])["data_key"]
+            if filters and (not data_key or not supported_filters(data_key, filters)):
+                continue
+            yield info["id"], filters
+
+
+def warm_up(generate, combinations, dashboard_infos=None, workers=None):
+    """Ejecuta generate(dashboard_id, filtros) para todo el plan y mide cada llamada.
+
+    generate devuelve True si el dashboard quedó generado sin error. Devuelve
+    el reporte: totales y, por dashboard, combinaciones, tiempo total, el más
+    lento y errores.
+    """
+    workers = workers or Config.WARMUP_WORKERS
+    plan = list(warmup_plan(combinations, dashboard_infos))
+
+    def run(item):
+        dashboard_id, filters = item
+        start = time.perf_counter()
+        try:
+            ok = generate(dashboard_id, filters)
+        except Exception as e:
+            print(f"Error precalentando el dashboard {dashboard_id} {filters}: {e}")
+            ok = False
+        return dashboard_id, time.perf_counter() - start, ok
+
+    start = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup") as executor:
+            timings = list(executor.map(run, plan))
+    else:
+        timings = [run(item) for item in plan]
+    elapsed = time.perf_counter() - start
+
+    by_dashboard = {}
+    for dashboard_id, seconds, ok in timings:
+        entry = by_dashboard.setdefault(dashboard_id, {
+            "dashboard_id": dashboard_id,
+            "name": get_dashboard(dashboard_id)["info"]["name"],
+            "combinations": 0,
+            "seconds": 0.0,
+            "max_seconds": 0.0,
+            "errors": 0,
+        })
+        entry["combinations"] += 1
+        entry["seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+        entry["errors"] += 0 if ok else 1
+
+    dashboards = sorted(by_dashboard.values(), key=lambda entry: entry["seconds"], reverse=True)
+    for entry in dashboards:
+        entry["seconds"] = round(entry["seconds"], 4)
+        entry["max_seconds"] = round(entry["max_seconds"], 4)
+    return {
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "combinations": len(combinations),
+        "requests": len(plan),
+        "errors": sum(entry["errors"] for entry in dashboards),
+        "seconds": round(elapsed, 3),
+        "dashboards": dashboards,
+    }
+
+
+def format_report(report):
+    """Reporte de precalentamiento como líneas de texto, del dashboard más lento al más rápido"""
+    lines = [f"{'id':>3} {'dashboard':<40} {'comb.':>5} {'total ms':>10} {'máx ms':>9} {'errores':>7}"]
+    for entry in report["dashboards"]:
+        lines.append(
+            f"{entry['dashboard_id']:>3} {entry['name'][:40]:<40} {entry['combinations']:>5} "
+            f"{entry['seconds'] * 1000:>10.1f} {entry['max_seconds'] * 1000:>9.1f} {entry['errors']:>7}"
+        )
+    lines.append(
+        f"{report['requests']} generaciones en {report['combinations']} combinaciones de filtros, "
+        f"{report['seconds']} s, {report['errors']} errores"
+    )
+    return lines
+
+
+class CacheWarmer:
+    """Precalienta en el propio proceso las caches de datos y de gráficos.
+
+    Genera todos los dashboards para las combinaciones de filtros más comunes
+    (filter_combinations) al arrancar y luego cada WARMUP_INTERVAL segundos
+    (0: solo al arrancar), en un hilo de fondo. El último reporte queda en
+    last_report.
+    """
+
+    def __init__(self, manager, filter_catalog):
+        self.manager = manager
+        self.filter_catalog = filter_catalog
+        self.last_report = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _generate(self, dashboard_id, filters):
+        result = self.manager.generate_dashboard(dashboard_id, filters) or {}
+        return not result.get("error")
+
+    def run_once(self):
+        catalog = self.filter_catalog.get()
+        combinations = filter_combinations(catalog["payload"] if catalog else None)
+        report = warm_up(self._generate, combinations)
+        self.last_report = report
+        print(f"Caches precalentadas: {report['requests']} generaciones en {report['seconds']} s, "
+              f"{report['errors']} errores")
+        return report
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Error precalentando las caches: {e}")
+            if not Config.WARMUP_INTERVAL:
+                return
+            self._stop.wait(Config.WARMUP_INTERVAL)
+
+    def start(self):
+        """Arranca el precalentamiento (y su repetición periódica) en un hilo de fondo"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
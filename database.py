@@ -1,6 +1,275 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
 import mysql.connector
+from mysql.connector.errors import PoolError
 from config import Config
-import pandas as pd
+
+
+# ER_UNSUPPORTED_PS: la sentencia no se puede preparar (se ejecuta como texto)
+_UNSUPPORTED_PREPARED = 1295
+
+
+class StatementCache:
+    """Sentencias preparadas de una conexión, por texto de la consulta y tipo de fila (LRU).
+
+    Cada consulta distinta tiene su cursor preparado: MySQL la analiza y
+    planifica una vez por conexión y las siguientes ejecuciones solo envían
+    los parámetros. El conector vuelve a preparar si recibe un objeto de texto
+    distinto (compara con `is`), así que siempre se ejecuta con el texto
+    guardado en la cache y no con el que llega. Solo la usa el hilo que tiene
+    la conexión tomada del pool.
+    """
+
+    def __init__(self, connection, size, count):
+        self.connection = connection
+        self.size = size
+        # count(contador) suma en las estadísticas del pool
+        self.count = count
+        # (consulta, filas como dict) -> (texto guardado, cursor preparado)
+        self._statements = OrderedDict()
+        self._unsupported = set()
+
+    def get(self, query, dictionary=True):
+        """Devuelve (texto, cursor), o None si la consulta no admite preparación"""
+        if query in self._unsupported:
+            return None
+        key = (query, dictionary)
+        entry = self._statements.get(key)
+        if entry is not None:
+            self._statements.move_to_end(key)
+            self.count("statement_hits")
+            return entry
+        cursor = self.connection.cursor(prepared=True, dictionary=dictionary)
+        entry = self._statements[key] = (query, cursor)
+        evicted = []
+        while len(self._statements) > self.size:
+            evicted.append(self._statements.popitem(last=False)[1][1])
+        for old in evicted:
+            # Cerrar el cursor libera la sentencia en el servidor
+            self.count("statements_evicted")
+            old.close()
+        self.count("statements_prepared")
+        return entry
+
+    def discard(self, query, dictionary=True, unsupported=False):
+        entry = self._statements.pop((query, dictionary), None)
+        if unsupported:
+            self._unsupported.add(query)
+            self.count("statements_unsupported")
+        if entry is not None:
+            try:
+                entry[1].close()
+            except mysql.connector.Error:
+                pass
+
+    def __len__(self):
+        return len(self._statements)
+
+
+class ConnectionPool:
+    """Pool de conexiones MySQL reutilizables entre peticiones"""
+
+    def __init__(self, config, size=10, prewarm=0, idle_timeout=300,
+                 checkout_timeout=10, ping_interval=30, statement_cache_size=64):
+        self.config = config
+        self.size = size
+        self.prewarm_size = min(prewarm, size)
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.ping_interval = ping_interval
+        self.statement_cache_size = statement_cache_size
+
+        # Conexiones ociosas como (conexion, ultimo_uso); se reutiliza la más reciente
+        self._idle = deque()
+        self._open = 0
+        # id(conexión) -> StatementCache; se descarta al cerrar la conexión
+        self._statements = {}
+        self._waiting = 0
+        self._cond = threading.Condition()
+        self._counters = {
+            "checkouts": 0,
+            "created": 0,
+            "reused": 0,
+            "discarded": 0,
+            "reaped": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "statements_prepared": 0,
+            "statement_hits": 0,
+            "statements_evicted": 0,
+            "statements_unsupported": 0,
+        }
+
+    def _create_connection(self):
+        connection = mysql.connector.connect(**self.config)
+        # Sin autocommit cada conexión reutilizada vería una instantánea vieja
+        connection.autocommit = True
+        return connection
+
+    def _close_quietly(self, connection):
+        # El servidor libera las sentencias preparadas de la conexión al cerrarla
+        with self._cond:
+            self._statements.pop(id(connection), None)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _reap_idle(self):
+        """Cierra conexiones ociosas por encima del mínimo pre-calentado (con el lock tomado)"""
+        now = time.monotonic()
+        keep = deque()
+        reaped = []
+        while self._idle:
+            connection, last_used = self._idle.popleft()
+            expired = now - last_used > self.idle_timeout
+            if expired and self._open - len(reaped) > self.prewarm_size:
+                reaped.append(connection)
+            else:
+                keep.append((connection, last_used))
+        self._idle = keep
+        self._open -= len(reaped)
+        self._counters["reaped"] += len(reaped)
+        return reaped
+
+    def prewarm(self, count=None):
+        """Abre conexiones por adelantado para que las primeras peticiones no paguen el handshake"""
+        count = self.prewarm_size if count is None else min(count, self.size)
+        created = 0
+        while True:
+            with self._cond:
+                if self._open >= count:
+                    break
+                self._open += 1
+            try:
+                connection = self._create_connection()
+            except mysql.connector.Error as e:
+                with self._cond:
+                    self._open -= 1
+                    self._counters["errors"] += 1
+                print(f"Error pre-calentando el pool de conexiones: {e}")
+                break
+            with self._cond:
+                self._counters["created"] += 1
+                self._idle.append((connection, time.monotonic()))
+                self._cond.notify()
+            created += 1
+        return created
+
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            reaped = self._reap_idle()
+            while True:
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    connection, last_used = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolError("No hay conexiones disponibles en el pool")
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._counters["checkouts"] += 1
+
+        for old in reaped:
+            self._close_quietly(old)
+
+        if connection is not None:
+            idle_for = time.monotonic() - last_used
+            if idle_for < self.ping_interval or self._is_healthy(connection):
+                with self._cond:
+                    self._counters["reused"] += 1
+                return connection
+            # La conexión murió mientras estaba ociosa: se reemplaza por una nueva
+            self._close_quietly(connection)
+            with self._cond:
+                self._counters["discarded"] += 1
+
+        try:
+            connection = self._create_connection()
+        except mysql.connector.Error:
+            with self._cond:
+                self._open -= 1
+                self._counters["errors"] += 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._counters["created"] += 1
+        return connection
+
+    def statements(self, connection):
+        """Cache de sentencias preparadas de una conexión tomada del pool"""
+        with self._cond:
+            cache = self._statements.get(id(connection))
+            if cache is None:
+                cache = self._statements[id(connection)] = StatementCache(
+                    connection, self.statement_cache_size, self._count
+                )
+            return cache
+
+    def _count(self, counter):
+        with self._cond:
+            self._counters[counter] += 1
+
+    def release(self, connection, discard=False):
+        if discard:
+            self._close_quietly(connection)
+        with self._cond:
+            if discard:
+                self._open -= 1
+                self._counters["discarded"] += 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+
+    def reap(self):
+        """Cierra las conexiones que llevan demasiado tiempo ociosas"""
+        with self._cond:
+            reaped = self._reap_idle()
+        for connection in reaped:
+            self._close_quietly(connection)
+        return len(reaped)
+
+    def close_all(self):
+        with self._cond:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "size": self.size,
+                "prewarm": self.prewarm_size,
+                "open": self._open,
+                "idle": idle,
+                "in_use": self._open - idle,
+                "waiting": self._waiting,
+                "statements_cached": sum(len(cache) for cache in self._statements.values()),
+                **self._counters,
+            }
+
 
 class Database:
     def __init__(self):
@@ -10,41 +279,176 @@ class Database:
             'password': Config.DB_PASSWORD,
             'database': Config.DB_NAME
         }
+        self.pool = ConnectionPool(
+            self.config,
+            size=Config.DB_POOL_SIZE,
+            prewarm=Config.DB_POOL_PREWARM,
+            idle_timeout=Config.DB_POOL_IDLE_TIMEOUT,
+            checkout_timeout=Config.DB_POOL_CHECKOUT_TIMEOUT,
+            ping_interval=Config.DB_POOL_PING_INTERVAL,
+            statement_cache_size=Config.DB_STATEMENT_CACHE_SIZE
+        )
     
     def connect(self):
         try:
-            connection = mysql.connector.connect(**self.config)
-            return connection
+            return self.pool.acquire()
         except mysql.connector.Error as e:
             print(f"Error conectando a la base de datos: {e}")
             return None
     
+    def release(self, connection, discard=False):
+        self.pool.release(connection, discard=discard)
+    
+    def get_pool_stats(self):
+        return self.pool.stats()
+    
+    def _execute_prepared(self, connection, query, params, dictionary):
+        """Ejecuta con la sentencia preparada en cache y devuelve su cursor (que no se cierra).
+        
+        None si están deshabilitadas o la consulta no admite preparación.
+        """
+        if not Config.DB_PREPARED_STATEMENTS:
+            return None
+        statements = self.pool.statements(connection)
+        entry = statements.get(query, dictionary)
+        if entry is None:
+            return None
+        operation, cursor = entry
+        try:
+            cursor.execute(operation, tuple(params) if params else ())
+            return cursor
+        except mysql.connector.Error as e:
+            # Un cursor que falló no se reutiliza; si no se puede preparar, se recuerda
+            unsupported = getattr(e, "errno", None) == _UNSUPPORTED_PREPARED
+            statements.discard(query, dictionary, unsupported=unsupported)
+            if unsupported:
+                return None
+            raise
+
     def execute_query(self, query, params=None):
         connection = self.connect()
         if connection:
+            cursor = None
+            prepared = None
+            broken = False
             try:
+                prepared = self._execute_prepared(connection, query, params, dictionary=True)
+                if prepared is not None:
+                    return prepared.fetchall()
                 cursor = connection.cursor(dictionary=True)
                 cursor.execute(query, params)
                 result = cursor.fetchall()
-                cursor.close()
-                connection.close()
                 return result
             except mysql.connector.Error as e:
+                # Errores de red/protocolo dejan la conexión inservible para el pool; también
+                # un cursor preparado que falló al leer, que puede quedar con filas sin leer
+                # (al descartar la conexión se descarta con ella su cache de sentencias)
+                broken = prepared is not None or isinstance(e, (mysql.connector.OperationalError,
+                                                                mysql.connector.InterfaceError))
                 print(f"Error ejecutando query: {e}")
                 print(f"Query: {query}")
                 return []
+            finally:
+                if cursor is not None:
+                    try:
+                        cursor.close()
+                    except mysql.connector.Error:
+                        broken = True
+                self.release(connection, discard=broken)
         return []
     
+    def execute_transaction(self, statements):
+        """Ejecuta varias sentencias (query, params) en una sola transacción.
+        
+        Devuelve True si se confirmó; ante cualquier error se revierte todo.
+        """
+        connection = self.connect()
+        if connection:
+            cursor = None
+            broken = False
+            try:
+                connection.start_transaction()
+                cursor = connection.cursor()
+                for query, params in statements:
+                    cursor.execute(query, params)
+                connection.commit()
+                return True
+            except mysql.connector.Error as e:
+                broken = isinstance(e, (mysql.connector.OperationalError,
+                                        mysql.connector.InterfaceError))
+                print(f"Error ejecutando transacción: {e}")
+                try:
+                    connection.rollback()
+                except mysql.connector.Error:
+                    broken = True
+                return False
+            finally:
+                if cursor is not None:
+                    try:
+                        cursor.close()
+                    except mysql.connector.Error:
+                        broken = True
+                self.release(connection, discard=broken)
+        return False
+    
+    def stream_query(self, query, params=None, batch_size=None, describe=False):
+        """Ejecuta una consulta con cursor sin buffer y la recorre por lotes.
+        
+        Generador: primero entrega la tupla de nombres de columna (con
+        describe, el cursor.description completo, con el tipo de cada una) y
+        después listas de filas (tuplas) de hasta DB_STREAM_BATCH_SIZE. La conexión
+        queda tomada hasta que se agota o se cierra el generador; si se
+        abandona a medias, el resultado sin leer la deja inservible y se
+        descarta del pool (con sus sentencias preparadas).
+        """
+        batch_size = batch_size or Config.DB_STREAM_BATCH_SIZE
+        connection = self.connect()
+        if not connection:
+            raise mysql.connector.InterfaceError("Sin conexión a la base de datos")
+        cursor = opened = None
+        broken = True
+        try:
+            # Los cursores preparados tampoco tienen buffer; el de la cache no se cierra
+            cursor = self._execute_prepared(connection, query, params, dictionary=False)
+            if cursor is None:
+                cursor = opened = connection.cursor(buffered=False)
+                cursor.execute(query, params)
+            description = tuple(cursor.description or ())
+            yield description if describe else tuple(column[0] for column in description)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+            broken = False
+        except mysql.connector.Error as e:
+            print(f"Error ejecutando query: {e}")
+            print(f"Query: {query}")
+            raise
+        finally:
+            if opened is not None:
+                try:
+                    opened.close()
+                except mysql.connector.Error:
+                    broken = True
+            self.release(connection, discard=broken)
+    
     def get_dataframe(self, query, params=None):
+        # pandas solo hace falta aquí; importarlo con el módulo encarecía cada arranque
+        import pandas as pd
+        
         connection = self.connect()
         if connection:
             try:
                 df = pd.read_sql(query, connection, params=params)
-                connection.close()
-                return df
             except Exception as e:
                 print(f"Error creando dataframe: {e}")
+                broken = isinstance(e, (mysql.connector.OperationalError,
+                                        mysql.connector.InterfaceError))
+                self.release(connection, discard=broken)
                 return pd.DataFrame()
+            self.release(connection)
+            return df
         return pd.DataFrame()
     
     # Métodos específicos para obtener datos
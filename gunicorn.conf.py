@@ -0,0 +1,61 @@
+"""Configuración de gunicorn para producción.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Los valores se pueden ajustar con variables de entorno (GUNICORN_BIND,
+GUNICORN_WORKERS, GUNICORN_THREADS, ...); los de la aplicación se leen del
+entorno en config.py.
+
+Recarga sin cortar peticiones:
+    kill -HUP <pid del master>    reinicia los workers uno a uno con la misma
+                                  configuración; como el código se precarga en
+                                  el master, HUP no toma código nuevo
+    kill -USR2 <pid del master>   arranca un master nuevo con el código nuevo
+                                  junto al anterior; después kill -TERM al
+                                  master anterior para que termine sus peticiones
+"""
+import multiprocessing
+import os
+
+from dashboards.lazy import preload_heavy_modules
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+# Renderizar gráficos es CPU: un proceso por núcleo
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+# Los hilos atienden peticiones mientras otras esperan a la base de datos
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Importar la app una vez en el master y compartir sus módulos con los workers
+preload_app = True
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+# Tiempo que se deja a un worker terminar sus peticiones en HUP/TERM
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+# Reciclar workers de vez en cuando, escalonados para que no se reinicien todos a la vez
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-")
+
+
+def on_starting(server):
+    # Con LAZY_IMPORTS wsgi.py no carga plotly ni pandas; en el master sí conviene
+    # cargarlos una vez para que todos los workers los compartan
+    preload_heavy_modules()
+
+
+def post_fork(server, worker):
+    # Pool de conexiones, hilos de fondo y procesos de renderizado propios de cada worker
+    from app import init_services
+
+    init_services(server.app.wsgi())
+
+
+def worker_exit(server, worker):
+    # Cerrar las conexiones del worker en lugar de dejarlas colgadas en MySQL
+    services = server.app.wsgi().extensions.get("dashboards")
+    if services is not None:
+        services.stop()
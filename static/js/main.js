@@ -17,17 +17,29 @@ document.addEventListener('DOMContentLoaded', function() {
     handleChartErrors();
 });
 
-// Observer para animaciones de entrada
+// Observer para animaciones de entrada y carga diferida de gráficos
 function observeElements() {
     const observer = new IntersectionObserver((entries) => {
+        const lazyContainers = [];
         entries.forEach(entry => {
             if (entry.isIntersecting) {
                 entry.target.style.opacity = '1';
                 entry.target.style.transform = 'translateY(0)';
+                
+                // Tarjetas en modo esqueleto: pedir el gráfico una sola vez
+                const lazyContainer = entry.target.querySelector('[data-lazy-dashboard]');
+                if (lazyContainer) {
+                    lazyContainers.push(lazyContainer);
+                }
             }
         });
+        // Las tarjetas que se hacen visibles juntas se piden en una sola petición
+        if (lazyContainers.length > 0) {
+            loadLazyDashboards(lazyContainers);
+        }
     }, {
-        threshold: 0.1
+        threshold: 0.1,
+        rootMargin: '200px'
     });
     
     document.querySelectorAll('.dashboard-card').forEach(card => {
@@ -38,6 +50,130 @@ function observeElements() {
     });
 }
 
+// Cargar los gráficos de varias tarjetas desde /api/dashboards/batch; cada
+// tarjeta se dibuja en cuanto llega su línea del NDJSON
+function loadLazyDashboards(containers) {
+    const pending = new Map();
+    containers.forEach(container => {
+        pending.set(container.getAttribute('data-lazy-dashboard'), container);
+        container.removeAttribute('data-lazy-dashboard');
+    });
+    
+    // Los mismos filtros de la página (carrera, periodo, genero)
+    const params = new URLSearchParams(window.location.search);
+    params.set('ids', Array.from(pending.keys()).join(','));
+    params.set('figura', '1');
+    params.set('formato', 'ndjson');
+    
+    const handleLine = line => {
+        if (!line.trim()) {
+            return;
+        }
+        const result = JSON.parse(line);
+        const dashboardId = String(result.dashboard_id);
+        const container = pending.get(dashboardId);
+        if (container) {
+            pending.delete(dashboardId);
+            renderLazyDashboard(container, dashboardId, result);
+        }
+    };
+    
+    fetch(`/api/dashboards/batch?${params.toString()}`)
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(result => { throw new Error(result.error); });
+            }
+            if (!response.body || typeof TextDecoder === 'undefined') {
+                return response.text().then(text => text.split('\n').forEach(handleLine));
+            }
+            
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            const read = () => reader.read().then(({ done, value }) => {
+                buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                lines.forEach(handleLine);
+                if (done) {
+                    handleLine(buffer);
+                    return;
+                }
+                return read();
+            });
+            return read();
+        })
+        .catch(error => {
+            console.error('Error cargando dashboards:', error);
+        })
+        .finally(() => {
+            // Las que no llegaron (error de red o de la respuesta) muestran el error
+            pending.forEach(container => showLazyError(container, 'No se pudo cargar el dashboard'));
+        });
+}
+
+function renderLazyDashboard(container, dashboardId, result) {
+    if (result.error) {
+        showLazyError(container, result.error);
+        return;
+    }
+    
+    // Los gráficos se dibujan siempre desde la figura: los <script> de result.chart
+    // (como el de plotly.js en modo "inline") no se ejecutan al insertarlos con innerHTML
+    if (result.figure) {
+        container.innerHTML = '';
+        const chartDiv = document.createElement('div');
+        chartDiv.id = `chart-${dashboardId}`;
+        chartDiv.className = 'plotly-graph-div';
+        chartDiv.style.width = '100%';
+        container.appendChild(chartDiv);
+        Plotly.newPlot(chartDiv, result.figure.data, result.figure.layout, { responsive: true });
+    } else {
+        // Solo los dashboards en desarrollo llegan sin figura; su HTML no lleva scripts
+        container.innerHTML = result.chart || '';
+    }
+    
+    renderLazyTable(dashboardId, result.data);
+}
+
+// El mensaje viene del servidor (texto de la excepción) y se escapa como en la plantilla
+function showLazyError(container, message) {
+    container.innerHTML = `
+        <div class="alert alert-danger m-3 w-100">
+            <i class="fas fa-exclamation-triangle"></i> ${escapeHtml(message)}
+        </div>
+    `;
+}
+
+function escapeHtml(value) {
+    return String(value === null || value === undefined ? '' : value)
+        .replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+}
+
+// Tabla "Ver Datos" de una tarjeta cargada de forma diferida
+function renderLazyTable(dashboardId, rows) {
+    const footer = document.querySelector(`[data-lazy-table="${dashboardId}"]`);
+    if (!footer || !Array.isArray(rows) || rows.length === 0) {
+        return;
+    }
+    
+    const headers = Object.keys(rows[0]);
+    const title = key => key.replace(/_/g, ' ').replace(/\b\w/g, c => c.toUpperCase());
+    
+    footer.querySelector('.table-responsive').innerHTML = `
+        <table class="table table-striped table-sm mb-0">
+            <thead class="table-dark">
+                <tr>${headers.map(key => `<th style="font-size: 0.75rem;">${escapeHtml(title(key))}</th>`).join('')}</tr>
+            </thead>
+            <tbody>
+                ${rows.map(row => `<tr>${headers.map(key => `<td style="font-size: 0.75rem;">${escapeHtml(row[key])}</td>`).join('')}</tr>`).join('')}
+            </tbody>
+        </table>
+    `;
+    footer.classList.remove('d-none');
+}
+
 // Configurar búsqueda mejorada
 function setupSearch() {
     const searchInput = document.getElementById('searchInput');
@@ -0,0 +1,32 @@
+import pytest
+
+from benchmarks.sqlite_db import SQLiteDatabase
+
+
+@pytest.fixture(scope="session")
+def sqlite_db():
+    """Base SQLite en memoria con el esquema de los dashboards y datos sintéticos"""
+    db = SQLiteDatabase()
+    db.seed(300)
+    return db
+
+
+@pytest.fixture
+def manager(sqlite_db):
+    from dashboards.dashboard_definitions import DashboardManager
+
+    manager = DashboardManager(sqlite_db, concurrent=False)
+    yield manager
+    manager.shutdown()
+
+
+@pytest.fixture
+def client(sqlite_db):
+    from app import create_app
+
+    flask_app = create_app(db=sqlite_db, start=False)
+    flask_app.config["TESTING"] = True
+    yield flask_app.test_client()
+    services = flask_app.extensions.get("dashboards")
+    if services is not None:
+        services.stop()
@@ -0,0 +1,56 @@
+import os
+
+from dashboards.assets import AssetManifest
+
+
+def make_manifest(tmp_path, content):
+    source = tmp_path / "app.js"
+    source.write_text(content)
+    return AssetManifest(sources={"js/app.js": str(source)}, output_dir=str(tmp_path / "dist")).build()
+
+
+def test_fingerprint_changes_with_content(tmp_path):
+    first = make_manifest(tmp_path, "console.log(1);").filename("js/app.js")
+    second = make_manifest(tmp_path, "console.log(2);").filename("js/app.js")
+    assert first != second
+    assert first.startswith("app.") and first.endswith(".js")
+
+
+def test_build_prunes_previous_versions(tmp_path):
+    old = make_manifest(tmp_path, "console.log(1);")
+    (tmp_path / "dist" / "otro.txt").write_text("no es un recurso")
+    new = make_manifest(tmp_path, "console.log(2);")
+    files = set(os.listdir(tmp_path / "dist"))
+    assert not any(name.startswith(old.filename("js/app.js")) for name in files)
+    assert {os.path.basename(path) for path in new.lookup(new.filename("js/app.js"))["encodings"].values()} <= files
+    assert "otro.txt" in files
+
+
+def test_asset_route_serves_precompressed_copy(client):
+    filename = client.application.extensions["assets"].filename("css/style.css")
+    response = client.get(f"/assets/{filename}", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "immutable" in response.headers["Cache-Control"]
+    response.close()
+
+
+def test_dashboard_data_conditional_and_compressed(client):
+    first = client.get("/api/dashboard/2/data", headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200 and first.headers["ETag"].startswith('W/"')
+    assert "Accept-Encoding" in first.headers["Vary"]
+    again = client.get("/api/dashboard/2/data", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_data_version_changes_only_on_invalidation(client):
+    manager = client.application.extensions["dashboards"].dashboard_manager
+    manager.data_changed_at = version = manager.data_changed_at.replace(year=2000)
+    # Consultas nuevas (otros filtros, entradas desalojadas) no son datos nuevos
+    client.get("/api/dashboard/2/data")
+    client.get("/api/dashboard/2/data?genero=F")
+    manager.cache.invalidate()
+    client.get("/api/dashboard/2/data")
+    assert manager.data_changed_at == version
+    client.post("/api/cache/invalidate?data_key=genero_stats")
+    assert manager.data_changed_at > version
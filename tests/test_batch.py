@@ -0,0 +1,83 @@
+import json
+import time
+
+from config import Config
+
+
+def test_batch_keeps_requested_order_and_dedupes(client):
+    response = client.get("/api/dashboards/batch?ids=5,1,5&ids=3")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [dashboard["dashboard_id"] for dashboard in body["dashboards"]] == [5, 1, 3]
+    assert body["count"] == 3
+    assert body["failed"] == 0
+
+
+def test_batch_matches_single_dashboard_data(client):
+    batch = client.get("/api/dashboards/batch?ids=2&genero=F").get_json()
+    single = client.get("/api/dashboard/2/data?genero=F").get_json()
+    assert batch["dashboards"][0]["data"] == single["data"]
+
+
+def test_batch_rejects_bad_requests(client, monkeypatch):
+    assert client.get("/api/dashboards/batch").status_code == 400
+    assert client.get("/api/dashboards/batch?ids=1,x").status_code == 400
+    assert client.get("/api/dashboards/batch?ids=1,9999").status_code == 404
+    assert client.get("/api/dashboards/batch/categoria/NoExiste").status_code == 404
+    monkeypatch.setattr(Config, "BATCH_MAX_DASHBOARDS", 2)
+    assert client.get("/api/dashboards/batch?ids=1,2,3").status_code == 400
+
+
+def test_batch_category(client):
+    body = client.get("/api/dashboards/batch/categoria/Estudiantes").get_json()
+    assert body["count"] > 0
+    assert 1 in [dashboard["dashboard_id"] for dashboard in body["dashboards"]]
+
+
+def test_batch_with_figure(client):
+    body = client.get("/api/dashboards/batch?ids=3&figura=1").get_json()
+    dashboard = body["dashboards"][0]
+    assert "error" not in dashboard
+    assert dashboard["figure"]["data"]
+
+
+def test_batch_ndjson_streams_one_line_per_dashboard(client):
+    response = client.get("/api/dashboards/batch?ids=1,3,5&formato=ndjson")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.data.decode("utf-8").splitlines()]
+    assert sorted(line["dashboard_id"] for line in lines) == [1, 3, 5]
+
+    by_accept = client.get("/api/dashboards/batch?ids=1",
+                           headers={"Accept": "application/x-ndjson"})
+    assert by_accept.mimetype == "application/x-ndjson"
+
+
+def test_batch_not_modified(client):
+    first = client.get("/api/dashboards/batch?ids=1,2")
+    response = client.get("/api/dashboards/batch?ids=1,2",
+                          headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 304
+
+
+def test_iter_dashboards_yields_timeouts_last(sqlite_db, monkeypatch):
+    from dashboards.dashboard_definitions import DashboardManager
+
+    monkeypatch.setattr(Config, "DASHBOARD_TIMEOUT", 0.3)
+    manager = DashboardManager(sqlite_db, concurrent=True)
+    generate = manager.generate_dashboard
+
+    def slow(dashboard_id, filters=None):
+        if dashboard_id == 1:
+            time.sleep(1)
+        return generate(dashboard_id, filters)
+
+    monkeypatch.setattr(manager, "generate_dashboard", slow)
+    try:
+        infos = [manager.get_dashboard_info(dashboard_id) for dashboard_id in (1, 2, 3)]
+        results = list(manager.iter_dashboards(infos))
+    finally:
+        manager.shutdown()
+    assert [result["info"]["id"] for result in results][-1] == 1
+    assert results[-1]["data"]["failed"]
+    assert not any(result["data"].get("failed") for result in results[:-1])
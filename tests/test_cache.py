@@ -0,0 +1,83 @@
+import threading
+import time
+
+from dashboards.cache import TTLCache, normalize_filters
+from dashboards.registry import DATA_TTLS, QUERIES
+
+
+def test_normalize_filters_ignores_empty_and_order():
+    assert normalize_filters({"genero": "F", "carrera": ""}) == (("genero", "F"),)
+    assert normalize_filters({"b": 1, "a": 2}) == normalize_filters({"a": 2, "b": 1})
+    assert normalize_filters(None) == ()
+
+
+def test_lru_eviction_and_expiration():
+    cache = TTLCache(max_entries=2, default_ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    cache.set("d", 4, ttl=0)
+    assert cache.get("d") == (False, None)
+    stats = cache.stats()
+    assert stats["evictions"] == 2 and stats["expirations"] == 1
+
+
+def test_weight_limit():
+    cache = TTLCache(max_entries=10, max_weight=10, weigher=len)
+    cache.set("a", "x" * 6)
+    cache.set("b", "x" * 6)
+    cache.set("grande", "x" * 11)
+    assert cache.get("a") == (False, None)
+    assert cache.get("b") == (True, "x" * 6)
+    assert cache.get("grande") == (False, None)
+
+
+def test_get_or_load_is_single_flight():
+    cache = TTLCache()
+    calls = []
+    release = threading.Event()
+
+    def load():
+        calls.append(1)
+        release.wait(2)
+        return [1, 2, 3]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", load))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [[1, 2, 3]] * 5
+
+
+def test_get_or_load_does_not_cache_empty_or_uncacheable():
+    cache = TTLCache()
+    assert cache.get_or_load("vacio", lambda: []) == []
+    assert cache.get("vacio") == (False, None)
+    cache.get_or_load("error", lambda: {"error": "x"}, cacheable=lambda value: "error" not in value)
+    assert cache.get("error") == (False, None)
+
+
+def test_day_long_ttls_only_for_fixed_queries():
+    # Una muestra con RAND() no debe quedar congelada un día entero
+    for data_key in DATA_TTLS:
+        assert "RAND()" not in QUERIES[data_key], data_key
+
+
+def test_dashboard_data_is_cached_per_filters(manager, monkeypatch):
+    queried = []
+    query = manager.query_dashboard_data
+    monkeypatch.setattr(manager, "query_dashboard_data",
+                        lambda data_key, filters=None: queried.append(filters) or query(data_key, filters))
+    first = manager.get_dashboard_data("carreras_stats", {"genero": "F"})
+    again = manager.get_dashboard_data("carreras_stats", {"genero": "F", "periodo": ""})
+    assert again is first
+    manager.get_dashboard_data("carreras_stats", {"genero": "M"})
+    assert queried == [{"genero": "F"}, {"genero": "M"}]
@@ -0,0 +1,62 @@
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from dashboards.columnar import ColumnarResult, data_fingerprint
+
+
+def stream(columns, *batches):
+    yield columns
+    yield from batches
+
+
+def test_from_stream_transposes_batches():
+    result = ColumnarResult.from_stream(stream(("carrera", "total"), [("ISC", 3), ("IIN", 2)], [("LAE", 1)]))
+    assert len(result) == 3
+    assert result.column("total").dtype == np.int64
+    assert result.records() == [
+        {"carrera": "ISC", "total": 3}, {"carrera": "IIN", "total": 2}, {"carrera": "LAE", "total": 1},
+    ]
+
+
+def test_column_types_and_nulls_round_trip():
+    result = ColumnarResult.from_stream(stream(
+        ("promedio", "cantidad", "fecha"),
+        [(Decimal("8.5"), 1, date(2024, 1, 1)), (None, None, None)],
+    ))
+    assert result.column("promedio").dtype == np.float64
+    # Enteros con NULL se quedan como objetos para no convertirse en float
+    assert result.column("cantidad").dtype == object
+    assert result.records() == [
+        {"promedio": 8.5, "cantidad": 1, "fecha": date(2024, 1, 1)},
+        {"promedio": None, "cantidad": None, "fecha": None},
+    ]
+    assert isinstance(result.records()[0]["cantidad"], int)
+
+
+def test_empty_result_is_falsy():
+    result = ColumnarResult.from_stream(stream(("total",)))
+    assert not result
+    assert result.records() == []
+
+
+def test_records_computed_once_and_frame_shares_columns():
+    result = ColumnarResult(("x",), [[1, 2, 3]])
+    assert result.records() is result.records()
+    frame = result.to_frame()
+    assert frame["x"].tolist() == [1, 2, 3]
+
+
+def test_fingerprint_depends_on_values_and_types():
+    base = ColumnarResult(("x",), [[1, 2]])
+    assert base.fingerprint() == ColumnarResult(("x",), [[1, 2]]).fingerprint()
+    assert base.fingerprint() != ColumnarResult(("x",), [[1, 3]]).fingerprint()
+    assert base.fingerprint() != ColumnarResult(("x",), [[1.0, 2.0]]).fingerprint()
+    assert data_fingerprint([{"a": 1}]) == data_fingerprint([{"a": 1}])
+
+
+def test_dashboard_query_returns_columnar(manager):
+    result = manager.query_dashboard_data("carreras_stats", {"genero": "F"})
+    assert isinstance(result, ColumnarResult) and result
+    assert set(result.columns) >= {"carrera", "total"}
@@ -0,0 +1,100 @@
+import time
+
+from config import Config
+from dashboards.columnar import ColumnarResult
+from dashboards.dashboard_definitions import DashboardManager
+
+
+def test_records_serialized_once(manager):
+    result = manager.generate_dashboard(3)
+    assert "error" not in result
+    assert isinstance(result["data"], list)
+    assert result["data"] and isinstance(result["data"][0], dict)
+
+
+def test_subplots_chart_keeps_its_empty_data(manager):
+    # El dashboard integral no muestra tabla; create_chart no debe reemplazar su "data"
+    result = manager.generate_dashboard(40)
+    assert "error" not in result
+    assert result["data"] == []
+
+
+def test_create_chart_with_columnar_result(manager):
+    data = ColumnarResult(("genero", "cantidad"), [["Femenino", "Masculino"], [3, 5]])
+    result = manager.create_chart(data, "pie", "Género", 3)
+    assert result["data"] == [{"genero": "Femenino", "cantidad": 3}, {"genero": "Masculino", "cantidad": 5}]
+
+
+def test_render_cache_reuses_chart_for_same_data(manager, monkeypatch):
+    rendered = []
+    create_chart = manager.create_chart
+    monkeypatch.setattr(manager, "create_chart",
+                        lambda *args: rendered.append(args[3]) or create_chart(*args))
+    first = manager.generate_dashboard(3, {"genero": "F"})
+    manager.invalidate_cache()
+    # Los datos se vuelven a consultar, pero son los mismos: el gráfico no se renderiza otra vez
+    again = manager.generate_dashboard(3, {"genero": "F"})
+    assert again is first
+    assert rendered == [3]
+    manager.generate_dashboard(3, {"genero": "M"})
+    assert rendered == [3, 3]
+
+
+def test_render_cache_skips_errors(manager, monkeypatch):
+    create_chart = manager.create_chart
+    calls = []
+
+    def flaky(*args):
+        calls.append(args[3])
+        if len(calls) == 1:
+            return {"error": "fallo pasajero"}
+        return create_chart(*args)
+
+    monkeypatch.setattr(manager, "create_chart", flaky)
+    assert "error" in manager.generate_dashboard(3)
+    assert "error" not in manager.generate_dashboard(3)
+    assert calls == [3, 3]
+
+
+def test_generate_dashboards_in_parallel_keeps_order_and_times_out(sqlite_db, monkeypatch):
+    monkeypatch.setattr(Config, "DASHBOARD_TIMEOUT", 0.3)
+    parallel = DashboardManager(sqlite_db, concurrent=True)
+    generate = parallel.generate_dashboard
+
+    def slow(dashboard_id, filters=None):
+        if dashboard_id == 2:
+            time.sleep(1)
+        return generate(dashboard_id, filters)
+
+    monkeypatch.setattr(parallel, "generate_dashboard", slow)
+    try:
+        infos = [parallel.get_dashboard_info(dashboard_id) for dashboard_id in (3, 2, 1)]
+        results = parallel.generate_dashboards(infos)
+    finally:
+        parallel.shutdown()
+    assert [result["info"]["id"] for result in results] == [3, 2, 1]
+    assert results[1]["data"]["failed"]
+    assert "Tiempo de espera" in results[1]["data"]["error"]
+    assert not results[0]["data"].get("failed") and not results[2]["data"].get("failed")
+
+
+def test_timeout_counts_from_dashboard_start(sqlite_db, monkeypatch):
+    # Con un solo hilo, el segundo dashboard espera en cola sin gastar su plazo
+    monkeypatch.setattr(Config, "DASHBOARD_TIMEOUT", 0.4)
+    monkeypatch.setattr(Config, "DASHBOARD_WORKERS", 1)
+    parallel = DashboardManager(sqlite_db, concurrent=True)
+    generate = parallel.generate_dashboard
+
+    def slow(dashboard_id, filters=None):
+        time.sleep(0.25)
+        return generate(dashboard_id, filters)
+
+    monkeypatch.setattr(parallel, "generate_dashboard", slow)
+    try:
+        infos = [parallel.get_dashboard_info(dashboard_id) for dashboard_id in (3, 2)]
+        results = parallel.generate_dashboards(infos)
+        streamed = list(parallel.iter_dashboards(infos))
+    finally:
+        parallel.shutdown()
+    assert not any(result["data"].get("failed") for result in results + streamed)
+    assert sorted(result["info"]["id"] for result in streamed) == [2, 3]
@@ -0,0 +1,180 @@
+import mysql.connector
+import pytest
+
+import database
+from config import Config
+
+
+class FakeCursor:
+    """Imita lo que importa de los cursores de mysql.connector, incluido el re-prepare por identidad"""
+
+    def __init__(self, connection, prepared):
+        self.connection = connection
+        self.prepared = prepared
+        self._executed = None
+        self.description = (("valor",),)
+        self.closed = False
+
+    def execute(self, operation, params=None):
+        if self.prepared and "NO PREPARABLE" in operation:
+            raise mysql.connector.ProgrammingError(errno=1295, msg="This command is not supported")
+        if self.prepared and operation is not self._executed:
+            self.connection.prepares.append(operation)
+            self._executed = operation
+        self.params = params
+        self._rows = [{"valor": params}] if params else [{"valor": None}]
+
+    def fetchall(self):
+        if self.connection.fail_fetch:
+            raise mysql.connector.DatabaseError(msg="Error leyendo el resultado")
+        return self._rows
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows, []
+        return [tuple(row.values()) for row in rows]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.prepares = []
+        self.fail_fetch = False
+        self.closed = False
+        self.autocommit = False
+
+    def cursor(self, prepared=False, dictionary=False, buffered=None):
+        return FakeCursor(self, prepared)
+
+    def ping(self, reconnect=False):
+        if self.closed:
+            raise mysql.connector.InterfaceError(msg="Conexión cerrada")
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(Config, "DB_PREPARED_STATEMENTS", True)
+    db = database.Database()
+    db.pool = database.ConnectionPool({}, size=2, statement_cache_size=2)
+    db.pool.connections = []
+
+    def create():
+        connection = FakeConnection()
+        db.pool.connections.append(connection)
+        return connection
+
+    db.pool._create_connection = create
+    return db
+
+
+QUERY = "SELECT * FROM estudiantes WHERE genero = %s"
+
+
+def test_prepared_once_per_connection(db):
+    for value in "MFMF":
+        # Un objeto de texto distinto cada vez, como cuando se arma la consulta por petición
+        assert db.execute_query("".join(QUERY), (value,)) == [{"valor": (value,)}]
+    connection, = db.pool.connections
+    assert len(connection.prepares) == 1
+    stats = db.get_pool_stats()
+    assert stats["statements_prepared"] == 1 and stats["statement_hits"] == 3
+    assert stats["statements_cached"] == 1
+
+
+def test_stream_query_uses_statement_cache(db):
+    for value in "MF":
+        assert list(db.stream_query("".join(QUERY), (value,))) == [("valor",), [((value,),)]]
+    assert len(db.pool.connections[0].prepares) == 1
+
+
+def test_lru_evicts_and_closes_statements(db):
+    for index in range(3):
+        db.execute_query(f"SELECT {index}")
+    stats = db.get_pool_stats()
+    assert stats["statements_evicted"] == 1 and stats["statements_cached"] == 2
+
+
+def test_unsupported_statement_falls_back_to_text_protocol(db):
+    assert db.execute_query("NO PREPARABLE") == [{"valor": None}]
+    assert db.execute_query("NO PREPARABLE") == [{"valor": None}]
+    assert db.get_pool_stats()["statements_unsupported"] == 1
+
+
+def test_fetch_error_on_prepared_cursor_discards_connection(db):
+    db.execute_query(QUERY, ("M",))
+    first = db.pool.connections[0]
+    first.fail_fetch = True
+    assert db.execute_query(QUERY, ("F",)) == []
+    assert first.closed
+    stats = db.get_pool_stats()
+    assert stats["discarded"] == 1 and stats["statements_cached"] == 0
+    # La siguiente consulta usa una conexión nueva y vuelve a preparar
+    assert db.execute_query(QUERY, ("F",)) == [{"valor": ("F",)}]
+    assert len(db.pool.connections) == 2
+
+
+def test_disabled_prepared_statements(db, monkeypatch):
+    monkeypatch.setattr(Config, "DB_PREPARED_STATEMENTS", False)
+    db.execute_query(QUERY, ("M",))
+    assert db.pool.connections[0].prepares == []
+
+
+@pytest.fixture
+def pool():
+    pool = database.ConnectionPool({}, size=2, prewarm=1, idle_timeout=0, checkout_timeout=0.1)
+    pool._create_connection = FakeConnection
+    return pool
+
+
+def test_pool_reuses_connections(pool):
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    stats = pool.stats()
+    assert stats["created"] == 1 and stats["reused"] == 1 and stats["in_use"] == 1
+
+
+def test_pool_checkout_timeout(pool):
+    pool.acquire()
+    pool.acquire()
+    with pytest.raises(mysql.connector.errors.PoolError):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_pool_discard_frees_a_slot(pool):
+    first = pool.acquire()
+    pool.acquire()
+    pool.release(first, discard=True)
+    assert first.closed
+    assert pool.acquire() is not first
+    assert pool.stats()["discarded"] == 1
+
+
+def test_pool_replaces_dead_idle_connection(pool):
+    pool.ping_interval = 0
+    first = pool.acquire()
+    pool.release(first)
+    first.closed = True
+    assert pool.acquire() is not first
+    assert pool.stats()["discarded"] == 1
+
+
+def test_pool_prewarm_and_reap_keep_the_minimum(pool):
+    assert pool.prewarm(2) == 2
+    # idle_timeout=0: se cierran todas menos las pre-calentadas (prewarm=1)
+    assert pool.reap() == 1
+    assert pool.stats()["open"] == 1
+
+
+def test_pool_close_all(pool):
+    connections = [pool.acquire(), pool.acquire()]
+    for connection in connections:
+        pool.release(connection)
+    pool.close_all()
+    assert all(connection.closed for connection in connections)
+    assert pool.stats()["open"] == 0
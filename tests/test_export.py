@@ -0,0 +1,67 @@
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from mysql.connector.constants import FieldType
+
+from dashboards.export import ExportError, check_format, export_chunks
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def description(*columns):
+    """cursor.description como lo entrega mysql.connector (nombre, type_code, ...)"""
+    return tuple((name, type_code, None, None, None, None, True) for name, type_code in columns)
+
+
+def stream(columns, *batches):
+    yield description(*columns)
+    yield from batches
+
+
+def read_parquet(chunks):
+    return pq.read_table(io.BytesIO(b"".join(chunks))).to_pylist()
+
+
+def test_parquet_column_null_in_first_batch():
+    chunks = export_chunks(stream([("carrera", FieldType.VAR_STRING), ("total", FieldType.LONGLONG)],
+                                  [(None, 1), (None, 2)], [("ISC", 3)]), "parquet")
+    assert read_parquet(chunks) == [
+        {"carrera": None, "total": 1}, {"carrera": None, "total": 2}, {"carrera": "ISC", "total": 3},
+    ]
+
+
+def test_parquet_decimal_scale_changes_between_batches():
+    chunks = export_chunks(stream([("promedio", FieldType.NEWDECIMAL)],
+                                  [(Decimal("1.5"),)], [(Decimal("12.25"),)], [(None,)]), "parquet")
+    assert read_parquet(chunks) == [{"promedio": 1.5}, {"promedio": 12.25}, {"promedio": None}]
+
+
+def test_parquet_without_rows_keeps_schema():
+    chunks = export_chunks(stream([("periodo", FieldType.VAR_STRING), ("cantidad", FieldType.LONGLONG)]),
+                           "parquet")
+    table = pq.read_table(io.BytesIO(b"".join(chunks)))
+    assert table.num_rows == 0
+    assert [str(field.type) for field in table.schema] == ["string", "int64"]
+
+
+def test_csv_and_jsonl():
+    columns = [("carrera", FieldType.VAR_STRING), ("total", FieldType.LONGLONG)]
+    csv_body = b"".join(export_chunks(stream(columns, [("Ingeniería", 1)], [("ISC", 2)]), "csv"))
+    assert csv_body.decode("utf-8") == "﻿carrera,total\r\nIngeniería,1\r\nISC,2\r\n"
+    lines = b"".join(export_chunks(stream(columns, [("ISC", 2)]), "jsonl")).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [{"carrera": "ISC", "total": 2}]
+
+
+def test_check_format():
+    check_format("parquet")
+    with pytest.raises(ExportError):
+        check_format("xlsx")
+
+
+def test_export_route_streams_parquet(client):
+    response = client.get("/api/dashboard/3/export?formato=parquet&genero=F")
+    assert response.status_code == 200
+    rows = pq.read_table(io.BytesIO(response.data)).to_pylist()
+    assert rows and set(rows[0]) == {"genero", "cantidad"}
@@ -0,0 +1,38 @@
+import pytest
+
+from config import Config
+from dashboards.registry import FUSED_ESTUDIANTES_KEYS
+
+
+def normalized(rows):
+    """Filas comparables sin depender del orden de los empates ni de int/float"""
+    return sorted(
+        tuple(sorted((key, round(float(value), 6) if isinstance(value, (int, float)) else value)
+                     for key, value in row.items()))
+        for row in rows
+    )
+
+
+def as_records(data):
+    return data.records() if hasattr(data, "records") else list(data)
+
+
+@pytest.mark.parametrize("filters", [{}, {"genero": "F"}, {"carrera": "ISC", "genero": "M"}])
+def test_fan_out_matches_individual_queries(manager, monkeypatch, filters):
+    monkeypatch.setattr(Config, "FUSED_ESTUDIANTES", True)
+    fused = manager.get_fused_estudiantes(filters)
+    assert set(fused) == set(FUSED_ESTUDIANTES_KEYS)
+    for data_key in sorted(FUSED_ESTUDIANTES_KEYS):
+        direct = as_records(manager.query_dashboard_data(data_key, filters))
+        assert normalized(as_records(fused[data_key])) == normalized(direct), data_key
+
+
+def test_fused_dashboards_share_one_query(manager, monkeypatch):
+    monkeypatch.setattr(Config, "FUSED_ESTUDIANTES", True)
+    queried = []
+    query = manager.query_dashboard_data
+    monkeypatch.setattr(manager, "query_dashboard_data",
+                        lambda data_key, filters=None: queried.append(data_key) or query(data_key, filters))
+    for data_key in FUSED_ESTUDIANTES_KEYS:
+        manager.get_dashboard_data(data_key, {"genero": "F"})
+    assert queried == ["estudiantes_cubo"]
@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from config import Config
+from dashboards.pages import PageCache
+
+
+def test_skeleton_page_loads_lazy_loader(client, monkeypatch):
+    monkeypatch.setattr(Config, "SKELETON_FIRST", True)
+    response = client.get("/categoria/Estudiantes")
+    assert response.status_code == 200
+    assert b'data-lazy-dashboard="1"' in response.data
+    assert b"/assets/main." in response.data
+
+
+def test_full_page_does_not_load_lazy_loader(client, monkeypatch):
+    monkeypatch.setattr(Config, "SKELETON_FIRST", False)
+    response = client.get("/categoria/Estudiantes")
+    assert response.status_code == 200
+    assert b"data-lazy-dashboard" not in response.data
+    assert b"/assets/main." not in response.data
+
+
+def _wait_refreshed(cache, count):
+    deadline = time.monotonic() + 5
+    while cache.stats()["refreshes"] + cache.stats()["refresh_errors"] < count:
+        assert time.monotonic() < deadline, "la regeneración de fondo no terminó"
+        time.sleep(0.01)
+
+
+def test_page_cache_serves_stale_and_refreshes_once():
+    cache = PageCache()
+    renders = []
+
+    def render():
+        renders.append(True)
+        return f"<p>{len(renders)}</p>", True
+
+    first = cache.get("/", render)
+    assert cache.get("/", render) is first
+    cache.expire()
+    # Vencida: se sirve la misma versión y se regenera en segundo plano
+    assert cache.get("/", render) is first
+    _wait_refreshed(cache, 1)
+    fresh = cache.get("/", render)
+    assert fresh["body"] == b"<p>2</p>"
+    assert fresh["etag"] != first["etag"]
+    assert len(renders) == 2
+
+
+def test_page_cache_does_not_keep_failed_pages():
+    cache = PageCache()
+    results = [("<p>error</p>", False), ("<p>ok</p>", True)]
+    assert cache.get("/", lambda: results.pop(0))["body"] == b"<p>error</p>"
+    assert cache.get("/", lambda: results.pop(0))["body"] == b"<p>ok</p>"
+    assert cache.get("/", lambda: pytest.fail("la página buena debía quedar en cache"))["good"]
+
+
+def test_page_cache_invalidate_discards_pages():
+    cache = PageCache()
+    cache.get("/", lambda: ("<p>a</p>", True))
+    cache.get("/categoria/Estudiantes", lambda: ("<p>b</p>", True))
+    assert cache.invalidate() == 2
+    assert cache.get("/", lambda: ("<p>c</p>", True))["body"] == b"<p>c</p>"
+
+
+def test_page_route_uses_cache_and_etag(client):
+    page_cache = client.application.extensions["dashboards"].page_cache
+    first = client.get("/categoria/Estudiantes")
+    assert first.status_code == 200
+    assert page_cache.stats()["entries"] == 1
+    second = client.get("/categoria/Estudiantes")
+    assert second.data == first.data
+    assert client.get("/categoria/Estudiantes",
+                      headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+    client.get("/categoria/Estudiantes?genero=F")
+    assert page_cache.stats()["entries"] == 2
+
+
+def test_cards_link_to_export_with_page_filters(client, monkeypatch):
+    monkeypatch.setattr(Config, "SKELETON_FIRST", False)
+    response = client.get("/categoria/Estudiantes?genero=F")
+    assert b'href="/api/dashboard/3/export?formato=csv&amp;genero=F"' in response.data
+    export = client.get("/api/dashboard/3/export?formato=csv&genero=F")
+    assert export.status_code == 200
+
+
+def test_skeleton_page_loads_plotly_even_in_inline_mode(client, monkeypatch):
+    monkeypatch.setattr(Config, "SKELETON_FIRST", True)
+    monkeypatch.setattr(Config, "PLOTLY_JS_MODE", "inline")
+    response = client.get("/categoria/Estudiantes")
+    assert b"/assets/plotly.min." in response.data
+    batch = client.get("/api/dashboards/batch?ids=3&figura=1").get_json()
+    assert batch["dashboards"][0]["figure"]["data"]
@@ -0,0 +1,74 @@
+import pytest
+
+from dashboards.registry import (
+    DASHBOARDS, QUERIES, build_query, get_category_dashboards, get_dashboard, supported_filters,
+)
+
+
+def test_registry_has_every_dashboard():
+    assert [info["id"] for info in DASHBOARDS] == list(range(1, 41))
+    assert get_dashboard(3)["data_key"] == "genero_stats"
+    assert get_dashboard(999) is None
+    assert {info["category"] for info in get_category_dashboards("Estudiantes")} == {"Estudiantes"}
+
+
+def test_filters_become_parameters():
+    sql, params = build_query("genero_stats", {"carrera": "ISC", "genero": "F", "periodo": ""})
+    assert params == ("ISC", "F")
+    assert "carrera_codigo = %s" in sql and "genero = %s" in sql
+    assert "ISC" not in sql and "{filtros}" not in sql
+
+
+def test_unfiltered_query_has_no_parameters():
+    sql, params = build_query("genero_stats", {})
+    assert params == ()
+    assert "{filtros}" not in sql
+
+
+def test_student_subquery_filters():
+    sql, params = build_query("materias_reprobadas", {"genero": "F"})
+    assert "cal.id_estudiante IN (SELECT id FROM estudiantes WHERE genero = %s)" in sql
+    assert params == ("F",)
+
+
+def test_supported_filters_drops_what_the_query_ignores():
+    assert supported_filters("abandono_stats", {"genero": "F"}) == {}
+    assert supported_filters("genero_stats", {"genero": "F", "otro": "x"}) == {"genero": "F"}
+
+
+@pytest.mark.parametrize("filters", [{"genero": "F"}, {"carrera": "ISC"}, {"carrera": "ISC", "genero": "M"}])
+def test_pushdown_matches_manual_count(sqlite_db, filters):
+    sql, params = build_query("activos_stats", filters)
+    total = sum(row["cantidad"] for row in sqlite_db.execute_query(sql, params))
+    conditions = " AND ".join({"carrera": "carrera_codigo = ?", "genero": "genero = ?"}[key] for key in filters)
+    expected = sqlite_db.execute_query(
+        f"SELECT COUNT(*) as n FROM estudiantes WHERE {conditions}", tuple(filters.values())
+    )[0]["n"]
+    assert total == expected > 0
+
+
+def test_every_query_runs_on_sqlite(sqlite_db):
+    for data_key in QUERIES:
+        sql, params = build_query(data_key, {"genero": "F"})
+        assert isinstance(sqlite_db.execute_query(sql, params), list), data_key
+
+
+def test_left_join_filters_keep_careers_without_matches(sqlite_db):
+    sql, params = build_query("carreras_stats", {"genero": "F", "periodo": "2020-1"})
+    assert "{filtros_union}" not in sql
+    assert params == ("2020-1", "F")
+    rows = sqlite_db.execute_query(sql, params)
+    careers = sqlite_db.execute_query("SELECT COUNT(*) as n FROM carreras WHERE activa = 1")[0]["n"]
+    # Las carreras sin estudiantes del periodo siguen en el gráfico, con total 0
+    assert len(rows) == careers
+    assert any(row["total"] == 0 for row in rows)
+    manual = sqlite_db.execute_query(
+        "SELECT COUNT(*) as n FROM estudiantes WHERE genero = ? AND periodo_ingreso = ?", ("F", "2020-1")
+    )[0]["n"]
+    assert sum(row["total"] for row in rows) == manual
+
+
+def test_left_join_carrera_filter_stays_in_where():
+    sql, params = build_query("carreras_stats", {"carrera": "ISC", "genero": "F"})
+    assert params == ("F", "ISC")
+    assert sql.index("e.genero = %s") < sql.index("WHERE") < sql.index("c.codigo = %s")
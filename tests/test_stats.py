@@ -0,0 +1,85 @@
+import pytest
+
+from config import Config
+from dashboards.stats import SummaryStats, counter_deltas
+
+
+class FakeDatabase:
+    """Devuelve un recuento fijo; during_query simula cambios reportados mientras corre la consulta"""
+
+    def __init__(self, activos=10):
+        self.activos = activos
+        self.during_query = None
+
+    def execute_query(self, query, params=None):
+        if self.during_query:
+            self.during_query()
+        return [{"estudiantes_activos": self.activos, "carreras_activas": 2, "total_calificaciones": 0,
+                 "total_egresados": 0, "estudiantes_con_beca": 0}]
+
+
+NEW_ACTIVE_STUDENT = {"tabla": "estudiantes", "despues": {"activo": 1, "beca": 0}}
+
+
+def test_counter_deltas():
+    assert counter_deltas("estudiantes", after={"activo": 1, "beca": 1}) == {
+        "estudiantes_activos": 1, "estudiantes_con_beca": 1}
+    assert counter_deltas("estudiantes", before={"activo": 1}, after={"activo": 0}) == {"estudiantes_activos": -1}
+    assert counter_deltas("pagos", after={}) == {}
+
+
+def test_matches_sqlite_recount(sqlite_db):
+    stats = SummaryStats(sqlite_db).get()
+    expected = sqlite_db.execute_query("SELECT COUNT(*) as n FROM estudiantes WHERE activo = 1")[0]["n"]
+    assert stats["summary"]["estudiantes_activos"] == expected
+
+
+@pytest.mark.parametrize("changes", [
+    [1],
+    [{"tabla": "pagos", "despues": {}}],
+    [{"tabla": "estudiantes"}],
+    [{"tabla": "estudiantes", "despues": [1]}],
+    {"tabla": "estudiantes"},
+])
+def test_invalid_changes_are_rejected_without_applying(changes):
+    stats = SummaryStats(FakeDatabase())
+    stats.get()
+    with pytest.raises(ValueError):
+        stats.apply_changes([NEW_ACTIVE_STUDENT, *changes] if isinstance(changes, list) else changes)
+    assert stats.get()["summary"]["estudiantes_activos"] == 10
+
+
+def test_deltas_do_not_change_generated_at():
+    stats = SummaryStats(FakeDatabase())
+    stats.get()
+    stats._generated_at = "2000-01-01T00:00:00Z"
+    assert stats.apply_changes([NEW_ACTIVE_STUDENT]) == {"estudiantes_activos": 1}
+    result = stats.get()
+    assert result["summary"]["estudiantes_activos"] == 11
+    assert result["generated_at"] == "2000-01-01T00:00:00Z"
+
+
+def test_recount_reapplies_only_changes_reported_during_the_query():
+    db = FakeDatabase(activos=10)
+    stats = SummaryStats(db)
+    stats.get()
+    # Reportado antes del recuento: la consulta ya lo ve (11) y no se suma otra vez
+    stats.apply_changes([NEW_ACTIVE_STUDENT])
+    db.activos = 11
+    # Reportado mientras corre la consulta: puede no verlo, se reaplica
+    db.during_query = lambda: stats.apply_changes([NEW_ACTIVE_STUDENT])
+    assert stats.recount()
+    assert stats.get()["summary"]["estudiantes_activos"] == 12
+
+
+def test_changes_endpoint_requires_token(client, monkeypatch):
+    monkeypatch.setattr(Config, "STATS_CHANGES_TOKEN", "")
+    assert client.post("/api/stats/summary/cambios", json=[NEW_ACTIVE_STUDENT]).status_code == 404
+
+    monkeypatch.setattr(Config, "STATS_CHANGES_TOKEN", "secreto")
+    assert client.post("/api/stats/summary/cambios", json=[NEW_ACTIVE_STUDENT]).status_code == 401
+    headers = {"Authorization": "Bearer secreto"}
+    assert client.post("/api/stats/summary/cambios", json=[1], headers=headers).status_code == 400
+    response = client.post("/api/stats/summary/cambios", json=[NEW_ACTIVE_STUDENT], headers=headers)
+    assert response.status_code == 200
+    assert response.get_json() == {"deltas": {"estudiantes_activos": 1}}
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from dashboards.summaries import SummaryRefresher
+
+
+class FakeDatabase:
+    """Responde NOW() y la marca de agua; la búsqueda de cambios puede fallar"""
+
+    def __init__(self, slices=None, fail_changes=False):
+        self.slices = slices or []
+        self.fail_changes = fail_changes
+        self.transactions = []
+
+    def execute_query(self, query, params=None):
+        if "NOW()" in query:
+            return [{"ahora": datetime(2024, 1, 2)}]
+        if "resumen_control" in query:
+            return [{"ultima_actualizacion": datetime(2024, 1, 1)}]
+        return []
+
+    def execute_transaction(self, statements):
+        self.transactions.append(list(statements))
+        return True
+
+    def stream_query(self, query, params=None, batch_size=None, describe=False):
+        if self.fail_changes:
+            raise RuntimeError("Unknown column 'e.updated_at'")
+        yield ("carrera_codigo", "periodo_ingreso", "genero")
+        yield [(row["carrera_codigo"], row["periodo_ingreso"], row["genero"]) for row in self.slices]
+
+
+def test_incremental_refresh_rebuilds_changed_slices():
+    db = FakeDatabase(slices=[{"carrera_codigo": "TI", "periodo_ingreso": "2023-1", "genero": "F"}])
+    result = SummaryRefresher(db).refresh()
+    assert result["ok"] and result["mode"] == "incremental"
+    assert result["slices"] == 1
+    statements = db.transactions[-1]
+    assert ("TI", "2023-1", "F") in [params for _, params in statements]
+
+
+def test_failed_change_query_falls_back_to_full_refresh():
+    db = FakeDatabase(fail_changes=True)
+    result = SummaryRefresher(db).refresh()
+    # Sin la lista de cambios no se puede avanzar la marca de agua con un refresco vacío
+    assert result["mode"] == "full"
+    assert db.transactions[-1][0] == ("DELETE FROM resumen_calificaciones", None)
@@ -0,0 +1,85 @@
+"""Precalentamiento de las caches de datos y gráficos de todos los dashboards.
+
+Uso:
+    python warmup.py [--url http://localhost:5000] [--combinaciones 20]
+                     [--trabajadores 4] [--cada 600] [--salida reporte.json]
+
+Pide /api/filters al servidor en marcha, arma las combinaciones de filtros
+más comunes (sin filtros, cada género, los períodos más recientes y cada
+carrera) y genera cada dashboard con /api/dashboard/<id>/data?figura=1, lo
+que deja en las caches del servidor tanto el resultado de la consulta como
+el gráfico renderizado. Al terminar imprime cuánto tardó cada dashboard.
+
+Sirve para el arranque (después de levantar la app, o con WARMUP_ON_START
+para que lo haga la propia app) y para correrlo periódicamente con --cada o
+desde cron. Con varios workers de gunicorn cada uno tiene su propia cache:
+conviene WARMUP_ON_START, que precalienta dentro de cada proceso.
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from config import Config
+from dashboards.warmup import filter_combinations, format_report, warm_up
+
+
+def _fetch_json(url, timeout):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def warm_server(base_url, combinations=None, workers=None, timeout=60):
+    """Precalienta un servidor en marcha; devuelve el reporte de warm_up"""
+    base_url = base_url.rstrip("/")
+    catalog = _fetch_json(f"{base_url}/api/filters", timeout)
+
+    def generate(dashboard_id, filters):
+        query = urllib.parse.urlencode({**filters, "figura": "1"})
+        try:
+            payload = _fetch_json(f"{base_url}/api/dashboard/{dashboard_id}/data?{query}", timeout)
+        except urllib.error.HTTPError as e:
+            print(f"Dashboard {dashboard_id} {filters}: HTTP {e.code}")
+            return False
+        return not payload.get("error")
+
+    return warm_up(generate, filter_combinations(catalog, combinations), workers=workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precalienta las caches de los dashboards")
+    parser.add_argument("--url", default="http://localhost:5000",
+                        help="URL base de la app (default: http://localhost:5000)")
+    parser.add_argument("--combinaciones", type=int, default=Config.WARMUP_MAX_COMBINATIONS,
+                        help=f"Combinaciones de filtros, contando sin filtros "
+                             f"(default: {Config.WARMUP_MAX_COMBINATIONS})")
+    parser.add_argument("--trabajadores", type=int, default=Config.WARMUP_WORKERS,
+                        help=f"Peticiones en paralelo (default: {Config.WARMUP_WORKERS})")
+    parser.add_argument("--timeout", type=float, default=60,
+                        help="Segundos máximos por petición (default: 60)")
+    parser.add_argument("--cada", type=float, default=0,
+                        help="Repetir cada tantos segundos; 0 = una sola vez")
+    parser.add_argument("--salida", help="Archivo donde guardar el último reporte JSON")
+    args = parser.parse_args(argv)
+
+    while True:
+        try:
+            report = warm_server(args.url, args.combinaciones, args.trabajadores, args.timeout)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"No se pudo precalentar {args.url}: {e}")
+            report = None
+        if report:
+            print("\n".join(format_report(report)))
+            if args.salida:
+                with open(args.salida, "w", encoding="utf-8") as f:
+                    json.dump(report, f, indent=2, ensure_ascii=False)
+        if not args.cada:
+            return 0 if report and not report["errors"] else 1
+        time.sleep(args.cada)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,11 @@
+"""Punto de entrada WSGI para producción.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+La aplicación se crea sin conexiones ni hilos: con preload_app el master la
+importa una sola vez (registro de dashboards, plotly, pandas) y los workers
+la heredan por copy-on-write; cada worker crea sus servicios en post_fork.
+"""
+from app import create_app
+
+app = create_app(start=False)